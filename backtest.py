@@ -0,0 +1,266 @@
+"""
+Backtest aturan calculate_entry_signal atas history bar (CSV/Parquet).
+
+Setiap file fixture berisi satu coin dengan kolom:
+    timestamp, open, high, low, close, volume, funding_rate, fear_greed
+funding_rate dalam persen (sama seperti coin_data), fear_greed 0-100.
+
+Snapshot 24h (high/low/change/volume) dihitung rolling dari bar, RSI dari klines
+1h yang dibentuk dari bar yang sama (seperti get_latest_rsi di live), lalu semua
+bar diskor sekaligus dengan signal_engine.score_batch. Simulasi fill, SL dan TP
+memakai pencarian numpy per trade, bukan loop per bar.
+
+    python backtest.py fixtures/BTCUSDT.csv fixtures/ETHUSDT.csv --window 1440
+"""
+import argparse
+import os
+
+import numpy as np
+
+from indicators import IncrementalIndicators
+from signal_engine import score_batch
+
+FIXTURE_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'funding_rate', 'fear_greed')
+
+DEFAULT_WINDOW = 1440       # bar per 24 jam untuk data 1 menit
+DEFAULT_ENTRY_TIMEOUT = 60  # bar menunggu limit entry terisi
+DEFAULT_MAX_HOLD = 4320     # bar maksimal posisi dibuka (3 hari data 1 menit)
+DEFAULT_FEE = 0.0004        # fee per sisi (taker Binance Futures)
+
+
+def load_fixture(path):
+    """Baca fixture CSV/Parquet jadi dict kolom numpy"""
+    if path.endswith('.parquet'):
+        import pandas as pd
+        frame = pd.read_parquet(path)
+        return {column: frame[column].to_numpy(dtype=np.float64) for column in FIXTURE_COLUMNS}
+
+    try:
+        import pandas as pd
+        frame = pd.read_csv(path, usecols=list(FIXTURE_COLUMNS))
+        return {column: frame[column].to_numpy(dtype=np.float64) for column in FIXTURE_COLUMNS}
+    except ImportError:
+        with open(path) as f:
+            header = [name.strip() for name in f.readline().split(',')]
+        table = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+        return {column: table[:, header.index(column)].copy() for column in FIXTURE_COLUMNS}
+
+
+def _rolling_extreme(values, window, func):
+    """Rolling max/min O(n) (van Herk / Gil-Werman), window berakhir di bar i"""
+    n = len(values)
+    fill = -np.inf if func is np.maximum else np.inf
+    padded_len = -(-n // window) * window
+    padded = np.full(padded_len, fill)
+    padded[:n] = values
+    blocks = padded.reshape(-1, window)
+
+    prefix = func.accumulate(blocks, axis=1).ravel()
+    suffix = func.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    out = np.empty(n)
+    start = np.arange(n) - window + 1
+    full = start >= 0
+    out[full] = func(suffix[start[full]], prefix[np.arange(n)[full]])
+    # Bar awal: window belum penuh, pakai ekstrem dari awal data
+    out[~full] = func.accumulate(values[:min(window - 1, n)])[:(~full).sum()]
+    return out
+
+
+def klines_rsi(bars, window=DEFAULT_WINDOW):
+    """
+    RSI 1h untuk setiap bar, dihitung seperti RSIFeed di live: state Wilder dari
+    bar 1h yang sudah tertutup, bar 1h yang berjalan ikut dihitung di close bar
+    saat ini (rsi_preview). NaN sampai history cukup untuk seed (score_batch
+    memakai RSI simulasi).
+    """
+    close = bars['close']
+    per_hour = max(window // 24, 1)
+    hours = len(close) // per_hour
+    out = np.full(len(close), np.nan)
+
+    blocks = (hours, per_hour)
+    hourly_high = bars['high'][:hours * per_hour].reshape(blocks).max(axis=1)
+    hourly_low = bars['low'][:hours * per_hour].reshape(blocks).min(axis=1)
+    hourly_close = close[per_hour - 1:hours * per_hour:per_hour]
+
+    state = IncrementalIndicators()
+    first = max(state.rsi_period, state.ema_period, state.atr_period, state.bb_period - 1) + 1
+    if hours < first:
+        return out
+    state.seed(hourly_high[:first], hourly_low[:first], hourly_close[:first])
+    for hour in range(first, hours + 1):
+        start = hour * per_hour
+        out[start:start + per_hour] = state.rsi_preview(close[start:start + per_hour])
+        if hour < hours:
+            state.update(hourly_high[hour:hour + 1], hourly_low[hour:hour + 1], hourly_close[hour:hour + 1])
+    return out
+
+
+def rolling_snapshot(bars, window=DEFAULT_WINDOW):
+    """Bentuk kolom snapshot 24h (seperti ticker 24hr) + RSI klines 1h untuk setiap bar"""
+    close = bars['close']
+    high_24h = _rolling_extreme(bars['high'], window, np.maximum)
+    low_24h = _rolling_extreme(bars['low'], window, np.minimum)
+
+    reference = np.concatenate([np.full(window, bars['open'][0]), close[:-window]])[:len(close)]
+    change_24h = (close - reference) / reference * 100
+
+    cumulative = np.concatenate([[0.0], np.cumsum(bars['volume'])])
+    index = np.arange(1, len(close) + 1)
+    volume_24h = cumulative[index] - cumulative[np.maximum(index - window, 0)]
+
+    return {
+        'price': close,
+        'high_24h': high_24h,
+        'low_24h': low_24h,
+        'change_24h': change_24h,
+        'volume': volume_24h,
+        'funding_rate': bars['funding_rate'],
+        'rsi': klines_rsi(bars, window)
+    }
+
+
+def score_bars(bars, window=DEFAULT_WINDOW, score_fn=None):
+    """Skor semua bar sekaligus, default memakai aturan calculate_entry_signal"""
+    snapshot = rolling_snapshot(bars, window)
+    if score_fn is None:
+        return score_batch(fear_greed=bars['fear_greed'], **snapshot)
+    return score_fn(snapshot, bars)
+
+
+def _first_true(mask):
+    """Index True pertama, -1 kalau tidak ada (termasuk mask kosong di bar terakhir)"""
+    if not mask.size:
+        return -1
+    index = int(np.argmax(mask))
+    return index if mask[index] else -1
+
+
+def simulate_trades(bars, scores, window=DEFAULT_WINDOW, entry_timeout=DEFAULT_ENTRY_TIMEOUT,
+                    max_hold=DEFAULT_MAX_HOLD, fee=DEFAULT_FEE):
+    """
+    Simulasi fill limit entry, SL dan TP dari level di hasil skor.
+
+    Satu posisi per coin. Kalau SL dan TP tersentuh di bar yang sama, dianggap
+    kena SL (konservatif). Posisi yang tidak kena SL/TP ditutup di close setelah max_hold.
+    """
+    high = bars['high']
+    low = bars['low']
+    close = bars['close']
+    n = len(close)
+    signal = scores['signal']
+
+    # Sinyal baru valid setelah window 24h pertama penuh
+    candidates = np.flatnonzero(signal != 0)
+    candidates = candidates[candidates >= window - 1]
+
+    trades = []
+    position = 0
+    while position < len(candidates):
+        t = int(candidates[position])
+        is_long = signal[t] > 0
+        entry = scores['entry_price'][t]
+        stop = scores['stop_loss'][t]
+        target = scores['take_profit'][t]
+
+        # Limit entry mulai bisa terisi di bar berikutnya
+        fill_end = min(t + 1 + entry_timeout, n)
+        fill_window = low[t + 1:fill_end] <= entry if is_long else high[t + 1:fill_end] >= entry
+        offset = _first_true(fill_window)
+        if offset < 0:
+            position = np.searchsorted(candidates, fill_end, side='left')
+            continue
+        fill_bar = t + 1 + offset
+
+        hold_end = min(fill_bar + max_hold, n)
+        if is_long:
+            stop_hit = low[fill_bar:hold_end] <= stop
+            target_hit = high[fill_bar:hold_end] >= target
+        else:
+            stop_hit = high[fill_bar:hold_end] >= stop
+            target_hit = low[fill_bar:hold_end] <= target
+        stop_offset = _first_true(stop_hit)
+        target_offset = _first_true(target_hit)
+
+        if stop_offset >= 0 and (target_offset < 0 or stop_offset <= target_offset):
+            exit_bar, exit_price, reason = fill_bar + stop_offset, stop, 'stop_loss'
+        elif target_offset >= 0:
+            exit_bar, exit_price, reason = fill_bar + target_offset, target, 'take_profit'
+        else:
+            exit_bar, exit_price, reason = hold_end - 1, close[hold_end - 1], 'timeout'
+
+        gross = (exit_price - entry) / entry if is_long else (entry - exit_price) / entry
+        trades.append({
+            'signal_bar': t,
+            'fill_bar': fill_bar,
+            'exit_bar': exit_bar,
+            'side': 'LONG' if is_long else 'SHORT',
+            'entry_price': float(entry),
+            'exit_price': float(exit_price),
+            'reason': reason,
+            'pnl': float(gross - 2 * fee)
+        })
+        position = np.searchsorted(candidates, exit_bar, side='right')
+
+    return trades
+
+
+def summarize(trades):
+    """Ringkasan PnL dari daftar trade"""
+    pnl = np.array([trade['pnl'] for trade in trades], dtype=np.float64)
+    if not len(pnl):
+        return {'trades': 0, 'win_rate': 0, 'total_return': 0, 'avg_pnl': 0,
+                'max_drawdown': 0, 'profit_factor': 0, 'stop_loss': 0, 'take_profit': 0, 'timeout': 0}
+
+    equity = np.cumprod(1 + pnl)
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+    gains = pnl[pnl > 0].sum()
+    losses = -pnl[pnl < 0].sum()
+    reasons = [trade['reason'] for trade in trades]
+    return {
+        'trades': len(pnl),
+        'win_rate': float((pnl > 0).mean()),
+        'total_return': float(equity[-1] - 1),
+        'avg_pnl': float(pnl.mean()),
+        'max_drawdown': float(drawdown.max()),
+        'profit_factor': float(gains / losses) if losses else float('inf'),
+        'stop_loss': reasons.count('stop_loss'),
+        'take_profit': reasons.count('take_profit'),
+        'timeout': reasons.count('timeout')
+    }
+
+
+def run_backtest(bars, window=DEFAULT_WINDOW, score_fn=None, **simulation):
+    """Backtest satu coin: skor semua bar, simulasi trade, ringkas hasil"""
+    scores = score_bars(bars, window, score_fn)
+    trades = simulate_trades(bars, scores, window=window, **simulation)
+    return {'summary': summarize(trades), 'trades': trades}
+
+
+def run_backtests(paths, window=DEFAULT_WINDOW, **simulation):
+    """Backtest banyak fixture, return dict {nama coin: hasil}"""
+    results = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        results[name] = run_backtest(load_fixture(path), window, **simulation)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest sinyal entry dari fixture history")
+    parser.add_argument("paths", nargs="+", help="File fixture CSV/Parquet, satu per coin")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Jumlah bar per 24 jam")
+    parser.add_argument("--entry-timeout", type=int, default=DEFAULT_ENTRY_TIMEOUT)
+    parser.add_argument("--max-hold", type=int, default=DEFAULT_MAX_HOLD)
+    parser.add_argument("--fee", type=float, default=DEFAULT_FEE)
+    args = parser.parse_args()
+
+    results = run_backtests(args.paths, args.window, entry_timeout=args.entry_timeout,
+                            max_hold=args.max_hold, fee=args.fee)
+    for name, result in results.items():
+        summary = result['summary']
+        print(f"{name}: {summary['trades']} trades | win {summary['win_rate']:.1%} | "
+              f"return {summary['total_return']:+.2%} | max DD {summary['max_drawdown']:.2%} | "
+              f"PF {summary['profit_factor']:.2f} | SL {summary['stop_loss']} TP {summary['take_profit']} "
+              f"timeout {summary['timeout']}")
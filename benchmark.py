@@ -0,0 +1,610 @@
+"""
+Benchmark hot path fetch, parse dan scoring.
+
+Berjalan offline: semua request HTTP diarahkan ke stub lokal yang menyajikan
+fixture JSON rekaman di benchmarks/fixtures. Setiap case dilaporkan p50/p95/p99
+dan peak alokasi memori, hasilnya disimpan per commit di benchmarks/results
+supaya regresi antar commit bisa dibandingkan.
+
+    python benchmark.py                             # semua case, simpan hasil
+    python benchmark.py --only signal --iterations 500
+    python benchmark.py --latency 50                # simulasi RTT upstream (ms)
+    python benchmark.py --compare benchmarks/results/a.json benchmarks/results/b.json
+    python benchmark.py --record                    # rekam ulang fixture dari API asli
+
+agg_trades.jsonl berisi frame combined stream aggTrade BTC/ETH (satu per baris)
+yang juga bisa diputar ulang lewat `python whale_stream.py --replay`;
+depth_diffs.jsonl berisi frame depthUpdate BTCUSDT yang sambung dengan
+depth_snapshot.json (`python orderbook.py --replay`); force_orders.jsonl berisi
+frame !forceOrder@arr (`python liquidations.py --replay`); market_stream.jsonl
+berisi frame !markPrice@arr / !ticker@arr untuk SUPPORTED_COINS
+(`python stream_ingest.py --replay`).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# Dashboard dijalankan tanpa collector dan tanpa websocket, jadi semua data lewat stub
+os.environ.setdefault("MARKET_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-"), "market.db"))
+
+import http_client
+from binance_cache import get_premium_index_cache, parse_premium_index
+from fast_json import BACKENDS, decode_columns
+from fear_greed import get_fear_greed_provider
+from data_fetcher import DataFetcher
+from exchanges import CoinbaseAdapter, ExchangeAggregator, OKXAdapter
+from market_data import SUPPORTED_COINS, TICKER_FIELDS, fetch_snapshot, get_coin_data, get_fear_greed
+from market_snapshot import MarketSnapshot
+from rate_limiter import get_rate_limiter
+from signal_engine import score_coin_data, score_snapshot
+from strategy import calculate_entry_signal
+from swr_cache import get_swr_cache
+from whale_stream import WhaleStream, WhaleTracker
+from orderbook import DepthStream, OrderBook
+from liquidations import LiquidationStream, LiquidationTracker
+from stream_ingest import MarketStream
+
+# (host, path) -> file fixture
+FIXTURES = {
+    ('fapi.binance.com', '/fapi/v1/premiumIndex'): 'premium_index.json',
+    ('fapi.binance.com', '/fapi/v1/openInterest'): 'open_interest.json',
+    ('fapi.binance.com', '/fapi/v1/klines'): 'klines_1h.json',
+    ('fapi.binance.com', '/fapi/v1/ticker/24hr'): 'futures_ticker_24hr.json',
+    ('api.binance.com', '/api/v3/ticker/24hr'): 'spot_ticker_24hr.json',
+    ('api.alternative.me', '/fng/'): 'fear_greed.json',
+    ('api.coinbase.com', '/v2/exchange-rates'): 'coinbase_exchange_rates.json',
+    ('api.coinlore.net', '/api/ticker/'): 'coinlore_ticker.json',
+    ('api.bybit.com', '/v5/market/tickers'): 'bybit_tickers.json',
+    ('www.okx.com', '/api/v5/market/tickers'): 'okx_tickers.json',
+    ('www.okx.com', '/api/v5/public/open-interest'): 'okx_open_interest.json',
+    ('www.okx.com', '/api/v5/public/funding-rate'): 'okx_funding_rate.json',
+    ('fapi.binance.com', '/fapi/v1/depth'): 'depth_snapshot.json',
+    # Satu file untuk semua /products/<id>/stats, dipilih per product id
+    ('api.exchange.coinbase.com', '/products/stats'): 'coinbase_product_stats.json'
+}
+
+DASHBOARDS = ('dashboard.py', 'simple_dashboard.py', 'multi_coin_dashboard.py', 'demo_dashboard.py')
+
+PERCENTILES = (50, 95, 99)
+MEMORY_ITERATIONS = 20  # tracemalloc memperlambat, jadi memori diukur di pass terpisah yang pendek
+REGRESSION_THRESHOLD = 0.10
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+# ---------------------------------------------------------------------------
+# Stub HTTP lokal
+# ---------------------------------------------------------------------------
+
+def _select(payload, query):
+    """Perilaku filter endpoint Binance: ?symbol=X satu record, ?symbols=[...] beberapa record"""
+    if isinstance(payload, dict) and 'data' in payload:
+        # Envelope OKX: ?instId=X menyaring isi data
+        if 'instId' not in query:
+            return payload
+        inst_id = query['instId'][0]
+        return dict(payload, data=[item for item in payload['data'] if item.get('instId') == inst_id])
+    if not isinstance(payload, list) or not payload or not isinstance(payload[0], dict):
+        return payload
+    if 'symbol' in query:
+        symbol = query['symbol'][0]
+        return next((item for item in payload if item.get('symbol') == symbol), payload[0])
+    if 'symbols' in query:
+        symbols = set(json.loads(query['symbols'][0]))
+        return [item for item in payload if item.get('symbol') in symbols]
+    return payload
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Header dan body ditulis terpisah; tanpa ini Nagle + delayed ACK menambah ~40ms per request
+    disable_nagle_algorithm = True
+    fixtures = {}
+    latency = 0.0
+
+    def do_GET(self):
+        # Path stub: /<host asli>/<path asli>?<query asli>
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        product = re.fullmatch(r'products/([^/]+)/stats', path)
+        if product:
+            stats = self.fixtures[(host, '/products/stats')]['data'].get(product.group(1))
+            if stats is None:
+                self.send_error(404)
+                return
+            body = json.dumps(stats).encode()
+        else:
+            payload = self.fixtures.get((host, '/' + path))
+            if payload is None:
+                self.send_error(404)
+                return
+            query = parse_qs(parts.query)
+            body = payload['raw'] if not query else json.dumps(_select(payload['data'], query)).encode()
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def start_stub(latency_ms=0):
+    """Jalankan stub di thread background, return server"""
+    fixtures = {}
+    for key, name in FIXTURES.items():
+        raw = load_fixture(name)
+        fixtures[key] = {'raw': raw, 'data': json.loads(raw)}
+    _StubHandler.fixtures = fixtures
+    _StubHandler.latency = latency_ms / 1000.0
+    server = _StubServer(('127.0.0.1', 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, name="bench-stub", daemon=True).start()
+    return server
+
+
+class _StubAdapter(HTTPAdapter):
+    """Adapter yang menulis ulang https://host/path jadi http://stub/host/path"""
+
+    def __init__(self, stub_base, **kwargs):
+        self.stub_base = stub_base
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.stub_base}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+def route_to_stub(server):
+    """Arahkan session bersama ke stub dan buka batas weight, supaya yang terukur hanya kode kita"""
+    stub_base = f"http://127.0.0.1:{server.server_address[1]}"
+    adapter = _StubAdapter(stub_base, pool_connections=http_client.POOL_CONNECTIONS,
+                           pool_maxsize=http_client.POOL_MAXSIZE, max_retries=0)
+    http_client.get_session().mount("https://", adapter)
+    limiter = get_rate_limiter()
+    for host in list(limiter.buckets):
+        limiter.register_host(host, 10 ** 12)
+
+
+def reset_caches():
+    """Kosongkan cache proses supaya case 'cold' benar-benar melewati upstream"""
+    get_swr_cache().invalidate()
+    get_premium_index_cache().invalidate()
+    get_fear_greed_provider().invalidate()
+
+
+# ---------------------------------------------------------------------------
+# Pengukuran
+# ---------------------------------------------------------------------------
+
+def measure(fn, iterations, warmup=3, setup=None):
+    """Jalankan fn berulang, return statistik latency (ms) dan peak alokasi (KB)"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - started
+    samples *= 1000
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, MEMORY_ITERATIONS)):
+            if setup:
+                setup()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            fn()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        'iterations': iterations,
+        'mean_ms': float(samples.mean()),
+        'min_ms': float(samples.min()),
+        'max_ms': float(samples.max()),
+        'peak_alloc_kb': peak / 1024
+    }
+    for p, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+        result[f'p{p}_ms'] = float(value)
+    return result
+
+
+def _sample_inputs():
+    tickers = json.loads(load_fixture('spot_ticker_24hr.json'))
+    funding = parse_premium_index(load_fixture('premium_index.json'))
+    all_coin_data = {}
+    for coin, symbol in SUPPORTED_COINS.items():
+        ticker = next(item for item in tickers if item['symbol'] == symbol)
+        all_coin_data[coin] = {
+            'price': float(ticker['lastPrice']),
+            'change_24h': float(ticker['priceChangePercent']),
+            'volume': float(ticker['volume']),
+            'funding_rate': funding.get(symbol)['lastFundingRate'] * 100,
+            'open_interest': 0,
+            'high_24h': float(ticker['highPrice']),
+            'low_24h': float(ticker['lowPrice'])
+        }
+    fear_greed = json.loads(load_fixture('fear_greed.json'))['data'][0]
+    return all_coin_data, {'value': int(fear_greed['value']), 'classification': fear_greed['value_classification']}
+
+
+def build_cases():
+    """Daftar case: name -> (fn, setup)"""
+    fetcher = DataFetcher()
+    premium_raw = load_fixture('premium_index.json')
+    symbols = list(SUPPORTED_COINS.values())
+    all_coin_data, fear_greed = _sample_inputs()
+    # Snapshot seluruh universe futures dari fixture, dan pembandingnya sebagai dict per coin
+    universe = MarketSnapshot.from_coin_data({
+        item['symbol']: {'price': float(item['lastPrice']), 'change_24h': float(item['priceChangePercent']),
+                         'volume': float(item['volume']), 'high_24h': float(item['highPrice']),
+                         'low_24h': float(item['lowPrice'])}
+        for item in json.loads(load_fixture('futures_ticker_24hr.json'))
+    })
+    universe_coins = {symbol: symbol for symbol in universe.symbols}
+    aggregator = ExchangeAggregator()
+    agg_frames = load_fixture('agg_trades.jsonl').decode().splitlines()
+    depth_snapshot = json.loads(load_fixture('depth_snapshot.json'))
+    depth_events = [json.loads(frame)['data'] for frame in load_fixture('depth_diffs.jsonl').decode().splitlines()]
+    synced_book = OrderBook('BTCUSDT')
+    synced_book.load_snapshot(depth_snapshot)
+    liquidation_frames = load_fixture('force_orders.jsonl').decode().splitlines()
+    market_frames = load_fixture('market_stream.jsonl').decode().splitlines()
+    liquidation_tracker = LiquidationTracker(wall_clock=False)
+    for frame in liquidation_frames:
+        liquidation_tracker.handle_message(frame)
+
+    def parse_and_scan():
+        return parse_premium_index(premium_raw).funding_rates(symbols)
+
+    def replay_market_stream():
+        stream = MarketStream()
+        for frame in market_frames:
+            stream.handle_message(frame)
+        return stream
+
+    def replay_agg_trades():
+        tracker = WhaleTracker()
+        for frame in agg_frames:
+            tracker.handle_message(frame)
+        return tracker
+
+    def replay_depth():
+        book = OrderBook('BTCUSDT')
+        book.load_snapshot(depth_snapshot)
+        for event in depth_events:
+            book.apply_diff(event)
+        return book
+
+    def replay_liquidations():
+        tracker = LiquidationTracker(wall_clock=False)
+        for frame in liquidation_frames:
+            tracker.handle_message(frame)
+        return tracker
+
+    cases = {
+        'data_fetcher.get_binance_funding_rate[cold]': (fetcher.get_binance_funding_rate, reset_caches),
+        'data_fetcher.get_binance_oi[cold]': (fetcher.get_binance_oi, reset_caches),
+        'data_fetcher.get_fear_greed_index[cold]': (fetcher.get_fear_greed_index, reset_caches),
+        'data_fetcher.fetch_all[cold]': (fetcher.fetch_all, reset_caches),
+        'data_fetcher.fetch_all[warm]': (fetcher.fetch_all, None),
+        'market_data.get_coin_data[cold]': (lambda: get_coin_data('BTCUSDT'), reset_caches),
+        'market_data.get_coin_data[warm]': (lambda: get_coin_data('BTCUSDT'), None),
+        'market_data.get_fear_greed[cold]': (get_fear_greed, reset_caches),
+        'market_data.get_fear_greed[warm]': (get_fear_greed, None),
+        'premium_index.parse_scan': (parse_and_scan, None),
+        'strategy.calculate_entry_signal': (
+            lambda: calculate_entry_signal('BTC', all_coin_data['BTC'], fear_greed), None),
+        'signal_engine.score_coin_data': (lambda: score_coin_data(all_coin_data, fear_greed), None),
+        'market_data.fetch_snapshot[universe]': (lambda: fetch_snapshot(None), reset_caches),
+        'signal_engine.score_snapshot[universe]': (lambda: score_snapshot(universe, fear_greed), None),
+        'market_snapshot.to_coin_data[universe]': (lambda: universe.to_coin_data(universe_coins), None),
+        # Dengan --latency: ~max latency adapter, bukan jumlahnya
+        'exchanges.aggregate[cold]': (lambda: aggregator.fetch(symbols), reset_caches),
+        f'stream_ingest.replay[{len(market_frames)}_frames]': (replay_market_stream, None),
+        # Satu iterasi = seluruh rekaman aggTrade; msg/detik = jumlah frame / p50
+        f'whale_stream.replay[{len(agg_frames)}_frames]': (replay_agg_trades, None),
+        # Snapshot 1000 level + semua diff; per diff = (p50 - orderbook.load_snapshot) / jumlah frame
+        'orderbook.load_snapshot': (lambda: OrderBook('BTCUSDT').load_snapshot(depth_snapshot), None),
+        f'orderbook.replay[{len(depth_events)}_diffs]': (replay_depth, None),
+        'orderbook.metrics': (synced_book.metrics, None),
+        f'liquidations.replay[{len(liquidation_frames)}_events]': (replay_liquidations, None),
+        'liquidations.cascades[all_symbols]': (lambda: liquidation_tracker.cascades(list(liquidation_tracker.rings)), None)
+    }
+    cases.update(decode_cases(premium_raw))
+    return cases
+
+
+def _universe_ticker(size):
+    """Payload ticker 24hr seukuran seluruh universe futures, dari record fixture yang diulang"""
+    records = json.loads(load_fixture('spot_ticker_24hr.json'))
+    universe = [dict(records[i % len(records)], symbol=f"SYM{i}USDT") for i in range(size)]
+    return json.dumps(universe).encode()
+
+
+def decode_cases(premium_raw):
+    """Perbandingan decode stdlib (list of dict + float per field) vs kolom per backend fast_json"""
+    ticker_raw = _universe_ticker(len(json.loads(premium_raw)))
+
+    def premium_stdlib():
+        index = {item['symbol']: item for item in json.loads(premium_raw)}
+        return {symbol: float(item['lastFundingRate']) for symbol, item in index.items()}
+
+    def ticker_stdlib():
+        return {item['symbol']: {field: float(item[field]) for field in TICKER_FIELDS} for item in json.loads(ticker_raw)}
+
+    cases = {
+        'decode.premium_index[stdlib]': (premium_stdlib, None),
+        'decode.ticker_universe[stdlib]': (ticker_stdlib, None)
+    }
+    for backend in BACKENDS:
+        cases[f'decode.premium_index[columns-{backend}]'] = (
+            lambda backend=backend: parse_premium_index(premium_raw, backend), None)
+        cases[f'decode.ticker_universe[columns-{backend}]'] = (
+            lambda backend=backend: decode_columns(ticker_raw, TICKER_FIELDS, backend=backend), None)
+    return cases
+
+
+def dashboard_cases():
+    """Case rerun penuh per dashboard lewat streamlit AppTest (kosong kalau streamlit tidak ada)"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit tidak terinstall, benchmark rerun dashboard dilewati")
+        return {}
+
+    import stream_ingest
+    # Stream websocket tidak dijalankan saat benchmark (state kosong = overlay tidak mengubah data)
+    stream_ingest._market_stream = stream_ingest.MarketStream(url="ws://127.0.0.1:9/stream")
+    import whale_stream
+    whale_stream._whale_stream = WhaleStream(url="ws://127.0.0.1:9/stream")
+    import orderbook
+    orderbook._depth_stream = DepthStream(url="ws://127.0.0.1:9/stream")
+    import liquidations
+    liquidations._liquidation_stream = LiquidationStream(url="ws://127.0.0.1:9/stream")
+
+    base = os.path.dirname(os.path.abspath(__file__))
+    cases = {}
+    for script in DASHBOARDS:
+        app = AppTest.from_file(os.path.join(base, script), default_timeout=60)
+        cases[f'dashboard.{script[:-3]}[first_run]'] = (app.run, None)
+        cases[f'dashboard.{script[:-3]}[rerun]'] = (app.run, None)
+    return cases
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return 'unknown'
+
+
+def run(only=None, iterations=200, dashboard_iterations=10, latency_ms=0, output=None):
+    server = start_stub(latency_ms)
+    route_to_stub(server)
+
+    results = {}
+    cases = build_cases()
+    cases.update(dashboard_cases())
+    for name, (fn, setup) in cases.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        if '[first_run]' in name:
+            # Run pertama hanya terjadi sekali per session, tidak ada warmup
+            started = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - started) * 1000
+            results[name] = {'iterations': 1, 'mean_ms': elapsed, 'min_ms': elapsed, 'max_ms': elapsed,
+                             'p50_ms': elapsed, 'p95_ms': elapsed, 'p99_ms': elapsed, 'peak_alloc_kb': None}
+        else:
+            count = dashboard_iterations if name.startswith('dashboard.') else iterations
+            results[name] = measure(fn, count, warmup=1 if name.startswith('dashboard.') else 3, setup=setup)
+        print(_format_row(name, results[name]))
+    server.shutdown()
+
+    report = {
+        'commit': _git_commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpu)",
+        'latency_ms': latency_ms,
+        # ru_maxrss dalam KB di Linux
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'results': results
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{report['commit']}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nmax RSS {report['max_rss_mb']:.1f} MB, hasil disimpan ke {output}")
+    return report
+
+
+def _format_row(name, result):
+    peak = result['peak_alloc_kb']
+    return (f"{name:<52} p50 {result['p50_ms']:9.3f}  p95 {result['p95_ms']:9.3f}  "
+            f"p99 {result['p99_ms']:9.3f} ms  peak {'-' if peak is None else f'{peak:,.0f} KB':>10}")
+
+
+def compare(base_path, head_path, threshold=REGRESSION_THRESHOLD):
+    """Bandingkan dua file hasil, return jumlah case yang regresi di p50 atau p95"""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(head_path) as f:
+        head = json.load(f)
+
+    print(f"base {base['commit']} ({base['created_at']})  vs  head {head['commit']} ({head['created_at']})\n")
+    regressions = 0
+    for name, current in head['results'].items():
+        previous = base['results'].get(name)
+        if previous is None:
+            print(f"{name:<52} (baru)")
+            continue
+        changes = []
+        regressed = False
+        for key in ('p50_ms', 'p95_ms'):
+            ratio = current[key] / previous[key] - 1 if previous[key] else 0
+            regressed = regressed or ratio > threshold
+            changes.append(f"{key[:3]} {previous[key]:9.3f} -> {current[key]:9.3f} ({ratio:+7.1%})")
+        regressions += regressed
+        print(f"{name:<52} {'  '.join(changes)}{'  REGRESI' if regressed else ''}")
+    return regressions
+
+
+RECORD_REQUESTS = {
+    'premium_index.json': ("https://fapi.binance.com/fapi/v1/premiumIndex", None),
+    'spot_ticker_24hr.json': ("https://api.binance.com/api/v3/ticker/24hr",
+                              {'symbols': json.dumps(list(SUPPORTED_COINS.values()), separators=(',', ':'))}),
+    'futures_ticker_24hr.json': ("https://fapi.binance.com/fapi/v1/ticker/24hr", None),
+    'klines_1h.json': ("https://fapi.binance.com/fapi/v1/klines", {'symbol': 'BTCUSDT', 'interval': '1h', 'limit': 200}),
+    'fear_greed.json': ("https://api.alternative.me/fng/", None),
+    'coinbase_exchange_rates.json': ("https://api.coinbase.com/v2/exchange-rates", {'currency': 'BTC'}),
+    'coinlore_ticker.json': ("https://api.coinlore.net/api/ticker/", {'id': 90}),
+    'bybit_tickers.json': ("https://api.bybit.com/v5/market/tickers", {'category': 'linear'}),
+    'okx_tickers.json': ("https://www.okx.com/api/v5/market/tickers", {'instType': 'SWAP'}),
+    'okx_open_interest.json': ("https://www.okx.com/api/v5/public/open-interest", {'instType': 'SWAP'})
+}
+
+
+def record():
+    """Rekam ulang fixture dari API asli (session terpisah, tanpa stub)"""
+    session = requests.Session()
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, (url, params) in RECORD_REQUESTS.items():
+        response = session.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURE_DIR, name), 'wb') as f:
+            f.write(response.content)
+        print(f"{name}: {len(response.content):,} bytes")
+
+    open_interest = [
+        session.get("https://fapi.binance.com/fapi/v1/openInterest", params={'symbol': symbol}, timeout=10).json()
+        for symbol in SUPPORTED_COINS.values()
+    ]
+    with open(os.path.join(FIXTURE_DIR, 'open_interest.json'), 'w') as f:
+        json.dump(open_interest, f, indent=1)
+    print(f"open_interest.json: {len(open_interest)} symbols")
+
+    # Endpoint per instrumen digabung jadi satu file
+    funding = {'code': '0', 'msg': '', 'data': []}
+    product_stats = {}
+    for symbol in SUPPORTED_COINS.values():
+        inst_id = OKXAdapter.inst_id(symbol)
+        funding['data'] += session.get("https://www.okx.com/api/v5/public/funding-rate",
+                                       params={'instId': inst_id}, timeout=10).json()['data']
+        product = CoinbaseAdapter.product_id(symbol)
+        response = session.get(CoinbaseAdapter.URL.format(product=product), timeout=10)
+        if response.ok:
+            product_stats[product] = response.json()
+    for name, data in (('okx_funding_rate.json', funding), ('coinbase_product_stats.json', product_stats)):
+        with open(os.path.join(FIXTURE_DIR, name), 'w') as f:
+            json.dump(data, f, indent=1)
+        print(f"{name}: {len(data.get('data', data))} instrumen")
+
+    # Frame !markPrice@arr / !ticker@arr berisi seluruh universe: disaring ke SUPPORTED_COINS supaya fixture kecil
+    supported = set(SUPPORTED_COINS.values())
+    frames = asyncio.run(_record_stream(MarketStream().stream_url, seconds=60, limit=60))
+    frames = [json.dumps(dict(message, data=[item for item in message['data'] if item['s'] in supported]),
+                         separators=(',', ':'))
+              for message in map(json.loads, frames)]
+    _write_frames('market_stream.jsonl', frames)
+
+    frames = asyncio.run(_record_stream(WhaleStream(('BTCUSDT', 'ETHUSDT')).stream_url))
+    _write_frames('agg_trades.jsonl', frames)
+
+    # Snapshot diambil setelah frame depth pertama masuk, supaya diff rekaman sambung dengan snapshot
+    def depth_snapshot():
+        response = session.get("https://fapi.binance.com/fapi/v1/depth",
+                               params={'symbol': 'BTCUSDT', 'limit': 1000}, timeout=10)
+        with open(os.path.join(FIXTURE_DIR, 'depth_snapshot.json'), 'wb') as f:
+            f.write(response.content)
+    frames = asyncio.run(_record_stream(DepthStream(('BTCUSDT',)).stream_url, seconds=30, on_first=depth_snapshot))
+    _write_frames('depth_diffs.jsonl', frames)
+
+    # Likuidasi jarang: rekam paling lama 30 menit
+    frames = asyncio.run(_record_stream(LiquidationStream().stream_url, seconds=1800, limit=2000))
+    _write_frames('force_orders.jsonl', frames)
+
+
+def _write_frames(name, frames):
+    with open(os.path.join(FIXTURE_DIR, name), 'w') as f:
+        f.write('\n'.join(frames) + '\n')
+    print(f"{name}: {len(frames)} frames")
+
+
+async def _record_stream(url, seconds=300, limit=5000, on_first=None):
+    """Rekam frame mentah dari combined stream Binance; on_first dipanggil setelah frame pertama"""
+    import websockets
+    frames = []
+    deadline = time.monotonic() + seconds
+    async with websockets.connect(url) as ws:
+        while len(frames) < limit and time.monotonic() < deadline:
+            if len(frames) == 1 and on_first:
+                await asyncio.to_thread(on_first)
+            try:
+                frames.append(await asyncio.wait_for(ws.recv(), timeout=max(deadline - time.monotonic(), 0.1)))
+            except asyncio.TimeoutError:
+                break
+    return frames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hot path dashboard (offline)")
+    parser.add_argument("--only", nargs="*", help="Hanya case yang namanya mengandung salah satu pola ini")
+    parser.add_argument("--iterations", type=int, default=200, help="Iterasi per case")
+    parser.add_argument("--dashboard-iterations", type=int, default=10, help="Iterasi rerun per dashboard")
+    parser.add_argument("--latency", type=float, default=0, help="Latency tambahan stub per request (ms)")
+    parser.add_argument("--output", help="File hasil (default benchmarks/results/<waktu>_<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="Bandingkan dua file hasil")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Batas kenaikan p50/p95 yang dianggap regresi (0.10 = 10%%)")
+    parser.add_argument("--record", action="store_true", help="Rekam ulang fixture dari API asli")
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+    elif args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+    else:
+        run(args.only, args.iterations, args.dashboard_iterations, args.latency, args.output)
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+import http_client
+from fast_json import decode_columns, index_columns
+from instrumentation import get_metrics, instrument
+from swr_cache import MAX_STALE
+
+PREMIUM_INDEX_URL = "https://fapi.binance.com/fapi/v1/premiumIndex"
+DEFAULT_TTL = float(os.environ.get("PREMIUM_INDEX_TTL", 15))  # detik
+
+
+# Field premiumIndex yang dipakai, field lain tidak di-decode
+PREMIUM_FIELDS = ('markPrice', 'indexPrice', 'lastFundingRate', 'nextFundingTime')
+
+
+class PremiumIndex:
+    """premiumIndex dalam bentuk kolom NumPy + index baris per symbol"""
+
+    __slots__ = ('columns', 'rows')
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.rows = index_columns(columns)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, symbol):
+        return symbol in self.rows
+
+    def get(self, symbol, default=None):
+        """Record satu symbol sebagai dict float (None kalau tidak ada)"""
+        row = self.rows.get(symbol)
+        if row is None:
+            return default
+        record = {'symbol': symbol}
+        for field in PREMIUM_FIELDS:
+            record[field] = float(self.columns[field][row])
+        return record
+
+    def funding_rates(self, symbols):
+        """Funding rate (%) untuk banyak symbol sekaligus, NaN untuk symbol yang tidak ada"""
+        rows = np.array([self.rows.get(symbol, -1) for symbol in symbols], dtype=np.intp)
+        rates = np.full(len(rows), np.nan)
+        found = rows >= 0
+        rates[found] = self.columns['lastFundingRate'][rows[found]] * 100
+        return rates
+
+
+def parse_premium_index(raw, backend=None):
+    """Decode body premiumIndex (bytes) langsung ke PremiumIndex"""
+    return PremiumIndex(decode_columns(raw, PREMIUM_FIELDS, backend=backend))
+
+
+class PremiumIndexCache:
+    """Cache proses-wide untuk payload penuh premiumIndex Binance"""
+
+    def __init__(self, ttl=DEFAULT_TTL, url=PREMIUM_INDEX_URL, timeout=10, max_stale=MAX_STALE):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.url = url
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._refreshing = False
+        self._index = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self):
+        return self._index and (time.monotonic() - self._fetched_at) < self.ttl
+
+    @instrument("fetch.premium_index")
+    def _download(self):
+        """Download seluruh array premiumIndex dan index per symbol"""
+        response = http_client.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return parse_premium_index(response.content)
+
+    def fetch_index(self):
+        """Download sekarang tanpa melihat TTL / max_stale (untuk collector); hasilnya juga mengisi cache"""
+        index = self._download()
+        with self._lock:
+            self._index = index
+            self._fetched_at = time.monotonic()
+        return index
+
+    def _refresh(self):
+        try:
+            self.fetch_index()
+        except Exception:
+            pass
+        finally:
+            self._refreshing = False
+
+    def get_index(self):
+        """Ambil PremiumIndex terbaru, download ulang kalau TTL habis"""
+        if self._is_fresh():
+            self.hits += 1
+            get_metrics().record_cache("premium_index", True)
+            return self._index
+
+        get_metrics().record_cache("premium_index", False)
+        # Stale-while-revalidate: index lama tetap dipakai selama max_stale,
+        # download baru jalan di background
+        if self._index and time.monotonic() - self._fetched_at < self.max_stale:
+            self.stale_hits += 1
+            with self._lock:
+                start_refresh = not self._refreshing
+                self._refreshing = True
+            if start_refresh:
+                threading.Thread(target=self._refresh, name="premium-index-refresh", daemon=True).start()
+            return self._index
+
+        # Satu thread saja yang download, sisanya menunggu hasil yang sama
+        with self._lock:
+            if self._is_fresh():
+                self.hits += 1
+                return self._index
+            self.misses += 1
+            self._index = self._download()
+            self._fetched_at = time.monotonic()
+            return self._index
+
+    def get(self, symbol):
+        """Ambil record premiumIndex untuk satu symbol (None kalau tidak ada)"""
+        return self.get_index().get(symbol)
+
+    def get_funding_rate(self, symbol):
+        """Funding rate terakhir dalam persen (NaN kalau symbol tidak ada / funding kosong)"""
+        index = self.get_index()
+        row = index.rows.get(symbol)
+        return float(index.columns['lastFundingRate'][row]) * 100 if row is not None else np.nan
+
+    def invalidate(self):
+        with self._lock:
+            self._index = {}
+            self._fetched_at = 0.0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale_hits': self.stale_hits,
+            'hit_rate': self.hits / total if total else 0,
+            'symbols': len(self._index),
+            'age': time.monotonic() - self._fetched_at if self._fetched_at else None,
+            'ttl': self.ttl
+        }
+
+
+# Satu instance per proses, dipakai bersama oleh semua dashboard dan semua session
+_premium_index_cache = PremiumIndexCache()
+
+
+def get_premium_index_cache():
+    return _premium_index_cache
+
+
+def set_premium_index_ttl(ttl):
+    """Ubah TTL cache premiumIndex (detik)"""
+    _premium_index_cache.ttl = ttl
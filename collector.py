@@ -0,0 +1,76 @@
+"""
+Collector data market yang berjalan terpisah dari Streamlit.
+
+Polling Binance dan alternative.me sesuai jadwal lalu menulis snapshot ke
+store lokal. Dashboard cukup membaca store, jadi jumlah request ke upstream
+tidak tergantung jumlah viewer.
+
+    python collector.py --interval 30
+    python collector.py --universe      # seluruh symbol futures (tanpa OI)
+    python collector.py --liquidations  # + rollup likuidasi dari !forceOrder@arr
+"""
+import argparse
+import time
+from datetime import datetime
+
+from instrumentation import export
+from fear_greed import get_fear_greed_provider
+from liquidations import LiquidationStream
+from market_data import SUPPORTED_COINS, fetch_snapshot
+from timeseries_store import get_store, DEFAULT_DB_PATH
+
+DEFAULT_INTERVAL = 30  # detik
+
+
+def collect_once(store, universe=False):
+    """Ambil satu snapshot semua coin + Fear & Greed dan tulis ke store"""
+    ts = time.time()
+    # Fetch langsung tanpa cache (termasuk premiumIndex): collector harus selalu menulis data baru
+    snapshot = fetch_snapshot(None if universe else list(SUPPORTED_COINS.values()), use_cache=False)
+    # Coin yang gagal diambil tidak ditulis, reader akan melihatnya stale
+    written = store.record_snapshot(snapshot, ts)
+
+    # Provider hanya request ke alternative.me saat jadwal update index tiba
+    fear_greed = get_fear_greed_provider().get()
+    if not fear_greed['degraded']:
+        store.record_fear_greed(fear_greed, ts)
+
+    store.flush()
+    return written
+
+
+def run(interval=DEFAULT_INTERVAL, db_path=DEFAULT_DB_PATH, universe=False, liquidations=False):
+    store = get_store(db_path)
+    print(f"Collector started: interval {interval}s, store {db_path}{', full universe' if universe else ''}")
+    liquidation_stream = None
+    if liquidations:
+        # Stream berjalan di thread sendiri; bucket ditulis bersama snapshot tiap interval.
+        # Collector satu-satunya penulis tabel liquidations, dashboard hanya membaca
+        liquidation_stream = LiquidationStream(store=store)
+        print(f"Liquidation rollups restored: {liquidation_stream.tracker.restore(store)} buckets")
+        liquidation_stream.start()
+    while True:
+        started = time.monotonic()
+        try:
+            written = collect_once(store, universe)
+            if liquidation_stream:
+                liquidation_stream.persist()
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] {written} symbols written")
+        except Exception as e:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] collect failed: {e}")
+        export()
+        # Jadwal tetap, tidak bergeser karena lama request
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collector data market untuk dashboard")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Interval polling (detik)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path database SQLite")
+    parser.add_argument("--universe", action="store_true", help="Simpan seluruh symbol futures, bukan hanya SUPPORTED_COINS")
+    parser.add_argument("--liquidations", action="store_true", help="Kumpulkan rollup likuidasi dari !forceOrder@arr")
+    args = parser.parse_args()
+    try:
+        run(args.interval, args.db, args.universe, args.liquidations)
+    except KeyboardInterrupt:
+        pass
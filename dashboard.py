@@ -3,6 +3,9 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
 from data_fetcher import DataFetcher
+from timeseries_store import get_store
+from instrumentation import timed, diagnostics_panel, export
+from live_refresh import LIVE_REFRESH_SECONDS, is_fragment_rerun, live_fragment, live_interval
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -38,55 +41,82 @@ data_fetcher = init_data_fetcher()
 st.title("🚀 Trading Future Dashboard")
 st.markdown("**Real-time Crypto Trading Signals & Analysis**")
 
-# Auto refresh setiap 30 detik
-if 'last_update' not in st.session_state:
-    st.session_state.last_update = datetime.now()
-
 # Tombol refresh manual
 col1, col2, col3 = st.columns([1, 1, 8])
 with col1:
     if st.button("🔄 Refresh"):
-        st.session_state.last_update = datetime.now()
         st.rerun()
 
 with col2:
     auto_refresh = st.checkbox("Auto Refresh", value=True)
 
-# Auto refresh logic
-if auto_refresh:
-    time_diff = (datetime.now() - st.session_state.last_update).seconds
-    if time_diff > 30:  # Refresh setiap 30 detik
-        st.session_state.last_update = datetime.now()
-        st.rerun()
+def load_data():
+    """Data dari collector kalau jalan, fallback ke fetch langsung (SWR, nilai terakhir langsung dipakai)"""
+    # Semua HTTP call jalan paralel, latency ~ call paling lambat
+    fetched = data_fetcher.read_from_store(get_store()) or data_fetcher.fetch_all()
+    return fetched, data_fetcher.calculate_signal_score(fetched['funding'], fetched['fear_greed'])
 
 # Fetch data
-with st.spinner("Loading data..."):
-    funding_data = data_fetcher.get_binance_funding_rate()
-    oi_data = data_fetcher.get_binance_oi()
-    fear_greed = data_fetcher.get_fear_greed_index()
+with st.spinner("Loading data..."), timed("dashboard.main.fetch"):
+    fetched, signal_analysis = load_data()
+    funding_data = fetched['funding']
+    oi_data = fetched['oi']
+    fear_greed = fetched['fear_greed']
     news_data = data_fetcher.get_crypto_news()
     whale_data = data_fetcher.get_whale_alerts()
-    signal_analysis = data_fetcher.calculate_signal_score(funding_data, fear_greed)
-
-# Main Signal Panel
-st.markdown("### 🎯 Trading Signal")
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    signal_color = "bullish" if "LONG" in signal_analysis['overall'] else "bearish" if "SHORT" in signal_analysis['overall'] else "neutral"
-    st.markdown(f"<h2 class='{signal_color}'>{signal_analysis['overall']}</h2>", unsafe_allow_html=True)
-    st.write(f"Score: {signal_analysis['score']}")
-
-with col2:
-    st.metric("Fear & Greed", f"{fear_greed['value']}", fear_greed['classification'])
-
-with col3:
-    st.metric("BTC Funding", f"{funding_data['BTC']:.4f}%", 
-              "Bullish" if funding_data['BTC'] < 0 else "Bearish")
 
-with col4:
-    st.metric("ETH Funding", f"{funding_data['ETH']:.4f}%",
-              "Bullish" if funding_data['ETH'] < 0 else "Bearish")
+# Waktu data + sinyal terakhir dimuat (rerun penuh atau tick tile sinyal)
+signal_time = st.session_state.last_update = datetime.now()
+
+def signal_state(fetched, signal_analysis):
+    """Bagian sinyal yang juga tampil di panel bawah; kalau berubah saat tick, seluruh halaman di-rerun"""
+    return signal_analysis['overall'], signal_analysis['score'], signal_analysis['signals'], fetched['fear_greed']['value']
+
+# Auto refresh: tiap interval tile sinyal memuat ulang data (store collector / cache SWR) dan
+# menghitung ulang sinyal. Kalau sinyal berubah, seluruh halaman di-rerun supaya panel ikut sama
+@live_fragment("dashboard.main.tiles", run_every=live_interval(auto_refresh))
+def signal_tiles(fetched, signal_analysis, signal_time):
+    if is_fragment_rerun("dashboard.main.tiles"):
+        previous = signal_state(fetched, signal_analysis)
+        fetched, signal_analysis = load_data()
+        signal_time = st.session_state.last_update = datetime.now()
+        if signal_state(fetched, signal_analysis) != previous:
+            st.rerun()
+    funding_data = fetched['funding']
+    fear_greed = fetched['fear_greed']
+
+    failed_sources = [f"{name} ({info['status']})" for name, info in fetched['status'].items()
+                      if info['status'] not in ('ok', 'stale')]
+    if failed_sources:
+        st.warning(f"⚠️ Data tidak lengkap: {', '.join(failed_sources)}")
+    stale_ages = [info['data_age'] for info in fetched['status'].values()
+                  if info['status'] == 'stale' and info.get('data_age')]
+    if stale_ages:
+        st.caption(f"⏳ Menampilkan data terakhir ({max(stale_ages):.0f} detik), refresh berjalan di background")
+
+    # Main Signal Panel
+    st.markdown("### 🎯 Trading Signal")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        signal_color = "bullish" if "LONG" in signal_analysis['overall'] else "bearish" if "SHORT" in signal_analysis['overall'] else "neutral"
+        st.markdown(f"<h2 class='{signal_color}'>{signal_analysis['overall']}</h2>", unsafe_allow_html=True)
+        st.write(f"Score: {signal_analysis['score']}")
+
+    with col2:
+        st.metric("Fear & Greed", f"{fear_greed['value']}", fear_greed['classification'])
+
+    with col3:
+        st.metric("BTC Funding", f"{funding_data['BTC']:.4f}%", 
+                  "Bullish" if funding_data['BTC'] < 0 else "Bearish")
+
+    with col4:
+        st.metric("ETH Funding", f"{funding_data['ETH']:.4f}%",
+                  "Bullish" if funding_data['ETH'] < 0 else "Bearish")
+
+    st.caption(f"Last Update: {signal_time.strftime('%H:%M:%S')}")
+
+signal_tiles(fetched, signal_analysis, signal_time)
 
 st.divider()
 
@@ -127,10 +157,10 @@ with col2:
     if whale_data:
         for whale in whale_data[:3]:  # Show top 3
             whale_type = whale['type'].replace('_', ' ').title()
-            color = "🔴" if "inflow" in whale['type'] else "🟢"
-            st.write(f"{color} {whale['amount']:,.0f} {whale['symbol']} - {whale_type}")
+            color = "🔴" if "sell" in whale['type'] else "🟢"
+            st.write(f"{color} {whale['amount']:,.2f} {whale['symbol']} (${whale['notional'] / 1e6:,.2f}M) - {whale_type}")
     else:
-        st.write("No recent whale activity")
+        st.write("No recent whale activity (stream aggTrade belum ada data)")
     
     # Fear & Greed Gauge
     fig_gauge = go.Figure(go.Indicator(
@@ -185,16 +215,17 @@ with col4:
 
 # Footer dengan timestamp
 st.divider()
-st.markdown(f"**Last Update:** {st.session_state.last_update.strftime('%H:%M:%S')} | **Next Refresh:** {auto_refresh}")
+st.markdown(f"**Rerun penuh:** {signal_time.strftime('%H:%M:%S')} | **Live Tiles:** {f'setiap {LIVE_REFRESH_SECONDS:.0f} detik' if live_interval(auto_refresh) else 'off'}")
 
 # Sidebar dengan pengaturan
 with st.sidebar:
     st.markdown("### ⚙️ Settings")
-    st.write("**Refresh Interval:** 30 seconds")
+    st.write(f"**Refresh Interval:** {LIVE_REFRESH_SECONDS:.0f} seconds (tiles)")
     st.write("**Data Sources:**")
     st.write("• Binance API (Funding, OI)")
     st.write("• Alternative.me (Fear & Greed)")
-    st.write("• Simulated (Whale, News)")
+    st.write("• Binance aggTrade stream (Whale)")
+    st.write("• Simulated (News)")
     
     st.markdown("### 📊 Signal Scoring")
     st.write("**Bullish Signals:**")
@@ -205,4 +236,9 @@ with st.sidebar:
     st.write("**Bearish Signals:**")
     st.write("• High funding rate (>0.1%)")
     st.write("• Extreme greed (>75)")
-    st.write("• Whale distribution")
\ No newline at end of file
+    st.write("• Whale distribution")
+
+    with st.expander("🩺 Diagnostics"):
+        diagnostics_panel(st)
+
+export()
@@ -1,60 +1,142 @@
-import requests
+import http_client
 from datetime import datetime, timedelta
 import time
+import numpy as np
+from binance_cache import get_premium_index_cache
+from fear_greed import get_fear_greed_provider
+from fetch_engine import get_fetch_engine
+from instrumentation import instrument
+from market_data import read_coin_data, read_fear_greed, COLLECTOR_MAX_AGE
+from strategy import resolve_thresholds
+from swr_cache import get_swr_cache, serve
+from whale_stream import get_whale_tracker
+
+def _value_degraded(value):
+    # Loader bisa menandai sendiri nilai yang tidak lengkap (mis. funding NaN)
+    return isinstance(value, dict) and bool(value.get('degraded'))
 
 class DataFetcher:
     def __init__(self):
-        self.session = requests.Session()
+        # Session bersama dengan connection pool + keep-alive
+        self.session = http_client.get_session()
+        
+    @instrument("data_fetcher.funding")
+    def _fetch_funding_rate(self):
+        # premiumIndex diambil dari cache bersama, bukan download tiap rerun
+        cache = get_premium_index_cache()
+        btc = cache.get_funding_rate('BTCUSDT')
+        eth = cache.get_funding_rate('ETHUSDT')
         
+        # Symbol tidak ada di premiumIndex = NaN + degraded, bukan 0
+        return {
+            'BTC': btc,
+            'ETH': eth,
+            'timestamp': datetime.now(),
+            'degraded': bool(np.isnan(btc) or np.isnan(eth))
+        }
+    
+    @instrument("data_fetcher.open_interest")
+    def _fetch_oi_symbol(self, symbol, timeout=10):
+        url = "https://fapi.binance.com/fapi/v1/openInterest"
+        response = http_client.get(url, params={'symbol': symbol}, timeout=timeout)
+        data = response.json()
+        return float(data['openInterest'])
+    
+    def _fetch_oi(self):
+        # Satu request per symbol, dijalankan paralel
+        symbols = ['BTCUSDT', 'ETHUSDT']
+        results, status = get_fetch_engine().run(
+            {symbol: (lambda s=symbol: self._fetch_oi_symbol(s)) for symbol in symbols}
+        )
+        failed = [s for s in symbols if status[s]['status'] != 'ok']
+        if failed:
+            raise RuntimeError(f"Open interest gagal: {', '.join(failed)}")
+        return {symbol.replace('USDT', ''): results[symbol] for symbol in symbols}
+    
     def get_binance_funding_rate(self):
-        """Ambil funding rate dari Binance"""
-        try:
-            url = "https://fapi.binance.com/fapi/v1/premiumIndex"
-            response = self.session.get(url, timeout=10)
-            data = response.json()
-            
-            # Filter untuk BTC dan ETH
-            btc_data = next((item for item in data if item['symbol'] == 'BTCUSDT'), None)
-            eth_data = next((item for item in data if item['symbol'] == 'ETHUSDT'), None)
-            
-            return {
-                'BTC': float(btc_data['lastFundingRate']) * 100 if btc_data else 0,
-                'ETH': float(eth_data['lastFundingRate']) * 100 if eth_data else 0,
-                'timestamp': datetime.now()
-            }
-        except:
-            return {'BTC': 0, 'ETH': 0, 'timestamp': datetime.now()}
+        """Ambil funding rate dari Binance (nilai terakhir langsung dipakai, refresh di background)"""
+        return serve(('data_fetcher', 'funding'), self._fetch_funding_rate,
+                     {'BTC': np.nan, 'ETH': np.nan, 'timestamp': datetime.now()})
     
     def get_binance_oi(self):
-        """Ambil Open Interest dari Binance"""
-        try:
-            url = "https://fapi.binance.com/fapi/v1/openInterest"
-            symbols = ['BTCUSDT', 'ETHUSDT']
-            oi_data = {}
-            
-            for symbol in symbols:
-                response = self.session.get(url, params={'symbol': symbol}, timeout=10)
-                data = response.json()
-                oi_data[symbol.replace('USDT', '')] = float(data['openInterest'])
-            
-            return oi_data
-        except:
-            return {'BTC': 0, 'ETH': 0}
+        """Ambil Open Interest dari Binance (nilai terakhir langsung dipakai, refresh di background)"""
+        return serve(('data_fetcher', 'oi'), self._fetch_oi, {'BTC': np.nan, 'ETH': np.nan})
     
     def get_fear_greed_index(self):
-        """Ambil Fear & Greed Index"""
-        try:
-            url = "https://api.alternative.me/fng/"
-            response = self.session.get(url, timeout=10)
-            data = response.json()
-            
-            return {
-                'value': int(data['data'][0]['value']),
-                'classification': data['data'][0]['value_classification'],
-                'timestamp': datetime.now()
-            }
-        except:
-            return {'value': 50, 'classification': 'Neutral', 'timestamp': datetime.now()}
+        """Fear & Greed Index dari provider proses (di-cache sampai jadwal update berikutnya)"""
+        return get_fear_greed_provider().get()
+    
+    @instrument("data_fetcher.fetch_all")
+    def fetch_all(self, call_timeout=10, deadline=12):
+        """Ambil funding dan OI secara paralel, Fear & Greed dari provider (tanpa request per render)"""
+        symbols = ['BTCUSDT', 'ETHUSDT']
+        swr = get_swr_cache()
+        # Source yang sudah punya nilai langsung return, hanya yang kosong benar-benar menunggu upstream
+        tasks = {
+            'funding': lambda: swr.get(('data_fetcher', 'funding'), self._fetch_funding_rate)
+        }
+        for symbol in symbols:
+            tasks[f"oi_{symbol}"] = (lambda s=symbol: swr.get(
+                ('data_fetcher', 'oi', s), lambda: self._fetch_oi_symbol(s, timeout=call_timeout)))
+        
+        results, status = get_fetch_engine().run(tasks, call_timeout=call_timeout, deadline=deadline)
+        fear_greed = self.get_fear_greed_index()
+        provider = get_fear_greed_provider()
+        status['fear_greed'] = {
+            'status': 'degraded' if fear_greed['degraded'] else 'stale' if fear_greed['stale'] else 'ok',
+            'elapsed': 0, 'error': provider.last_error, 'data_age': fear_greed['data_age']
+        }
+        
+        # Status ikut metadata cache: stale = nilai lama yang sedang di-refresh, error = belum ada nilai
+        for name, served in results.items():
+            if served.value is None:
+                status[name].update({'status': 'error', 'error': served.error})
+            elif served.degraded or _value_degraded(served.value):
+                status[name].update({'status': 'degraded', 'error': served.error})
+            elif served.stale:
+                status[name]['status'] = 'stale'
+            status[name]['data_age'] = served.age
+        
+        def _value(name, fallback):
+            served = results.get(name)
+            if served is None or served.value is None:
+                return fallback, True
+            return served.value, served.degraded or _value_degraded(served.value)
+        
+        funding, funding_degraded = _value('funding', {'BTC': np.nan, 'ETH': np.nan, 'timestamp': datetime.now()})
+        
+        oi_data = {}
+        for symbol in symbols:
+            oi_data[symbol.replace('USDT', '')], _ = _value(f"oi_{symbol}", np.nan)
+        
+        return {
+            'funding': dict(funding, degraded=funding_degraded),
+            'oi': oi_data,
+            'fear_greed': fear_greed,
+            'status': status
+        }
+    
+    def read_from_store(self, store, max_age=COLLECTOR_MAX_AGE):
+        """Baca snapshot collector dengan format fetch_all (None kalau belum ada / basi)"""
+        btc = read_coin_data(store, 'BTCUSDT', max_age)
+        eth = read_coin_data(store, 'ETHUSDT', max_age)
+        fear_greed = read_fear_greed(store, max_age)
+        if btc is None or eth is None or fear_greed is None:
+            return None
+        
+        fear_greed['timestamp'] = datetime.now()
+        funding_degraded = btc['degraded'] or eth['degraded']
+        status = {name: {'status': 'ok', 'elapsed': 0, 'error': None}
+                  for name in ['funding', 'fear_greed', 'oi_BTCUSDT', 'oi_ETHUSDT']}
+        if funding_degraded:
+            status['funding']['status'] = 'degraded'
+        return {
+            'funding': {'BTC': btc['funding_rate'], 'ETH': eth['funding_rate'], 'timestamp': datetime.now(),
+                        'degraded': funding_degraded},
+            'oi': {'BTC': btc['open_interest'], 'ETH': eth['open_interest']},
+            'fear_greed': fear_greed,
+            'status': status
+        }
     
     def get_crypto_news(self):
         """Ambil crypto news dari CoinDesk RSS (free)"""
@@ -69,42 +151,53 @@ class DataFetcher:
         except:
             return []
     
-    def get_whale_alerts(self):
-        """Simulasi whale alerts (API gratis terbatas)"""
+    def get_whale_alerts(self, limit=10):
+        """Trade whale terbaru dari stream aggTrade (kosong kalau stream tidak aktif)"""
         try:
-            # Simulasi data whale movement
-            whale_data = [
-                {"amount": 1500, "symbol": "BTC", "type": "exchange_inflow", "time": datetime.now()},
-                {"amount": 25000, "symbol": "ETH", "type": "exchange_outflow", "time": datetime.now()},
-                {"amount": 800, "symbol": "BTC", "type": "large_transfer", "time": datetime.now()}
+            tracker = get_whale_tracker()
+            if tracker is None or not tracker.is_live():
+                return []
+            return [
+                {"amount": event['qty'], "symbol": event['symbol'].replace('USDT', ''),
+                 "type": f"whale_{event['side']}", "notional": event['notional'],
+                 "time": datetime.fromtimestamp(event['time'])}
+                for event in tracker.recent_events(limit=limit)
             ]
-            return whale_data
         except:
             return []
     
-    def calculate_signal_score(self, funding_rate, fear_greed, oi_change=0):
+    @instrument("score.signal_score")
+    def calculate_signal_score(self, funding_rate, fear_greed, oi_change=0, thresholds=None):
         """Hitung skor sinyal berdasarkan data"""
+        thresholds = resolve_thresholds(thresholds)
         score = 0
         signals = []
         
         # Funding Rate Signal
-        if funding_rate['BTC'] > 0.1:
+        if funding_rate['BTC'] > thresholds['funding_high']:
             score -= 1
             signals.append("High funding rate (bearish)")
-        elif funding_rate['BTC'] < -0.05:
+        elif funding_rate['BTC'] < thresholds['funding_low']:
             score += 1
             signals.append("Negative funding rate (bullish)")
         
         # Fear & Greed Signal
-        if fear_greed['value'] < 25:
+        if fear_greed['value'] < thresholds['fear_low']:
             score += 1
             signals.append("Extreme fear (contrarian bullish)")
-        elif fear_greed['value'] > 75:
+        elif fear_greed['value'] > thresholds['greed_high']:
             score -= 1
             signals.append("Extreme greed (contrarian bearish)")
         
+        # Data gagal diambil / terlalu basi: jangan keluarkan sinyal trade
+        degraded = bool(funding_rate.get('degraded') or fear_greed.get('degraded'))
+        if degraded:
+            signals.append("Data degraded (no trade)")
+        
         # Determine overall signal
-        if score >= 2:
+        if degraded:
+            overall = "NO TRADE"
+        elif score >= 2:
             overall = "STRONG LONG"
         elif score == 1:
             overall = "LONG"
@@ -119,5 +212,6 @@ class DataFetcher:
             'score': score,
             'signals': signals,
             'overall': overall,
+            'degraded': degraded,
             'timestamp': datetime.now()
         }
\ No newline at end of file
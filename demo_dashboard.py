@@ -1,5 +1,7 @@
 import streamlit as st
-import requests
+import http_client
+from failover import get_failover_chain
+from fear_greed import get_fear_greed_provider
 from datetime import datetime
 import time
 
@@ -26,37 +28,38 @@ LIVE_PRICES = {
     'DOGE': 0.085
 }
 
+# ID coin di CoinLore
+COINLORE_IDS = {
+    'BTC': 90,
+    'ETH': 80,
+    'SOL': 48543,
+    'BNB': 2710,
+    'ADA': 257,
+    'XRP': 58,
+    'DOGE': 2
+}
+
+def coinbase_price(coin):
+    response = http_client.get(f"https://api.coinbase.com/v2/exchange-rates?currency={coin}", timeout=5)
+    response.raise_for_status()
+    return float(response.json()['data']['rates']['USD'])
+
+def coinlore_price(coin):
+    response = http_client.get(f"https://api.coinlore.net/api/ticker/?id={COINLORE_IDS[coin]}", timeout=5)
+    response.raise_for_status()
+    return float(response.json()[0]['price_usd'])
+
+# Satu chain per proses: health sumber tetap tersimpan antar rerun
+price_chain = get_failover_chain('demo_price', {'Coinbase': coinbase_price, 'CoinLore': coinlore_price})
+
 def get_live_data(coin):
-    """Try multiple APIs, fallback to simulated live data"""
-    
-    # Try simple price API first
-    try:
-        if coin == 'BTC':
-            # Try Bitcoin price API
-            response = requests.get("https://api.coinbase.com/v2/exchange-rates?currency=BTC", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                price = float(data['data']['rates']['USD'])
-                st.success("✅ Live data from Coinbase API")
-                return create_coin_data(price, coin)
-    except:
-        pass
-    
-    # Try alternative API
-    try:
-        response = requests.get(f"https://api.coinlore.net/api/ticker/?id=90", timeout=5)
-        if response.status_code == 200 and coin == 'BTC':
-            data = response.json()
-            if data and len(data) > 0:
-                price = float(data[0]['price_usd'])
-                st.success("✅ Live data from CoinLore API")
-                return create_coin_data(price, coin)
-    except:
-        pass
-    
-    # Fallback to simulated live data
-    st.warning("⚠️ APIs unavailable, using simulated live data")
-    return get_simulated_data(coin)
+    """Harga dari sumber tersehat (dengan hedging), fallback ke simulated live data"""
+    price, source = price_chain.call(coin, fallback=lambda c: None)
+    if price is None:
+        st.warning("⚠️ APIs unavailable, using simulated live data")
+        return get_simulated_data(coin)
+    st.success(f"✅ Live data from {source} API")
+    return create_coin_data(price, coin)
 
 def create_coin_data(price, coin):
     """Create coin data structure from price"""
@@ -106,17 +109,10 @@ def get_simulated_data(coin):
     }
 
 def get_fear_greed():
-    """Get Fear & Greed with fallback"""
-    try:
-        response = requests.get("https://api.alternative.me/fng/", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'value': int(data['data'][0]['value']),
-                'classification': data['data'][0]['value_classification']
-            }
-    except:
-        pass
+    """Get Fear & Greed (cached until the next index update) with fallback"""
+    fear_greed = get_fear_greed_provider().get()
+    if not fear_greed['degraded']:
+        return fear_greed
     
     # Fallback to realistic simulation
     import random
@@ -263,3 +259,6 @@ with col2:
     st.write(f"**Confidence:** {analysis['confidence']}")
 
 st.write(f"**Last Update:** {datetime.now().strftime('%H:%M:%S')}")
+
+with st.sidebar.expander("🩺 Source Health"):
+    st.dataframe(price_chain.status(), hide_index=True, use_container_width=True)
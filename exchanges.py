@@ -0,0 +1,296 @@
+"""
+Adapter multi-exchange dan agregasi lintas exchange.
+
+Setiap adapter mengambil ticker, funding dan open interest satu exchange lalu
+menormalkannya ke MarketSnapshot dengan symbol kanonik (BTCUSDT) dan satuan
+yang sama: funding dalam persen, volume dan open interest dalam coin dasar.
+ExchangeAggregator menjalankan semua adapter paralel, jadi latency satu
+refresh = adapter paling lambat, bukan jumlahnya.
+"""
+import warnings
+
+import numpy as np
+
+import http_client
+from fast_json import columns_from_records, index_columns, loads
+from fetch_engine import FetchEngine
+from instrumentation import instrument, timed
+from market_data import SUPPORTED_COINS, fetch_snapshot
+from market_snapshot import MarketSnapshot
+from swr_cache import get_swr_cache
+
+DEFAULT_TIMEOUT = 8
+
+
+def _align(symbols, rows_by_symbol, values):
+    """Susun kolom urutan exchange mengikuti urutan symbol kanonik; symbol yang tidak ada = degraded"""
+    rows = np.array([rows_by_symbol.get(symbol, -1) for symbol in symbols], dtype=np.intp)
+    found = rows >= 0
+    columns = {}
+    for field, column in values.items():
+        aligned = np.full(len(symbols), np.nan)
+        aligned[found] = column[rows[found]]
+        columns[field] = aligned
+    return MarketSnapshot(symbols, columns, ~found | np.isnan(columns['price']))
+
+
+def _get_json(url, params=None, timeout=DEFAULT_TIMEOUT):
+    response = http_client.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return loads(response.content)
+
+
+class ExchangeAdapter:
+    """Interface adapter: fetch(symbols kanonik) -> MarketSnapshot"""
+
+    name = None
+    max_workers = 0  # > 0 untuk adapter yang request per symbol
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        # Pool per adapter: request per symbol tidak antre di belakang exchange lain
+        # di engine bersama, jadi satu refresh tetap ~adapter paling lambat
+        self._engine = FetchEngine(max_workers=self.max_workers) if self.max_workers else None
+
+    def fetch(self, symbols):
+        raise NotImplementedError
+
+    def _run(self, tasks):
+        return self._engine.run(tasks, call_timeout=self.timeout, deadline=self.timeout)
+
+
+class BinanceAdapter(ExchangeAdapter):
+    name = 'Binance'
+
+    def fetch(self, symbols):
+        return fetch_snapshot(list(symbols))
+
+
+class BybitAdapter(ExchangeAdapter):
+    """Bybit v5 linear: satu request berisi harga, funding dan OI semua symbol"""
+
+    name = 'Bybit'
+    URL = "https://api.bybit.com/v5/market/tickers"
+    FIELDS = ('lastPrice', 'price24hPcnt', 'volume24h', 'highPrice24h', 'lowPrice24h', 'fundingRate', 'openInterest')
+
+    def fetch(self, symbols):
+        payload = _get_json(self.URL, {'category': 'linear'}, self.timeout)
+        if payload.get('retCode'):
+            raise RuntimeError(f"Bybit: {payload.get('retMsg')}")
+        columns = columns_from_records(payload['result']['list'], self.FIELDS)
+        return _align(symbols, index_columns(columns), {
+            'price': columns['lastPrice'],
+            'change_24h': columns['price24hPcnt'] * 100,
+            'volume': columns['volume24h'],
+            'high_24h': columns['highPrice24h'],
+            'low_24h': columns['lowPrice24h'],
+            'funding_rate': columns['fundingRate'] * 100,
+            'open_interest': columns['openInterest']
+        })
+
+
+class OKXAdapter(ExchangeAdapter):
+    """OKX perpetual swap: ticker dan OI bulk, funding per instrumen (paralel)"""
+
+    name = 'OKX'
+    max_workers = len(SUPPORTED_COINS) + 2
+    BASE_URL = "https://www.okx.com/api/v5"
+
+    @staticmethod
+    def inst_id(symbol):
+        return f"{symbol[:-4]}-USDT-SWAP" if symbol.endswith('USDT') else None
+
+    @staticmethod
+    def canonical(inst_id):
+        return inst_id.replace('-SWAP', '').replace('-', '')
+
+    def _data(self, path, params):
+        payload = _get_json(f"{self.BASE_URL}{path}", params, self.timeout)
+        if payload.get('code') not in ('0', 0):
+            raise RuntimeError(f"OKX: {payload.get('msg')}")
+        return payload['data']
+
+    def _funding_rate(self, inst_id):
+        data = self._data('/public/funding-rate', {'instId': inst_id})
+        return float(data[0]['fundingRate']) * 100 if data else np.nan
+
+    def fetch(self, symbols):
+        inst_ids = {symbol: self.inst_id(symbol) for symbol in symbols if self.inst_id(symbol)}
+        tasks = {
+            'tickers': lambda: self._data('/market/tickers', {'instType': 'SWAP'}),
+            'open_interest': lambda: self._data('/public/open-interest', {'instType': 'SWAP'})
+        }
+        for symbol, inst_id in inst_ids.items():
+            tasks[symbol] = (lambda i=inst_id: self._funding_rate(i))
+        results, status = self._run(tasks)
+        if 'tickers' not in results:
+            raise RuntimeError(f"OKX tickers: {status['tickers']['error']}")
+
+        tickers = columns_from_records(results['tickers'], ('last', 'open24h', 'high24h', 'low24h', 'volCcy24h'), 'instId')
+        rows = {self.canonical(inst_id): row for inst_id, row in index_columns(tickers, 'instId').items()}
+        snapshot = _align(symbols, rows, {
+            'price': tickers['last'],
+            'change_24h': (tickers['last'] / tickers['open24h'] - 1) * 100,
+            'volume': tickers['volCcy24h'],
+            'high_24h': tickers['high24h'],
+            'low_24h': tickers['low24h']
+        })
+
+        open_interest = {self.canonical(item['instId']): float(item['oiCcy']) for item in results.get('open_interest', [])}
+        snapshot.add_column('open_interest', [open_interest.get(symbol, np.nan) for symbol in symbols])
+        snapshot.add_column('funding_rate', [results.get(symbol, np.nan) for symbol in symbols])
+        return snapshot
+
+
+class CoinbaseAdapter(ExchangeAdapter):
+    """Coinbase Exchange spot (pasangan USD): harga saja, tanpa funding/OI"""
+
+    name = 'Coinbase'
+    max_workers = len(SUPPORTED_COINS)
+    URL = "https://api.exchange.coinbase.com/products/{product}/stats"
+
+    @staticmethod
+    def product_id(symbol):
+        return f"{symbol[:-4]}-USD" if symbol.endswith('USDT') else None
+
+    def _stats(self, product):
+        return _get_json(self.URL.format(product=product), timeout=self.timeout)
+
+    def fetch(self, symbols):
+        tasks = {symbol: (lambda p=self.product_id(symbol): self._stats(p))
+                 for symbol in symbols if self.product_id(symbol)}
+        results, _ = self._run(tasks)
+        if not results:
+            raise RuntimeError("Coinbase: semua product gagal")
+
+        available = [symbol for symbol in symbols if symbol in results]
+        records = [dict(results[symbol], symbol=symbol) for symbol in available]
+        columns = columns_from_records(records, ('last', 'open', 'high', 'low', 'volume'))
+        return _align(symbols, {symbol: row for row, symbol in enumerate(available)}, {
+            'price': columns['last'],
+            'change_24h': (columns['last'] / columns['open'] - 1) * 100,
+            'volume': columns['volume'],
+            'high_24h': columns['high'],
+            'low_24h': columns['low'],
+            'funding_rate': np.full(len(available), np.nan),
+            'open_interest': np.full(len(available), np.nan)
+        })
+
+
+def default_adapters():
+    return [BinanceAdapter(), BybitAdapter(), OKXAdapter(), CoinbaseAdapter()]
+
+
+class CrossExchangeView:
+    """Matriks (exchange x symbol) per field + ringkasan lintas exchange"""
+
+    FIELDS = ('price', 'change_24h', 'volume', 'funding_rate', 'open_interest')
+
+    def __init__(self, symbols, snapshots, status):
+        self.symbols = list(symbols)
+        self.index = {symbol: column for column, symbol in enumerate(self.symbols)}
+        self.exchanges = list(snapshots)
+        self.status = status
+        self.matrix = {}
+        for field in self.FIELDS:
+            rows = []
+            for snapshot in snapshots.values():
+                row = snapshot[field].copy()
+                row[snapshot.degraded] = np.nan
+                rows.append(row)
+            self.matrix[field] = np.vstack(rows) if rows else np.empty((0, len(self.symbols)))
+
+    def _reduce(self, fn, field):
+        # Kolom yang semuanya NaN (tidak ada exchange yang punya) tetap NaN tanpa warning
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return fn(self.matrix[field], axis=0)
+
+    def consensus_price(self):
+        """Median harga semua exchange per symbol"""
+        return self._reduce(np.nanmedian, 'price')
+
+    def price_dispersion(self):
+        """Selisih harga tertinggi-terendah antar exchange, persen dari median"""
+        return (self._reduce(np.nanmax, 'price') - self._reduce(np.nanmin, 'price')) / self.consensus_price() * 100
+
+    def mean_funding(self):
+        return self._reduce(np.nanmean, 'funding_rate')
+
+    def funding_spread(self):
+        """Selisih funding tertinggi-terendah (peluang arbitrase funding)"""
+        return self._reduce(np.nanmax, 'funding_rate') - self._reduce(np.nanmin, 'funding_rate')
+
+    def total_open_interest(self):
+        reported = ~np.isnan(self.matrix['open_interest'])
+        return np.where(reported.any(axis=0), np.nansum(self.matrix['open_interest'], axis=0), np.nan)
+
+    def for_symbol(self, symbol):
+        """Baris per exchange untuk satu symbol (tabel dashboard), termasuk exchange yang gagal"""
+        column = self.index[symbol]
+        rows = []
+        for position, exchange in enumerate(self.exchanges):
+            row = {'Exchange': exchange}
+            for field in self.FIELDS:
+                value = self.matrix[field][position, column]
+                row[field] = None if np.isnan(value) else float(value)
+            rows.append(row)
+        for exchange, state in self.status.items():
+            if exchange not in self.exchanges:
+                rows.append({'Exchange': exchange, **{field: None for field in self.FIELDS}, 'error': state['error']})
+        return rows
+
+    def summary(self, symbol):
+        column = self.index[symbol]
+        return {
+            'consensus_price': float(self.consensus_price()[column]),
+            'price_dispersion': float(self.price_dispersion()[column]),
+            'mean_funding': float(self.mean_funding()[column]),
+            'funding_spread': float(self.funding_spread()[column]),
+            'total_open_interest': float(self.total_open_interest()[column]),
+            'exchanges': int((~np.isnan(self.matrix['price'][:, column])).sum())
+        }
+
+
+class ExchangeAggregator:
+    """Jalankan semua adapter paralel dan gabungkan jadi CrossExchangeView"""
+
+    def __init__(self, adapters=None, call_timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_TIMEOUT + 2):
+        self.adapters = adapters or default_adapters()
+        self.call_timeout = call_timeout
+        self.deadline = deadline
+        # Pool sendiri untuk menjalankan adapter; request per symbol di dalam adapter memakai
+        # FetchEngine milik adapter itu (lihat ExchangeAdapter), jadi tidak saling menunggu slot
+        self._engine = FetchEngine(max_workers=len(self.adapters))
+
+    def _run_adapter(self, adapter, symbols):
+        with timed(f"exchange.{adapter.name}"):
+            return adapter.fetch(symbols)
+
+    @instrument("exchanges.aggregate")
+    def fetch(self, symbols=None):
+        symbols = list(symbols or SUPPORTED_COINS.values())
+        results, status = self._engine.run(
+            {adapter.name: (lambda a=adapter: self._run_adapter(a, symbols)) for adapter in self.adapters},
+            call_timeout=self.call_timeout, deadline=self.deadline
+        )
+        if not results:
+            raise RuntimeError("Semua exchange gagal")
+        snapshots = {adapter.name: results[adapter.name] for adapter in self.adapters if adapter.name in results}
+        return CrossExchangeView(symbols, snapshots, status)
+
+
+_aggregator = None
+
+
+def get_aggregator():
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = ExchangeAggregator()
+    return _aggregator
+
+
+def get_cross_exchange_view(symbols=None):
+    """CrossExchangeView stale-while-revalidate (None kalau belum pernah berhasil)"""
+    symbols = tuple(symbols or SUPPORTED_COINS.values())
+    return get_swr_cache().get(('cross_exchange', symbols), lambda: get_aggregator().fetch(symbols)).value
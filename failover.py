@@ -0,0 +1,191 @@
+"""
+Failover antar sumber data dengan health tracking, hedging dan circuit breaker.
+
+Sumber diurutkan berdasarkan kesehatan (latency dan error rate terakhir).
+Sumber pertama dipanggil; kalau belum selesai setelah hedge delay (persentil
+latency sumber itu) atau gagal, sumber berikutnya ikut dipanggil dan hasil
+pertama yang sukses dipakai. Sumber yang gagal berturut-turut di-circuit-break
+sementara. Fallback dianggap hedge terakhir: dipakai begitu hedge delay sumber
+terakhir lewat, jadi worst case = jumlah hedge delay, bukan jumlah timeout.
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from instrumentation import get_metrics
+
+HEDGE_PERCENTILE = 90
+MIN_HEDGE_DELAY = 0.15         # detik
+INITIAL_HEDGE_DELAY = 0.5      # detik, untuk sumber yang belum punya riwayat latency
+MAX_HEDGE_DELAY = 1.5          # detik
+DEFAULT_DEADLINE = float(os.environ.get("FAILOVER_DEADLINE", 2.5))
+FAILURE_THRESHOLD = 3          # gagal berturut-turut sebelum circuit terbuka
+COOLDOWN = 30                  # detik circuit terbuka sebelum dicoba lagi (half-open)
+WINDOW = 50                    # jumlah panggilan terakhir untuk latency/error rate
+
+
+class SourceHealth:
+    """Statistik kesehatan satu sumber + state circuit breaker"""
+
+    def __init__(self, window=WINDOW):
+        self.latencies = deque(maxlen=window)   # latency panggilan sukses (detik)
+        self.outcomes = deque(maxlen=window)    # True = sukses
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    def record(self, elapsed, error=None):
+        with self._lock:
+            self.outcomes.append(error is None)
+            if error is None:
+                self.latencies.append(elapsed)
+                self.consecutive_failures = 0
+                self.open_until = 0.0
+            else:
+                self.consecutive_failures += 1
+                self.last_error = error
+                if self.probing or self.consecutive_failures >= FAILURE_THRESHOLD:
+                    self.open_until = time.monotonic() + COOLDOWN
+            self.probing = False
+
+    @property
+    def error_rate(self):
+        return 1 - sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, q, default):
+        return float(np.percentile(self.latencies, q)) if self.latencies else default
+
+    def state(self):
+        if not self.open_until:
+            return 'closed'
+        return 'open' if time.monotonic() < self.open_until else 'half-open'
+
+    def try_acquire(self):
+        """Boleh dipanggil? Saat half-open hanya satu panggilan percobaan"""
+        with self._lock:
+            state = self.state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def cost(self, default_latency):
+        """Perkiraan biaya untuk urutan: latency median dibagi peluang sukses"""
+        return self.percentile(50, default_latency) / max(1 - self.error_rate, 0.05)
+
+
+class FailoverChain:
+    """Panggil beberapa sumber setara dengan hedging; sumber = dict {nama: callable}"""
+
+    def __init__(self, name, sources, hedge_percentile=HEDGE_PERCENTILE, min_hedge=MIN_HEDGE_DELAY,
+                 max_hedge=MAX_HEDGE_DELAY, deadline=DEFAULT_DEADLINE):
+        self.name = name
+        self.sources = dict(sources)
+        self.health = {source: SourceHealth() for source in self.sources}
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge = min_hedge
+        self.max_hedge = max_hedge
+        self.deadline = deadline
+        # Panggilan yang kalah hedge tetap jalan sampai selesai (dan tetap dicatat)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sources) * 2, thread_name_prefix=f"failover-{name}")
+
+    def hedge_delay(self, source):
+        """Tunggu selama persentil latency sumber ini sebelum menembak sumber berikutnya"""
+        delay = self.health[source].percentile(self.hedge_percentile, INITIAL_HEDGE_DELAY)
+        return min(max(delay, self.min_hedge), self.max_hedge)
+
+    def ordered(self):
+        """Sumber dari yang paling sehat; circuit terbuka di paling belakang"""
+        return sorted(self.sources, key=lambda source: (self.health[source].state() == 'open',
+                                                        self.health[source].cost(INITIAL_HEDGE_DELAY)))
+
+    def _call(self, source, args):
+        started = time.perf_counter()
+        try:
+            result = self.sources[source](*args)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            self.health[source].record(elapsed, error=str(e) or type(e).__name__)
+            get_metrics().record(f"failover.{self.name}.{source}", elapsed, error=True)
+            raise
+        elapsed = time.perf_counter() - started
+        self.health[source].record(elapsed)
+        get_metrics().record(f"failover.{self.name}.{source}", elapsed)
+        return result
+
+    def call(self, *args, fallback=None):
+        """
+        Return (hasil, nama sumber). Kalau semua sumber gagal, circuit terbuka
+        atau hedge delay sumber terakhir lewat: (fallback(*args), 'fallback').
+        Tanpa fallback, tunggu sampai deadline lalu raise.
+        """
+        started = time.monotonic()
+        # Circuit terbuka dilewati; slot percobaan half-open baru diambil saat sumber benar-benar ditembak
+        queue = [source for source in self.ordered() if self.health[source].state() != 'open']
+        running = {}
+        next_launch = started
+        errors = []
+
+        while queue or running:
+            now = time.monotonic()
+            if now >= started + self.deadline:
+                break
+            if not queue and fallback is not None and now >= next_launch:
+                break
+            # Tembak sumber berikutnya kalau hedge delay lewat atau tidak ada yang sedang jalan
+            if queue and (now >= next_launch or not running):
+                source = queue.pop(0)
+                if not self.health[source].try_acquire():
+                    continue
+                running[self._executor.submit(self._call, source, args)] = source
+                next_launch = now + self.hedge_delay(source)
+                continue
+
+            wake = started + self.deadline
+            if queue or fallback is not None:
+                wake = min(wake, next_launch)
+            done, _ = wait(list(running), timeout=max(0, wake - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                source = running.pop(future)
+                if future.exception() is None:
+                    return future.result(), source
+                errors.append(f"{source}: {future.exception()}")
+
+        if fallback is None:
+            raise RuntimeError(f"Semua sumber {self.name} gagal: {'; '.join(errors) or 'deadline'}")
+        return fallback(*args), 'fallback'
+
+    def status(self):
+        """Kesehatan per sumber untuk panel dashboard, urut sesuai prioritas sekarang"""
+        return [
+            {
+                'Source': source,
+                'State': self.health[source].state(),
+                'p50 ms': round(self.health[source].percentile(50, 0) * 1000, 1),
+                'Hedge ms': round(self.hedge_delay(source) * 1000),
+                'Error rate': f"{self.health[source].error_rate:.0%}",
+                'Last error': self.health[source].last_error
+            }
+            for source in self.ordered()
+        ]
+
+
+_chains = {}
+_chains_lock = threading.Lock()
+
+
+def get_failover_chain(name, sources, **options):
+    """Chain per nama, satu per proses supaya health tetap ada antar rerun Streamlit"""
+    with _chains_lock:
+        chain = _chains.get(name)
+        if chain is None:
+            chain = _chains[name] = FailoverChain(name, sources, **options)
+        return chain
@@ -0,0 +1,110 @@
+"""
+Decode JSON cepat untuk payload exchange yang besar.
+
+Binance mengirim angka sebagai string di array of objects (premiumIndex ~400
+record, ticker 24hr). Daripada response.json() -> list of dict -> float() per
+field, decode_columns hanya mengambil field yang dibutuhkan dan langsung
+menjadi kolom NumPy float64.
+
+Backend dipilih otomatis: msgspec (typed decode, field lain dilewati tanpa
+dibuat objeknya) > orjson > json stdlib. msgspec ada di requirements.txt:
+hanya backend itu yang lebih cepat dari response.json() + float() per field,
+orjson / json stdlib di sini sekadar fallback supaya tetap jalan.
+"""
+import json
+from operator import attrgetter
+
+import numpy as np
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKENDS = tuple(name for name, module in (('msgspec', msgspec), ('orjson', orjson), ('json', json)) if module)
+DEFAULT_BACKEND = BACKENDS[0]
+
+_decoders = {}
+
+
+def loads(raw):
+    """json.loads dengan backend tercepat yang tersedia"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    return json.loads(raw)
+
+
+def _msgspec_decoder(fields, key, lenient=False):
+    cache_key = (fields, key, lenient)
+    decoder = _decoders.get(cache_key)
+    if decoder is None:
+        # strict=False: string angka ("0.00010000") langsung di-decode jadi float.
+        # lenient: field boleh string apa saja ("" untuk kontrak delivery/settling), dikonversi di _msgspec_columns
+        field_type = float | str if lenient else float
+        record = msgspec.defstruct('Record', [(key, str)] + [(field, field_type, float('nan')) for field in fields])
+        decoder = (msgspec.json.Decoder(list[record] | record, strict=False), record)
+        _decoders[cache_key] = decoder
+    return decoder
+
+
+def _msgspec_columns(raw, fields, key, lenient=False):
+    decoder, record_type = _msgspec_decoder(fields, key, lenient)
+    records = decoder.decode(raw)
+    if isinstance(records, record_type):
+        records = [records]
+    columns = {key: np.array(list(map(attrgetter(key), records)))}
+    for field in fields:
+        if lenient:
+            values = [_number(value) for value in map(attrgetter(field), records)]
+            columns[field] = np.array(values, dtype=np.float64).reshape(len(records))
+        else:
+            columns[field] = np.fromiter(map(attrgetter(field), records), dtype=np.float64, count=len(records))
+    return columns
+
+
+def _number(value):
+    # Field kosong ("" di Bybit/OKX) atau tidak ada -> NaN
+    return 'nan' if value is None or value == '' else value
+
+
+def columns_from_records(records, fields, key='symbol'):
+    """List of dict yang sudah di-decode -> dict kolom (dipakai untuk payload ber-envelope)"""
+    count = len(records)
+    columns = {key: np.array([record[key] for record in records])}
+    for field in fields:
+        # NumPy mem-parse list string angka sekaligus, lebih murah dari float() per item
+        columns[field] = np.array([_number(record.get(field)) for record in records], dtype=np.float64).reshape(count)
+    return columns
+
+
+def decode_columns(raw, fields, key='symbol', backend=None):
+    """
+    Decode array of objects (atau satu object) jadi dict kolom:
+    {key: array str, field: array float64}. Field yang tidak ada diisi NaN.
+    """
+    backend = backend or DEFAULT_BACKEND
+    fields = tuple(fields)
+
+    if backend == 'msgspec':
+        try:
+            return _msgspec_columns(raw, fields, key)
+        except msgspec.ValidationError:
+            # Ada field non-angka (mis. lastFundingRate ""): decode ulang sebagai float | str, "" -> NaN
+            return _msgspec_columns(raw, fields, key, lenient=True)
+
+    data = orjson.loads(raw) if backend == 'orjson' else json.loads(raw)
+    if isinstance(data, dict):
+        data = [data]
+    return columns_from_records(data, fields, key)
+
+
+def index_columns(columns, key='symbol'):
+    """Index baris per key: {symbol: posisi}"""
+    return {symbol: row for row, symbol in enumerate(columns[key].tolist())}
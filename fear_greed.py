@@ -0,0 +1,201 @@
+"""
+Provider Fear & Greed Index (alternative.me) untuk satu proses.
+
+Index hanya berubah sekali sehari dan API mengirim `time_until_update`, jadi
+nilai disimpan sampai jadwal update berikutnya; render dashboard tidak lagi
+menunggu request ke alternative.me. Setelah jadwal lewat, request dikirim
+bersyarat (If-None-Match / If-Modified-Since) di background dan diulang tiap
+RECHECK_INTERVAL sampai nilai baru terbit.
+
+Nilai harian disimpan di TimeSeriesStore (symbol FEAR_GREED_DAILY); sekali
+per store riwayat lengkap di-backfill lewat `?limit=0`.
+"""
+import threading
+import time
+from datetime import datetime
+
+import http_client
+from fast_json import loads
+from instrumentation import get_metrics, instrument
+from timeseries_store import FEAR_GREED_DAILY_SYMBOL, get_store
+
+FNG_URL = "https://api.alternative.me/fng/"
+RECHECK_INTERVAL = 300     # detik antar cek setelah jadwal update lewat / request gagal
+MIN_WAIT = 60              # detik minimal sampai cek berikutnya walau time_until_update kecil
+ERROR_RETRY = 30           # detik sebelum mencoba lagi kalau belum pernah ada nilai
+MAX_INDEX_AGE = 2 * 86400  # index lebih tua dari ini dianggap degraded
+BACKFILL_MIN_DAYS = 2      # store dengan riwayat lebih sedikit dari ini di-backfill
+
+FALLBACK = {'value': 50, 'classification': 'Neutral'}
+
+
+def _entry(item):
+    return {
+        'value': int(item['value']),
+        'classification': item['value_classification'],
+        'timestamp': datetime.fromtimestamp(int(item['timestamp']))
+    }
+
+
+class FearGreedProvider:
+    """Nilai Fear & Greed terakhir, di-refresh mengikuti jadwal update API"""
+
+    def __init__(self, url=FNG_URL, timeout=10, store=None):
+        self.url = url
+        self.timeout = timeout
+        self._store = store
+        self.hits = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.last_error = None
+        self._current = None
+        self._fetched_at = 0.0   # time.time() upstream terakhir mengonfirmasi nilai
+        self._next_check = 0.0   # time.time() paling awal untuk request berikutnya
+        self._validators = {}
+        self._refreshing = False
+        self._backfilled = False
+        self._lock = threading.Lock()
+        self._first_lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_store()
+        return self._store
+
+    @instrument("fetch.fear_greed")
+    def _request(self, params=None, conditional=False):
+        headers = {}
+        if conditional and self._validators.get('etag'):
+            headers['If-None-Match'] = self._validators['etag']
+        if conditional and self._validators.get('last_modified'):
+            headers['If-Modified-Since'] = self._validators['last_modified']
+        self.requests += 1
+        if headers:
+            return http_client.get(self.url, params=params, timeout=self.timeout, headers=headers)
+        return http_client.get(self.url, params=params, timeout=self.timeout)
+
+    def _refresh(self):
+        """Satu request (bersyarat kalau sudah punya nilai), jadwalkan cek berikutnya"""
+        try:
+            response = self._request(conditional=self._current is not None)
+            now = time.time()
+            if response.status_code == 304:
+                self.not_modified += 1
+                self._fetched_at = now
+                self._next_check = now + RECHECK_INTERVAL
+                return
+            response.raise_for_status()
+            item = loads(response.content)['data'][0]
+            entry = _entry(item)
+            until = int(item.get('time_until_update') or 0)
+            is_new = self._current is None or entry['timestamp'] != self._current['timestamp']
+            with self._lock:
+                self._current = entry
+                self._fetched_at = now
+                # Index lama masih dikirim setelah jadwal lewat: cek lagi tiap RECHECK_INTERVAL
+                self._next_check = now + (max(until, MIN_WAIT) if until > 0 else RECHECK_INTERVAL)
+                self._validators = {'etag': response.headers.get('ETag'),
+                                    'last_modified': response.headers.get('Last-Modified')}
+            self.last_error = None
+            if is_new:
+                self.store.record_fear_greed_daily([(int(item['timestamp']), entry['value'])])
+        except Exception as e:
+            self.last_error = str(e)
+            self._next_check = time.time() + (RECHECK_INTERVAL if self._current else ERROR_RETRY)
+            if self._current is None:
+                raise
+        finally:
+            self._refreshing = False
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_quietly, name="fear-greed-refresh", daemon=True).start()
+
+    def _refresh_quietly(self):
+        try:
+            self._refresh()
+        except Exception:
+            pass
+
+    def get(self):
+        """
+        Dict value/classification/timestamp + data_age/stale/degraded (format serve()).
+        Hanya request pertama proses yang menunggu upstream.
+        """
+        now = time.time()
+        hit = self._current is not None and now < self._next_check
+        if self._current is None and now >= self._next_check:
+            # Belum ada nilai: satu thread request, session lain menunggu hasil yang sama
+            with self._first_lock:
+                if self._current is None and time.time() >= self._next_check:
+                    try:
+                        self._refresh()
+                    except Exception:
+                        pass
+                    self._start_backfill()
+        elif not hit:
+            self._refresh_in_background()
+        else:
+            self.hits += 1
+        get_metrics().record_cache("fear_greed", hit)
+
+        current = self._current
+        if current is None:
+            return dict(FALLBACK, timestamp=datetime.now(), data_age=None, stale=True, degraded=True)
+        age = time.time() - self._fetched_at
+        return dict(current, data_age=age, stale=time.time() >= self._next_check,
+                    degraded=time.time() - current['timestamp'].timestamp() > MAX_INDEX_AGE)
+
+    # -- riwayat -------------------------------------------------------------
+
+    def _start_backfill(self):
+        if not self._backfilled:
+            self._backfilled = True
+            threading.Thread(target=self.backfill, name="fear-greed-backfill", daemon=True).start()
+
+    def backfill(self, force=False):
+        """Isi riwayat harian lengkap (?limit=0) kalau store belum punya; return jumlah hari yang ditulis"""
+        try:
+            if not force and len(self.history()['ts']) >= BACKFILL_MIN_DAYS:
+                return 0
+            response = self._request(params={'limit': 0})
+            response.raise_for_status()
+            points = [(int(item['timestamp']), int(item['value'])) for item in loads(response.content)['data']]
+            self.store.record_fear_greed_daily(points)
+            return len(points)
+        except Exception as e:
+            self.last_error = str(e)
+            return 0
+
+    def history(self, start=None, end=None):
+        """Riwayat harian {'ts': array, 'fear_greed': array} dari store"""
+        return self.store.query_range(FEAR_GREED_DAILY_SYMBOL, start, end, fields=('fear_greed',))
+
+    def invalidate(self):
+        with self._lock:
+            self._current = None
+            self._fetched_at = 0.0
+            self._next_check = 0.0
+            self._validators = {}
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'requests': self.requests,
+            'not_modified': self.not_modified,
+            'next_check_in': max(0.0, self._next_check - time.time()),
+            'value': self._current['value'] if self._current else None,
+            'last_error': self.last_error
+        }
+
+
+# Satu instance per proses, dipakai bersama oleh semua dashboard dan semua session
+_provider = FearGreedProvider()
+
+
+def get_fear_greed_provider():
+    return _provider
@@ -0,0 +1,87 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_CALL_TIMEOUT = 10  # detik per request
+DEFAULT_DEADLINE = 12      # detik untuk satu refresh penuh
+
+
+class FetchEngine:
+    """Jalankan semua HTTP call satu refresh secara paralel"""
+
+    def __init__(self, max_workers=8):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def run(self, tasks, call_timeout=DEFAULT_CALL_TIMEOUT, deadline=DEFAULT_DEADLINE):
+        """
+        Jalankan dict {nama: callable} secara paralel.
+
+        Return (results, status): results hanya berisi task yang sukses,
+        status berisi {'status': 'ok'|'error'|'timeout', 'elapsed': detik, 'error': str}
+        untuk setiap task. Task yang lewat call_timeout atau deadline ditinggal.
+        """
+        started = time.monotonic()
+        global_deadline = started + deadline
+        pending = {}
+        start_times = {}
+
+        def _timed(name, fn):
+            start_times[name] = time.monotonic()
+            return fn()
+
+        for name, fn in tasks.items():
+            pending[self.executor.submit(_timed, name, fn)] = name
+
+        results = {}
+        status = {}
+
+        while pending:
+            now = time.monotonic()
+            if now >= global_deadline:
+                break
+
+            # Bangun lagi paling lambat saat deadline per-call terdekat habis
+            next_wake = global_deadline
+            for future, name in pending.items():
+                if name in start_times:
+                    next_wake = min(next_wake, start_times[name] + call_timeout)
+
+            done, _ = wait(list(pending), timeout=max(0, next_wake - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = pending.pop(future)
+                elapsed = time.monotonic() - start_times.get(name, started)
+                try:
+                    results[name] = future.result()
+                    status[name] = {'status': 'ok', 'elapsed': elapsed, 'error': None}
+                except Exception as e:
+                    status[name] = {'status': 'error', 'elapsed': elapsed, 'error': str(e)}
+
+            # Tinggalkan call yang sudah melewati deadline per-call
+            now = time.monotonic()
+            for future, name in list(pending.items()):
+                if name in start_times and now - start_times[name] >= call_timeout:
+                    pending.pop(future)
+                    future.cancel()
+                    status[name] = {'status': 'timeout', 'elapsed': now - start_times[name],
+                                    'error': f"call timeout ({call_timeout}s)"}
+
+        for future, name in pending.items():
+            future.cancel()
+            status[name] = {'status': 'timeout', 'elapsed': time.monotonic() - start_times.get(name, started),
+                            'error': f"deadline ({deadline}s)"}
+
+        return results, status
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+# Engine bersama untuk semua fetcher dalam satu proses
+_engine = None
+
+
+def get_fetch_engine():
+    global _engine
+    if _engine is None:
+        _engine = FetchEngine()
+    return _engine
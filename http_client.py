@@ -0,0 +1,145 @@
+"""
+HTTP client bersama untuk semua fetcher.
+
+Satu session dengan connection pool per host dan keep-alive, supaya request
+ke fapi.binance.com dan api.alternative.me tidak membayar TCP+TLS handshake
+setiap kali. HTTP/2 opsional lewat httpx (HTTP2=1, butuh `pip install httpx[http2]`).
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import get_metrics
+from rate_limiter import get_rate_limiter
+from single_flight import SingleFlight, request_key
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 10))  # jumlah host yang di-cache
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 32))          # koneksi keep-alive per host
+USE_HTTP2 = os.environ.get("HTTP2", "0") == "1"
+
+DEFAULT_TIMEOUT = 10
+USER_AGENT = "Multi-Coin-Trading-Dashboard"
+
+
+def _create_session():
+    session = requests.Session()
+    # pool_block=False: kalau pool penuh buat koneksi tambahan daripada menunggu
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                          max_retries=0, pool_block=False)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'Connection': 'keep-alive'})
+    return session
+
+
+_session = None
+_http2_client = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """Session requests bersama untuk satu proses"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def _get_http2_client():
+    global _http2_client
+    if _http2_client is None:
+        with _lock:
+            if _http2_client is None:
+                limits = httpx.Limits(max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                                      max_keepalive_connections=POOL_MAXSIZE)
+                _http2_client = httpx.Client(http2=True, limits=limits, headers={'User-Agent': USER_AGENT})
+    return _http2_client
+
+
+_flight = SingleFlight()
+
+
+def get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET lewat connection pool bersama; GET identik yang sedang berjalan digabung jadi satu"""
+    if kwargs:
+        return _get(url, params, timeout, **kwargs)
+    return _flight.do(request_key(url, params), lambda: _get(url, params, timeout))
+
+
+def coalescing_stats():
+    """Statistik single-flight: request yang benar-benar dikirim vs yang ikut menunggu"""
+    return _flight.stats()
+
+
+def _get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET lewat connection pool bersama, dibatasi budget weight Binance"""
+    limiter = get_rate_limiter()
+    limiter.acquire(url, params)
+    metrics = get_metrics()
+    started = time.perf_counter()
+    try:
+        if USE_HTTP2 and httpx is not None:
+            response = _get_http2_client().get(url, params=params, timeout=timeout, **kwargs)
+        else:
+            response = get_session().get(url, params=params, timeout=timeout, **kwargs)
+    except Exception:
+        if metrics.enabled:
+            metrics.record(_stage_name(url), time.perf_counter() - started, error=True)
+        raise
+    if metrics.enabled:
+        # Tahap per endpoint, jadi ticker / premiumIndex / OI / F&G terlihat terpisah
+        nbytes = 0 if kwargs.get('stream') else len(response.content)
+        metrics.record(_stage_name(url), time.perf_counter() - started,
+                       error=response.status_code >= 400, nbytes=nbytes)
+    limiter.observe(url, response)
+    return response
+
+
+def _stage_name(url):
+    parts = urlsplit(url)
+    return f"http {parts.netloc}{parts.path}"
+
+
+def get_json(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET lalu decode JSON"""
+    return get(url, params=params, timeout=timeout, **kwargs).json()
+
+
+def connection_stats():
+    """Statistik koneksi per host: request, koneksi baru dan koneksi yang dipakai ulang"""
+    stats = {}
+    if _session is None:
+        return stats
+    for adapter in set(_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_scheme}://{key.key_host}"
+            entry = stats.setdefault(host, {'requests': 0, 'new_connections': 0, 'reused': 0})
+            entry['requests'] += pool.num_requests
+            entry['new_connections'] += pool.num_connections
+            entry['reused'] += max(pool.num_requests - pool.num_connections, 0)
+    return stats
+
+
+def connection_totals():
+    """Total semua host: request, koneksi baru, reused dan reuse rate"""
+    totals = {'requests': 0, 'new_connections': 0, 'reused': 0}
+    for entry in connection_stats().values():
+        for key in totals:
+            totals[key] += entry[key]
+    totals['reuse_rate'] = totals['reused'] / totals['requests'] if totals['requests'] else 0
+    return totals
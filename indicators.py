@@ -0,0 +1,337 @@
+import threading
+
+import numpy as np
+
+import http_client
+from fetch_engine import get_fetch_engine
+from instrumentation import instrument
+from swr_cache import get_swr_cache
+
+KLINES_URL = "https://fapi.binance.com/fapi/v1/klines"
+
+RSI_PERIOD = 14
+EMA_PERIOD = 20
+ATR_PERIOD = 14
+BB_PERIOD = 20
+BB_STD = 2
+
+RSI_HISTORY = 200       # bar untuk seed
+RSI_TAIL = 5            # bar yang diambil per refresh setelah seed
+RSI_FRESH_TTL = 60      # detik, RSI 1h tidak perlu di-refresh lebih sering
+
+
+@instrument("fetch.klines")
+def fetch_klines(symbol, interval='1h', limit=500, timeout=10):
+    """Ambil klines Binance Futures, return dict kolom numpy (open_time, open, high, low, close, volume)"""
+    response = http_client.get(KLINES_URL, params={'symbol': symbol, 'interval': interval, 'limit': limit}, timeout=timeout)
+    rows = response.json()
+    table = np.array([row[:6] for row in rows], dtype=np.float64).reshape(len(rows), 6)
+    return {
+        'open_time': table[:, 0],
+        'open': table[:, 1],
+        'high': table[:, 2],
+        'low': table[:, 3],
+        'close': table[:, 4],
+        'volume': table[:, 5]
+    }
+
+
+def fetch_klines_batch(symbols, interval='1h', limit=500):
+    """Ambil klines banyak symbol paralel, symbol yang gagal tidak ikut di hasil"""
+    results, _ = get_fetch_engine().run(
+        {symbol: (lambda s=symbol: fetch_klines(s, interval, limit)) for symbol in symbols}
+    )
+    return results
+
+
+def stack_klines(klines_by_symbol, symbols):
+    """Susun klines beberapa symbol jadi array 2D (symbol x bar), dipotong ke panjang terpendek"""
+    length = min(len(klines_by_symbol[symbol]['close']) for symbol in symbols)
+    return {
+        field: np.vstack([klines_by_symbol[symbol][field][-length:] for symbol in symbols])
+        for field in ('high', 'low', 'close')
+    }
+
+
+# Semua fungsi batch menerima array 1D (satu symbol) atau 2D (symbol x bar).
+# Loop berjalan di sumbu bar, setiap langkah diproses untuk semua symbol sekaligus.
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.newaxis, :] if values.ndim == 1 else values, values.ndim == 1
+
+
+def _restore(result, was_1d):
+    return result[0] if was_1d else result
+
+
+def ema(close, period=EMA_PERIOD):
+    """EMA, di-seed dengan SMA dari `period` bar pertama"""
+    close, was_1d = _as_2d(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[1] < period:
+        return _restore(out, was_1d)
+    alpha = 2.0 / (period + 1)
+    value = close[:, :period].mean(axis=1)
+    out[:, period - 1] = value
+    for i in range(period, close.shape[1]):
+        value = value + alpha * (close[:, i] - value)
+        out[:, i] = value
+    return _restore(out, was_1d)
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        rsi = 100.0 - 100.0 / (1.0 + rs)
+    # Tidak ada loss sama sekali -> RSI 100
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+
+def rsi(close, period=RSI_PERIOD):
+    """RSI Wilder"""
+    close, was_1d = _as_2d(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[1] <= period:
+        return _restore(out, was_1d)
+    delta = np.diff(close, axis=1)
+    gain = np.clip(delta, 0, None)
+    loss = np.clip(-delta, 0, None)
+    avg_gain = gain[:, :period].mean(axis=1)
+    avg_loss = loss[:, :period].mean(axis=1)
+    out[:, period] = _rsi_from_averages(avg_gain, avg_loss)
+    for i in range(period, delta.shape[1]):
+        avg_gain = (avg_gain * (period - 1) + gain[:, i]) / period
+        avg_loss = (avg_loss * (period - 1) + loss[:, i]) / period
+        out[:, i + 1] = _rsi_from_averages(avg_gain, avg_loss)
+    return _restore(out, was_1d)
+
+
+def true_range(high, low, close):
+    """True range, bar pertama memakai high - low"""
+    high, was_1d = _as_2d(high)
+    low, _ = _as_2d(low)
+    close, _ = _as_2d(close)
+    prev_close = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[:, 0] = high[:, 0] - low[:, 0]
+    return _restore(tr, was_1d)
+
+
+def atr(high, low, close, period=ATR_PERIOD):
+    """ATR Wilder, di-seed dengan rata-rata true range bar 1..period"""
+    tr, was_1d = _as_2d(true_range(high, low, close))
+    out = np.full(tr.shape, np.nan)
+    if tr.shape[1] <= period:
+        return _restore(out, was_1d)
+    value = tr[:, 1:period + 1].mean(axis=1)
+    out[:, period] = value
+    for i in range(period + 1, tr.shape[1]):
+        value = (value * (period - 1) + tr[:, i]) / period
+        out[:, i] = value
+    return _restore(out, was_1d)
+
+
+def bollinger(close, period=BB_PERIOD, num_std=BB_STD):
+    """Bollinger bands (middle, upper, lower) dengan std populasi"""
+    close, was_1d = _as_2d(close)
+    middle = np.full(close.shape, np.nan)
+    std = np.full(close.shape, np.nan)
+    if close.shape[1] >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(close, period, axis=1)
+        middle[:, period - 1:] = windows.mean(axis=2)
+        std[:, period - 1:] = windows.std(axis=2)
+    upper = middle + num_std * std
+    lower = middle - num_std * std
+    return _restore(middle, was_1d), _restore(upper, was_1d), _restore(lower, was_1d)
+
+
+def compute_all(high, low, close):
+    """Hitung semua indikator sekaligus"""
+    middle, upper, lower = bollinger(close)
+    return {
+        'rsi': rsi(close),
+        'ema': ema(close),
+        'atr': atr(high, low, close),
+        'bb_middle': middle,
+        'bb_upper': upper,
+        'bb_lower': lower
+    }
+
+
+class IncrementalIndicators:
+    """
+    State indikator untuk N symbol yang di-update O(1) per bar baru.
+
+    seed() sekali dengan history (symbol x bar), lalu update() dengan satu bar
+    per symbol. Nilainya sama dengan compute_all() atas history lengkap.
+    """
+
+    def __init__(self, rsi_period=RSI_PERIOD, ema_period=EMA_PERIOD, atr_period=ATR_PERIOD,
+                 bb_period=BB_PERIOD, bb_std=BB_STD):
+        self.rsi_period = rsi_period
+        self.ema_period = ema_period
+        self.atr_period = atr_period
+        self.bb_period = bb_period
+        self.bb_std = bb_std
+        self.latest = {}
+
+    def seed(self, high, low, close):
+        high, _ = _as_2d(high)
+        low, _ = _as_2d(low)
+        close, _ = _as_2d(close)
+        n = self.rsi_period
+        if close.shape[1] <= max(self.rsi_period, self.ema_period, self.atr_period, self.bb_period - 1):
+            raise ValueError("History terlalu pendek untuk seed indikator")
+
+        # EMA
+        self.ema_value = ema(close, self.ema_period)[:, -1]
+
+        # RSI: ulang recurrence Wilder untuk menyimpan avg gain / loss terakhir
+        delta = np.diff(close, axis=1)
+        gain = np.clip(delta, 0, None)
+        loss = np.clip(-delta, 0, None)
+        self.avg_gain = gain[:, :n].mean(axis=1)
+        self.avg_loss = loss[:, :n].mean(axis=1)
+        for i in range(n, delta.shape[1]):
+            self.avg_gain = (self.avg_gain * (n - 1) + gain[:, i]) / n
+            self.avg_loss = (self.avg_loss * (n - 1) + loss[:, i]) / n
+
+        # ATR
+        self.atr_value = atr(high, low, close, self.atr_period)[:, -1]
+
+        # Bollinger: ring buffer close terakhir
+        self.window = close[:, -self.bb_period:].copy()
+        self.window_pos = 0
+        self.prev_close = close[:, -1].copy()
+
+        self._refresh_latest()
+
+    def update(self, high, low, close):
+        """Tambah satu bar baru per symbol (array 1D panjang N)"""
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+
+        self.ema_value = self.ema_value + 2.0 / (self.ema_period + 1) * (close - self.ema_value)
+
+        delta = close - self.prev_close
+        n = self.rsi_period
+        self.avg_gain = (self.avg_gain * (n - 1) + np.clip(delta, 0, None)) / n
+        self.avg_loss = (self.avg_loss * (n - 1) + np.clip(-delta, 0, None)) / n
+
+        tr = np.maximum(high - low, np.maximum(np.abs(high - self.prev_close), np.abs(low - self.prev_close)))
+        self.atr_value = (self.atr_value * (self.atr_period - 1) + tr) / self.atr_period
+
+        # Urutan isi window tidak berpengaruh ke mean/std
+        self.window[:, self.window_pos] = close
+        self.window_pos = (self.window_pos + 1) % self.bb_period
+        self.prev_close = close
+
+        self._refresh_latest()
+        return self.latest
+
+    def rsi_preview(self, close):
+        """RSI kalau bar berjalan ditutup di `close`, tanpa mengubah state"""
+        delta = np.asarray(close, dtype=np.float64) - self.prev_close
+        n = self.rsi_period
+        avg_gain = (self.avg_gain * (n - 1) + np.clip(delta, 0, None)) / n
+        avg_loss = (self.avg_loss * (n - 1) + np.clip(-delta, 0, None)) / n
+        return _rsi_from_averages(avg_gain, avg_loss)
+
+    def _refresh_latest(self):
+        middle = self.window.mean(axis=1)
+        std = self.window.std(axis=1)
+        self.latest = {
+            'rsi': _rsi_from_averages(self.avg_gain, self.avg_loss),
+            'ema': self.ema_value,
+            'atr': self.atr_value,
+            'bb_middle': middle,
+            'bb_upper': middle + self.bb_std * std,
+            'bb_lower': middle - self.bb_std * std
+        }
+
+
+class RSIFeed:
+    """
+    RSI terakhir per symbol untuk satu interval.
+
+    Symbol baru di-seed sekali dari RSI_HISTORY bar; refresh berikutnya hanya
+    mengambil RSI_TAIL bar terakhir dan meng-update state O(1) per bar yang
+    baru tertutup. Bar yang masih berjalan ikut dihitung lewat rsi_preview().
+    """
+
+    def __init__(self, interval='1h', history=RSI_HISTORY, tail=RSI_TAIL):
+        self.interval = interval
+        self.history = history
+        self.tail = tail
+        self.states = {}    # symbol -> (IncrementalIndicators, open_time bar tertutup terakhir)
+        self.latest = {}
+        self._lock = threading.Lock()
+
+    def _seed(self, symbol, klines):
+        closed = len(klines['close']) - 1
+        state = IncrementalIndicators()
+        try:
+            state.seed(klines['high'][:closed], klines['low'][:closed], klines['close'][:closed])
+        except ValueError:
+            # Symbol baru listing, history belum cukup
+            self.states.pop(symbol, None)
+            return None
+        self.states[symbol] = (state, klines['open_time'][closed - 1])
+        return state
+
+    def _advance(self, symbol, klines):
+        """Update state dengan bar yang baru tertutup; None kalau ada bar yang terlewat (perlu seed ulang)"""
+        state, last_closed = self.states[symbol]
+        open_time = klines['open_time']
+        if len(open_time) < 2 or open_time[0] > last_closed + (open_time[1] - open_time[0]):
+            return None
+        for i in range(len(open_time) - 1):
+            if open_time[i] > last_closed:
+                state.update(klines['high'][i:i + 1], klines['low'][i:i + 1], klines['close'][i:i + 1])
+                last_closed = open_time[i]
+        self.states[symbol] = (state, last_closed)
+        return state
+
+    def refresh(self, symbols):
+        """Ambil bar baru dari Binance dan return dict {symbol: rsi} (symbol gagal tidak ikut)"""
+        with self._lock:
+            seeded = [symbol for symbol in symbols if symbol in self.states]
+            current = {}
+            for symbol, klines in (fetch_klines_batch(seeded, self.interval, self.tail) if seeded else {}).items():
+                if self._advance(symbol, klines) is not None:
+                    current[symbol] = klines
+            # Symbol baru, tail gagal diambil atau ada bar terlewat: seed dari history
+            missing = [symbol for symbol in symbols if symbol not in current]
+            for symbol, klines in (fetch_klines_batch(missing, self.interval, self.history) if missing else {}).items():
+                if self._seed(symbol, klines) is not None:
+                    current[symbol] = klines
+            for symbol, klines in current.items():
+                self.latest[symbol] = float(self.states[symbol][0].rsi_preview(klines['close'][-1:])[0])
+            return {symbol: self.latest[symbol] for symbol in symbols if symbol in self.latest}
+
+
+_rsi_feeds = {}
+_rsi_feeds_lock = threading.Lock()
+
+
+def get_rsi_feed(interval='1h'):
+    """RSIFeed bersama per interval untuk satu proses"""
+    with _rsi_feeds_lock:
+        feed = _rsi_feeds.get(interval)
+        if feed is None:
+            feed = _rsi_feeds[interval] = RSIFeed(interval)
+        return feed
+
+
+@instrument("indicators.latest_rsi")
+def get_latest_rsi(symbols, interval='1h'):
+    """
+    RSI terakhir per symbol, return dict {symbol: rsi}.
+    Disajikan dari cache SWR; klines hanya diambil oleh refresh background RSIFeed.
+    """
+    symbols = tuple(symbols)
+    served = get_swr_cache().get(('rsi', interval, symbols), lambda: get_rsi_feed(interval).refresh(symbols),
+                                 fresh_ttl=RSI_FRESH_TTL)
+    return served.value or {}
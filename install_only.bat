@@ -1,6 +1,6 @@
 @echo off
 echo Installing Python packages...
-pip install streamlit requests plotly
+pip install -r requirements.txt
 echo.
 echo Installation complete!
 echo Now you can run: streamlit run simple_dashboard.py
@@ -0,0 +1,316 @@
+"""
+Instrumentasi ringan per tahap: durasi, bytes, cache hit dan error.
+
+Fetcher dan fungsi scoring dibungkus dengan @instrument("nama.tahap"), request
+HTTP dicatat per endpoint oleh http_client. Hasilnya tampil di panel Diagnostics
+sidebar dan sebagai teks format Prometheus (file METRICS_FILE dan/atau
+http://localhost:METRICS_PORT/metrics).
+
+DASHBOARD_METRICS=0 mematikan pencatatan; wrapper tinggal satu cek flag.
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+ENABLED = os.environ.get("DASHBOARD_METRICS", "1") != "0"
+METRICS_FILE = os.environ.get("METRICS_FILE")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 0))
+# Default hanya loopback; set METRICS_HOST=0.0.0.0 supaya bisa di-scrape dari host lain
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+
+RECENT_SAMPLES = 512  # durasi terakhir per tahap untuk p50/p95
+
+
+class StageStats:
+    __slots__ = ('calls', 'errors', 'total', 'max', 'last', 'bytes', 'cache_hits', 'cache_misses', 'recent')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+
+class Metrics:
+    """Kumpulan statistik per tahap untuk satu proses"""
+
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, stage):
+        stats = self._stages.get(stage)
+        if stats is None:
+            stats = self._stages.setdefault(stage, StageStats())
+        return stats
+
+    def record(self, stage, elapsed, error=False, nbytes=0):
+        """Catat satu eksekusi tahap (elapsed dalam detik)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stage(stage)
+            stats.calls += 1
+            stats.errors += bool(error)
+            stats.total += elapsed
+            stats.last = elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.bytes += nbytes
+            stats.recent.append(elapsed)
+
+    def record_cache(self, stage, hit):
+        """Catat cache hit/miss untuk tahap"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stage(stage)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    @contextmanager
+    def timed(self, stage):
+        """Context manager untuk blok kode (mis. render dashboard)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(stage, time.perf_counter() - started, error=True)
+            raise
+        self.record(stage, time.perf_counter() - started)
+
+    def snapshot(self):
+        """Statistik semua tahap, durasi dalam milidetik"""
+        with self._lock:
+            items = [(stage, stats, list(stats.recent)) for stage, stats in self._stages.items()]
+
+        result = {}
+        for stage, stats, recent in sorted(items):
+            p50, p95 = np.percentile(recent, (50, 95)) * 1000 if recent else (0.0, 0.0)
+            lookups = stats.cache_hits + stats.cache_misses
+            result[stage] = {
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'last_ms': stats.last * 1000,
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': stats.max * 1000,
+                'total_s': stats.total,
+                'bytes': stats.bytes,
+                'cache_hits': stats.cache_hits,
+                'cache_misses': stats.cache_misses,
+                'cache_hit_rate': stats.cache_hits / lookups if lookups else None
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started_at = time.time()
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    return _metrics
+
+
+def set_enabled(enabled):
+    _metrics.enabled = enabled
+
+
+def timed(stage):
+    return _metrics.timed(stage)
+
+
+def instrument(stage):
+    """Decorator: catat durasi dan error fungsi ke tahap `stage`"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _metrics.enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                _metrics.record(stage, time.perf_counter() - started, error=True)
+                raise
+            _metrics.record(stage, time.perf_counter() - started)
+            return result
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text():
+    """Semua metrik dalam format teks Prometheus"""
+    # Import lokal: modul ini diimport oleh http_client
+    import http_client
+    from binance_cache import get_premium_index_cache
+    from rate_limiter import get_rate_limiter
+
+    lines = [
+        '# HELP dashboard_stage_duration_seconds Durasi per tahap fetch/scoring/render',
+        '# TYPE dashboard_stage_duration_seconds summary'
+    ]
+    snapshot = _metrics.snapshot()
+    for stage, stats in snapshot.items():
+        if not stats['calls']:
+            continue
+        label = f'stage="{_label(stage)}"'
+        lines.append(f'dashboard_stage_duration_seconds{{{label},quantile="0.5"}} {stats["p50_ms"] / 1000:.6f}')
+        lines.append(f'dashboard_stage_duration_seconds{{{label},quantile="0.95"}} {stats["p95_ms"] / 1000:.6f}')
+        lines.append(f'dashboard_stage_duration_seconds_sum{{{label}}} {stats["total_s"]:.6f}')
+        lines.append(f'dashboard_stage_duration_seconds_count{{{label}}} {stats["calls"]}')
+
+    lines += ['# HELP dashboard_stage_errors_total Error per tahap', '# TYPE dashboard_stage_errors_total counter']
+    lines += [f'dashboard_stage_errors_total{{stage="{_label(stage)}"}} {stats["errors"]}'
+              for stage, stats in snapshot.items() if stats['calls']]
+
+    lines += ['# HELP dashboard_stage_bytes_total Bytes response per tahap', '# TYPE dashboard_stage_bytes_total counter']
+    lines += [f'dashboard_stage_bytes_total{{stage="{_label(stage)}"}} {stats["bytes"]}'
+              for stage, stats in snapshot.items() if stats['bytes']]
+
+    lines += ['# HELP dashboard_cache_lookups_total Cache lookup per tahap', '# TYPE dashboard_cache_lookups_total counter']
+    for stage, stats in snapshot.items():
+        if stats['cache_hit_rate'] is not None:
+            lines.append(f'dashboard_cache_lookups_total{{stage="{_label(stage)}",result="hit"}} {stats["cache_hits"]}')
+            lines.append(f'dashboard_cache_lookups_total{{stage="{_label(stage)}",result="miss"}} {stats["cache_misses"]}')
+
+    lines += ['# HELP binance_weight_remaining Sisa budget weight per host', '# TYPE binance_weight_remaining gauge']
+    lines += [f'binance_weight_remaining{{host="{host}"}} {budget["remaining"]:.1f}'
+              for host, budget in get_rate_limiter().budget().items()]
+
+    totals = http_client.connection_totals()
+    coalescing = http_client.coalescing_stats()
+    premium = get_premium_index_cache().stats()
+    lines += [
+        '# TYPE http_requests_total counter', f'http_requests_total {totals["requests"]}',
+        '# TYPE http_connections_reused_total counter', f'http_connections_reused_total {totals["reused"]}',
+        '# TYPE http_requests_coalesced_total counter', f'http_requests_coalesced_total {coalescing["shared"]}',
+        '# TYPE premium_index_symbols gauge', f'premium_index_symbols {premium["symbols"]}'
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path):
+    """Tulis metrik ke file (atomic, aman dibaca node_exporter textfile collector)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+_server = None
+
+
+def start_metrics_server(port=METRICS_PORT, host=METRICS_HOST):
+    """Endpoint /metrics di thread background (sekali per proses)"""
+    global _server
+    if _server is None:
+        _server = _MetricsServer((host, port), _MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
+
+
+def export():
+    """Export sesuai konfigurasi env: tulis METRICS_FILE dan/atau buka METRICS_PORT"""
+    if not _metrics.enabled:
+        return
+    if METRICS_PORT:
+        try:
+            start_metrics_server(METRICS_PORT, METRICS_HOST)
+        except OSError:
+            pass  # port sudah dipakai proses lain
+    if METRICS_FILE:
+        try:
+            write_prometheus(METRICS_FILE)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Panel Streamlit
+# ---------------------------------------------------------------------------
+
+def diagnostics_panel(container):
+    """Tabel statistik per tahap + budget weight dan reuse koneksi di container Streamlit"""
+    import http_client
+    from rate_limiter import get_rate_limiter
+
+    if not _metrics.enabled:
+        container.caption("Instrumentasi nonaktif (DASHBOARD_METRICS=0)")
+        return
+
+    snapshot = _metrics.snapshot()
+    if snapshot:
+        container.dataframe([
+            {
+                'Stage': stage,
+                'Calls': stats['calls'],
+                'Err': stats['errors'],
+                'Last ms': round(stats['last_ms'], 1),
+                'p50 ms': round(stats['p50_ms'], 1),
+                'p95 ms': round(stats['p95_ms'], 1),
+                'KB': round(stats['bytes'] / 1024, 1),
+                'Cache hit': None if stats['cache_hit_rate'] is None else f"{stats['cache_hit_rate']:.0%}"
+            }
+            for stage, stats in snapshot.items()
+        ], hide_index=True, use_container_width=True)
+    else:
+        container.caption("Belum ada data")
+
+    totals = http_client.connection_totals()
+    coalescing = http_client.coalescing_stats()
+    budget = ", ".join(f"{host.split('.')[0]} {b['remaining']:.0f}/{b['capacity']:.0f}"
+                       for host, b in get_rate_limiter().budget().items())
+    container.caption(
+        f"Koneksi reuse {totals['reuse_rate']:.0%} dari {totals['requests']} request | "
+        f"Coalesced {coalescing['shared']} | Weight {budget}"
+    )
@@ -0,0 +1,334 @@
+"""
+Agregasi likuidasi dari stream `!forceOrder@arr` Binance Futures.
+
+Setiap likuidasi masuk ke bucket waktu lebar tetap per symbol dan per sisi
+(long dilikuidasi = order SELL, short dilikuidasi = order BUY) pada tiga
+resolusi: 1m (2 jam terakhir), 5m (24 jam) dan 1h (7 hari). Bucket disimpan
+di ring buffer sehingga memori per symbol tetap berapa lama pun proses jalan;
+bucket yang berubah ditulis ke TimeSeriesStore (tabel liquidations) secara
+berkala oleh collector (`collector.py --liquidations` atau CLI di bawah), dan
+dimuat ulang saat start. Dashboard hanya membaca tabel itu, tidak menulis.
+
+Cascade factor = notional likuidasi 5 menit terakhir dibagi rata-rata per 5
+menit selama satu jam sebelumnya, bertanda + kalau didominasi likuidasi long
+dan - kalau didominasi likuidasi short.
+
+    python liquidations.py                                         # Binance asli
+    python liquidations.py --replay force_orders.jsonl --port 8768 # stand-in lokal
+    python liquidations.py --url ws://localhost:8768/stream
+"""
+import argparse
+import asyncio
+import threading
+import time
+from array import array
+
+from fast_json import loads
+from stream_ingest import BINANCE_FSTREAM_URL, MarketStream, serve_replay, websockets
+from timeseries_store import get_store
+
+# (lebar bucket detik, jumlah bucket)
+RESOLUTIONS = {
+    '1m': (60, 120),
+    '5m': (300, 288),
+    '1h': (3600, 168)
+}
+PERSIST_INTERVAL = 60      # detik antar penulisan bucket ke store
+PRUNE_INTERVAL = 3600      # detik antar penghapusan bucket lama di store
+RETENTION = {60: 7 * 86400, 300: 30 * 86400, 3600: 365 * 86400}
+
+CASCADE_WINDOW = 300       # detik, window likuidasi terbaru
+BASELINE_WINDOW = 3600     # detik sebelum window terbaru untuk rata-rata normal
+CASCADE_DOMINANCE = 0.7    # porsi satu sisi minimal untuk disebut cascade
+# Notional 5 menit minimal supaya likuidasi kecil tidak dianggap cascade
+CASCADE_MIN_NOTIONAL = {
+    'BTCUSDT': 5_000_000,
+    'ETHUSDT': 2_000_000
+}
+DEFAULT_CASCADE_MIN_NOTIONAL = 500_000
+
+
+class RollupRing:
+    """Ring buffer bucket lebar tetap: notional + jumlah likuidasi long/short (array, ukuran tetap)"""
+
+    __slots__ = ('width', 'slots', 'epochs', 'long_notional', 'short_notional', 'long_count', 'short_count')
+
+    def __init__(self, width, slots):
+        self.width = width
+        self.slots = slots
+        self.epochs = array('q', [-1]) * slots
+        self.long_notional = array('d', [0.0]) * slots
+        self.short_notional = array('d', [0.0]) * slots
+        self.long_count = array('q', [0]) * slots
+        self.short_count = array('q', [0]) * slots
+
+    def _slot(self, bucket):
+        slot = bucket % self.slots
+        if self.epochs[slot] != bucket:
+            self.epochs[slot] = bucket
+            self.long_notional[slot] = self.short_notional[slot] = 0.0
+            self.long_count[slot] = self.short_count[slot] = 0
+        return slot
+
+    def add(self, ts, is_long, notional):
+        """Tambah satu likuidasi, return bucket (index waktu) yang berubah"""
+        bucket = int(ts // self.width)
+        slot = self._slot(bucket)
+        if is_long:
+            self.long_notional[slot] += notional
+            self.long_count[slot] += 1
+        else:
+            self.short_notional[slot] += notional
+            self.short_count[slot] += 1
+        return bucket
+
+    def set(self, bucket, long_notional, short_notional, long_count, short_count):
+        """Isi bucket dari store (restore)"""
+        slot = self._slot(bucket)
+        self.long_notional[slot] = long_notional
+        self.short_notional[slot] = short_notional
+        self.long_count[slot] = long_count
+        self.short_count[slot] = short_count
+
+    def row(self, bucket):
+        """(ts awal bucket, long, short, jumlah long, jumlah short), None kalau bucket sudah tertimpa"""
+        slot = bucket % self.slots
+        if self.epochs[slot] != bucket:
+            return None
+        return (bucket * self.width, self.long_notional[slot], self.short_notional[slot],
+                self.long_count[slot], self.short_count[slot])
+
+    def totals(self, last, count):
+        """Jumlah `count` bucket sampai bucket `last` (inklusif)"""
+        result = {'long': 0.0, 'short': 0.0, 'long_count': 0, 'short_count': 0}
+        for bucket in range(last - min(count, self.slots) + 1, last + 1):
+            slot = bucket % self.slots
+            if self.epochs[slot] == bucket:
+                result['long'] += self.long_notional[slot]
+                result['short'] += self.short_notional[slot]
+                result['long_count'] += self.long_count[slot]
+                result['short_count'] += self.short_count[slot]
+        return result
+
+
+class LiquidationTracker:
+    """Rollup likuidasi per symbol di semua resolusi + daftar bucket yang belum ditulis ke store"""
+
+    def __init__(self, resolutions=RESOLUTIONS, wall_clock=True, track_changes=False):
+        self.resolutions = dict(resolutions)
+        self.track_changes = track_changes  # catat bucket yang berubah untuk persist(); tanpa store tidak perlu
+        self.rings = {}
+        self.clock = 0.0            # waktu likuidasi terakhir (detik)
+        self.wall_clock = wall_clock  # False untuk replay: window relatif ke likuidasi terakhir
+        self.events = 0
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _rings(self, symbol):
+        rings = self.rings.get(symbol)
+        if rings is None:
+            rings = self.rings[symbol] = {name: RollupRing(width, slots)
+                                          for name, (width, slots) in self.resolutions.items()}
+        return rings
+
+    def add(self, symbol, is_long, notional, ts):
+        """Catat satu likuidasi (ts dalam detik)"""
+        with self._lock:
+            for name, ring in self._rings(symbol).items():
+                bucket = ring.add(ts, is_long, notional)
+                if self.track_changes:
+                    self._dirty.add((symbol, name, bucket))
+            if ts > self.clock:
+                self.clock = ts
+            self.events += 1
+
+    def handle_message(self, raw):
+        """Proses satu frame forceOrder (combined stream atau raw)"""
+        message = loads(raw)
+        data = message.get('data', message) if isinstance(message, dict) else message
+        for item in (data if isinstance(data, list) else (data,)):
+            if item.get('e') != 'forceOrder':
+                continue
+            order = item['o']
+            # Notional terisi: harga rata-rata x qty terisi, fallback ke harga x qty order
+            notional = float(order['ap']) * float(order['z']) or float(order['p']) * float(order['q'])
+            self.add(order['s'], order['S'] == 'SELL', notional, order['T'] / 1000)
+
+    def now(self):
+        return max(self.clock, time.time()) if self.wall_clock else self.clock
+
+    def totals(self, symbol, seconds, resolution='1m', offset=0):
+        """
+        Notional dan jumlah likuidasi long/short dalam `seconds` terakhir (bucket
+        yang sedang berjalan ikut dihitung); offset menggeser window ke belakang.
+        """
+        with self._lock:
+            rings = self.rings.get(symbol)
+            if rings is None:
+                return {'long': 0.0, 'short': 0.0, 'long_count': 0, 'short_count': 0}
+            ring = rings[resolution]
+            last = int((self.now() - offset) // ring.width)
+            return ring.totals(last, max(1, int(seconds // ring.width)))
+
+    def cascade(self, symbol):
+        """
+        Metrik cascade: total 5m per sisi, baseline rata-rata per 5m satu jam
+        sebelumnya, ratio, dan factor bertanda (0 kalau bukan cascade).
+        """
+        recent = self.totals(symbol, CASCADE_WINDOW)
+        baseline_totals = self.totals(symbol, BASELINE_WINDOW, offset=CASCADE_WINDOW)
+        total = recent['long'] + recent['short']
+        baseline = (baseline_totals['long'] + baseline_totals['short']) / (BASELINE_WINDOW / CASCADE_WINDOW)
+        ratio = total / baseline if baseline else (float('inf') if total else 0.0)
+        side = None
+        if total:
+            if recent['long'] / total >= CASCADE_DOMINANCE:
+                side = 'long'
+            elif recent['short'] / total >= CASCADE_DOMINANCE:
+                side = 'short'
+        significant = side is not None and total >= CASCADE_MIN_NOTIONAL.get(symbol, DEFAULT_CASCADE_MIN_NOTIONAL)
+        factor = 0.0
+        if significant:
+            factor = min(ratio, 99.0) if side == 'long' else -min(ratio, 99.0)
+        return {
+            'long': recent['long'],
+            'short': recent['short'],
+            'baseline': baseline,
+            'ratio': ratio,
+            'side': side,
+            'cascade': factor
+        }
+
+    def summary(self, symbol):
+        """Total long/short 1m dan 5m (ring 1m), 1h (ring 5m) dan 24h (ring 1h) untuk panel"""
+        return {
+            '1m': self.totals(symbol, 60, '1m'),
+            '5m': self.totals(symbol, 300, '1m'),
+            '1h': self.totals(symbol, 3600, '5m'),
+            '24h': self.totals(symbol, 86400, '1h')
+        }
+
+    def cascades(self, symbols):
+        """Cascade factor per symbol (0 kalau tidak ada likuidasi), sejajar dengan symbols"""
+        return [self.cascade(symbol)['cascade'] if symbol in self.rings else 0.0 for symbol in symbols]
+
+    # -- persistensi ---------------------------------------------------------
+
+    def persist(self, store):
+        """Tulis bucket yang berubah sejak persist terakhir, return jumlah baris"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            rows = []
+            for symbol, name, bucket in dirty:
+                ring = self.rings[symbol][name]
+                row = ring.row(bucket)
+                if row is not None:
+                    rows.append((symbol, ring.width) + row)
+        if rows:
+            store.record_liquidation_buckets(rows)
+        return len(rows)
+
+    def restore(self, store, closed_only=False):
+        """
+        Muat bucket dari store yang masih dalam jangkauan ring, return jumlah baris.
+        closed_only melewati bucket yang sedang berjalan: pembaca yang menghitung
+        likuidasi live sendiri akan menghitung ulang event yang sudah ada di bucket itu.
+        """
+        now = self.now()
+        loaded = 0
+        for name, (width, slots) in self.resolutions.items():
+            current = int(now // width)
+            rows = store.load_liquidation_buckets(width, start=now - width * slots)
+            with self._lock:
+                for symbol, ts, long_notional, short_notional, long_count, short_count in rows:
+                    bucket = int(ts // width)
+                    if closed_only and bucket >= current:
+                        continue
+                    self._rings(symbol)[name].set(bucket, long_notional, short_notional,
+                                                  int(long_count), int(short_count))
+                    loaded += 1
+        return loaded
+
+
+class LiquidationStream(MarketStream):
+    """Stream !forceOrder@arr ke LiquidationTracker, bucket ditulis ke store tiap PERSIST_INTERVAL"""
+
+    def __init__(self, url=BINANCE_FSTREAM_URL, tracker=None, store=None, **kwargs):
+        super().__init__(url=url, streams=('!forceOrder@arr',), **kwargs)
+        self.tracker = tracker or LiquidationTracker()
+        self.tracker.track_changes = store is not None
+        self.store = store
+        self._persisted_at = time.monotonic()
+        self._pruned_at = 0.0
+
+    def handle_message(self, raw):
+        self.tracker.handle_message(raw)
+        self.messages += 1
+        if self.store is not None and time.monotonic() - self._persisted_at >= PERSIST_INTERVAL:
+            self.persist()
+
+    def persist(self):
+        self._persisted_at = time.monotonic()
+        try:
+            written = self.tracker.persist(self.store)
+            if time.time() - self._pruned_at >= PRUNE_INTERVAL:
+                self._pruned_at = time.time()
+                for width, retention in RETENTION.items():
+                    self.store.prune_liquidation_buckets(width, time.time() - retention)
+            return written
+        except Exception:
+            return 0
+
+
+_liquidation_stream = None
+
+
+def get_liquidation_stream():
+    """
+    Stream likuidasi bersama untuk satu proses dashboard (None kalau websockets
+    tidak ada). Riwayat (bucket yang sudah ditutup) dimuat dari store lalu start;
+    stream ini tidak menulis ke store, satu-satunya penulis tabel liquidations
+    adalah collector.
+    """
+    global _liquidation_stream
+    if websockets is None:
+        return None
+    if _liquidation_stream is None:
+        stream = LiquidationStream()
+        stream.tracker.restore(get_store(), closed_only=True)
+        stream.start()
+        _liquidation_stream = stream
+    return _liquidation_stream
+
+
+def get_liquidation_tracker():
+    """Tracker dari stream bersama (None kalau stream tidak tersedia)"""
+    stream = get_liquidation_stream()
+    return stream.tracker if stream else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collector likuidasi Binance Futures (!forceOrder@arr)")
+    parser.add_argument("--url", default=BINANCE_FSTREAM_URL, help="URL combined stream")
+    parser.add_argument("--replay", help="File .jsonl berisi frame forceOrder rekaman untuk stand-in lokal")
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--interval", type=float, default=0.05, help="Jeda antar frame replay (detik)")
+    args = parser.parse_args()
+
+    try:
+        if args.replay:
+            with open(args.replay) as f:
+                frames = [line.strip() for line in f if line.strip()]
+            print(f"Replaying {len(frames)} frames on ws://localhost:{args.port}/stream")
+            asyncio.run(serve_replay(frames, port=args.port, interval=args.interval))
+        else:
+            stream = LiquidationStream(url=args.url, store=get_store())
+            print(f"Restored {stream.tracker.restore(stream.store)} buckets")
+            stream.start()
+            while True:
+                time.sleep(PERSIST_INTERVAL)
+                written = stream.persist()
+                print(f"connected={stream.connected} liquidations={stream.tracker.events} "
+                      f"symbols={len(stream.tracker.rings)} buckets written={written}")
+    except KeyboardInterrupt:
+        pass
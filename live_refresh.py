@@ -0,0 +1,59 @@
+"""
+Live refresh per bagian halaman dengan Streamlit fragment.
+
+Tile sinyal (sinyal, skor, harga, funding, F&G) dibungkus @live_fragment dan
+di-rerun sendiri tiap LIVE_REFRESH_SECONDS. Saat rerun penuh fragment memakai
+hasil load + sinyal yang dikirim sebagai argumen (loader dan scoring tidak
+dijalankan dua kali). Saat tick timer (is_fragment_rerun) fragment memuat ulang
+input dari store collector / cache SWR / websocket dan menghitung ulang sinyal;
+kalau sinyal berubah, st.rerun() menjalankan ulang seluruh halaman supaya panel
+di bawahnya ikut sama. CSS, chart, panel dan sidebar hanya dirender saat rerun
+penuh, jadi tick tanpa perubahan sinyal hanya mengirim delta tile itu.
+
+Streamlit < 1.33 tidak punya fragment: tile dirender biasa tanpa timer.
+"""
+import functools
+import os
+
+import streamlit as st
+
+from instrumentation import timed
+
+LIVE_REFRESH_SECONDS = float(os.environ.get("LIVE_REFRESH_SECONDS", 30))
+
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+FRAGMENTS_SUPPORTED = _fragment is not None
+
+
+def _full_run_key(stage):
+    return f"_live_fragment_full_run.{stage}"
+
+
+def live_fragment(stage, run_every=None):
+    """Decorator: jalankan fungsi sebagai fragment yang rerun tiap `run_every` detik (None = tanpa timer)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        if not FRAGMENTS_SUPPORTED:
+            return wrapper
+        fragment = _fragment(wrapper, run_every=run_every)
+
+        # Dipanggil dari script = rerun penuh; tick timer memanggil fragment langsung
+        @functools.wraps(fn)
+        def full_run(*args, **kwargs):
+            st.session_state[_full_run_key(stage)] = True
+            return fragment(*args, **kwargs)
+        return full_run
+    return decorator
+
+
+def is_fragment_rerun(stage):
+    """True kalau fragment `stage` sedang di-rerun sendiri oleh timer (argumennya dari rerun penuh sebelumnya)"""
+    return FRAGMENTS_SUPPORTED and not st.session_state.pop(_full_run_key(stage), False)
+
+
+def live_interval(enabled):
+    """run_every untuk fragment sesuai checkbox Auto Refresh"""
+    return LIVE_REFRESH_SECONDS if enabled and FRAGMENTS_SUPPORTED else None
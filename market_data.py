@@ -0,0 +1,230 @@
+import time
+
+import numpy as np
+import requests
+
+import http_client
+from binance_cache import get_premium_index_cache
+from fast_json import decode_columns, index_columns
+from fear_greed import get_fear_greed_provider
+from fetch_engine import get_fetch_engine
+from instrumentation import instrument
+from market_snapshot import MarketSnapshot, empty_snapshot
+from rate_limiter import RateLimitExceeded
+from swr_cache import get_swr_cache, serve
+from timeseries_store import FEAR_GREED_SYMBOL
+
+# Daftar coin yang didukung
+SUPPORTED_COINS = {
+    'BTC': 'BTCUSDT',
+    'ETH': 'ETHUSDT',
+    'BNB': 'BNBUSDT',
+    'SOL': 'SOLUSDT',
+    'ADA': 'ADAUSDT',
+    'XRP': 'XRPUSDT',
+    'DOGE': 'DOGEUSDT',
+    'MATIC': 'MATICUSDT',
+    'DOT': 'DOTUSDT',
+    'AVAX': 'AVAXUSDT'
+}
+
+EMPTY_COIN_DATA = {
+    'price': 0, 'change_24h': 0, 'volume': 0,
+    'funding_rate': 0, 'open_interest': 0,
+    'high_24h': 0, 'low_24h': 0
+}
+
+# Field ticker 24hr yang dipakai _parse_coin_data
+TICKER_FIELDS = ('lastPrice', 'priceChangePercent', 'volume', 'highPrice', 'lowPrice')
+
+# Kegagalan upstream yang diubah jadi NaN + degraded (JSON rusak = ValueError, field hilang = KeyError)
+FETCH_ERRORS = (requests.RequestException, RateLimitExceeded, ValueError, KeyError, TypeError)
+
+def _parse_coin_data(price_data, coin_funding, open_interest):
+    # Funding / OI yang tidak tersedia = NaN + degraded, bukan 0
+    funding_rate = float(coin_funding['lastFundingRate']) * 100 if coin_funding else np.nan
+    return {
+        'price': float(price_data['lastPrice']),
+        'change_24h': float(price_data['priceChangePercent']),
+        'volume': float(price_data['volume']),
+        'funding_rate': funding_rate,
+        'open_interest': open_interest,
+        'high_24h': float(price_data['highPrice']),
+        'low_24h': float(price_data['lowPrice']),
+        'degraded': bool(np.isnan(funding_rate) or np.isnan(open_interest))
+    }
+
+@instrument("fetch.open_interest")
+def get_open_interest(symbol, timeout=10):
+    """Ambil Open Interest satu symbol (NaN kalau gagal)"""
+    try:
+        oi_response = http_client.get(f"https://fapi.binance.com/fapi/v1/openInterest?symbol={symbol}", timeout=timeout)
+        oi_response.raise_for_status()
+        return float(oi_response.json()['openInterest'])
+    except FETCH_ERRORS:
+        return np.nan
+
+@instrument("fetch.coin_data")
+def _fetch_coin_data(symbol):
+    # Price data
+    price_url = f"https://fapi.binance.com/fapi/v1/ticker/24hr?symbol={symbol}"
+    price_response = http_client.get(price_url, timeout=10)
+    price_data = price_response.json()
+
+    # Funding Rate (futures)
+    try:
+        coin_funding = get_premium_index_cache().get(symbol)
+    except FETCH_ERRORS:
+        coin_funding = None
+
+    # Open Interest
+    open_interest = get_open_interest(symbol)
+
+    return _parse_coin_data(price_data, coin_funding, open_interest)
+
+def get_coin_data(symbol):
+    """Ambil data coin dari Binance API (nilai terakhir langsung dipakai, refresh di background)"""
+    return serve(('coin_data', symbol), lambda: _fetch_coin_data(symbol), EMPTY_COIN_DATA)
+
+# Di atas jumlah ini OI tidak diambil otomatis (1 request per symbol)
+OI_MAX_SYMBOLS = 20
+
+def _fetch_tickers():
+    """
+    Ticker 24h futures seluruh universe dalam satu request. Disaring per symbol
+    di fetch_snapshot, jadi symbol yang delisting cukup jadi baris degraded
+    (parameter symbols=[...] ditolak seluruhnya oleh Binance kalau ada satu yang invalid).
+    """
+    response = http_client.get("https://fapi.binance.com/fapi/v1/ticker/24hr", timeout=10)
+    response.raise_for_status()
+    # Decode hanya field yang dipakai, langsung ke kolom float
+    return decode_columns(response.content, TICKER_FIELDS)
+
+@instrument("fetch.snapshot")
+def fetch_snapshot(symbols=None, open_interest=None, use_cache=True):
+    """
+    Ambil MarketSnapshot: 1 ticker bulk + 1 premiumIndex (+ N OI paralel).
+
+    symbols=None mengambil seluruh universe futures. open_interest=None berarti
+    OI hanya diambil kalau jumlah symbol <= OI_MAX_SYMBOLS. use_cache=False
+    mengambil premiumIndex langsung, bukan dari cache SWR (bisa basi s/d max_stale).
+    """
+    # Ticker gagal = seluruh snapshot gagal
+    tickers = _fetch_tickers()
+    ticker_rows = index_columns(tickers)
+    if symbols is None:
+        symbols = tickers['symbol'].tolist()
+
+    rows = np.array([ticker_rows.get(symbol, -1) for symbol in symbols], dtype=np.intp)
+    found = rows >= 0
+    columns = {}
+    for field, name in zip(TICKER_FIELDS, ('price', 'change_24h', 'volume', 'high_24h', 'low_24h')):
+        column = np.zeros(len(symbols))
+        column[found] = tickers[field][rows[found]]
+        columns[name] = column
+    # Symbol yang tidak ada / tidak lengkap di ticker = degraded, nilainya 0
+    degraded = ~found
+    if symbols:
+        degraded |= np.isnan(np.column_stack(list(columns.values()))).any(axis=1)
+    for column in columns.values():
+        column[degraded] = 0
+
+    try:
+        premium_cache = get_premium_index_cache()
+        premium_index = premium_cache.get_index() if use_cache else premium_cache.fetch_index()
+        columns['funding_rate'] = premium_index.funding_rates(symbols)
+    except FETCH_ERRORS:
+        columns['funding_rate'] = np.full(len(symbols), np.nan)
+    # Funding gagal diambil / symbol tidak ada di premiumIndex = degraded
+    degraded |= np.isnan(columns['funding_rate'])
+
+    if open_interest is None:
+        open_interest = len(symbols) <= OI_MAX_SYMBOLS
+    if open_interest:
+        # Hanya OI yang perlu request per symbol, dijalankan paralel
+        oi_results, _ = get_fetch_engine().run(
+            {symbol: (lambda s=symbol: get_open_interest(s)) for symbol in symbols}
+        )
+        columns['open_interest'] = np.array([oi_results.get(symbol, np.nan) for symbol in symbols], dtype=np.float64)
+        # OI yang diminta tapi gagal = degraded
+        degraded |= np.isnan(columns['open_interest'])
+    else:
+        # NaN = tidak diambil (disimpan NULL di store), beda dengan OI 0; tidak membuat degraded
+        columns['open_interest'] = np.full(len(symbols), np.nan)
+
+    return MarketSnapshot(symbols, columns, degraded)
+
+def get_market_snapshot(symbols=None):
+    """Versi stale-while-revalidate dari fetch_snapshot (kolom dipakai bersama, jangan diubah in-place)"""
+    key = ('snapshot', None if symbols is None else tuple(symbols))
+    served = get_swr_cache().get(key, lambda: fetch_snapshot(symbols))
+    if served.value is None:
+        return empty_snapshot(symbols or ())
+    return served.value.with_freshness(served.age, served.stale, served.degraded)
+
+@instrument("fetch.all_coins")
+def fetch_all_coins_data(coins=None):
+    """Ambil data semua coin sekaligus sebagai dict {coin: coin_data} (lihat fetch_snapshot)"""
+    coins = coins or SUPPORTED_COINS
+    return fetch_snapshot(list(coins.values())).to_coin_data(coins)
+
+def get_all_coins_data(coins=None):
+    """Versi stale-while-revalidate dari fetch_all_coins_data, tiap coin diberi metadata kesegaran"""
+    coins = coins or SUPPORTED_COINS
+    return get_market_snapshot(list(coins.values())).to_coin_data(coins)
+
+def get_fear_greed():
+    """Fear & Greed Index dari provider proses (di-cache sampai jadwal update berikutnya)"""
+    return get_fear_greed_provider().get()
+
+def classify_fear_greed(value):
+    """Klasifikasi Fear & Greed sesuai band alternative.me"""
+    if value < 25:
+        return 'Extreme Fear'
+    elif value < 47:
+        return 'Fear'
+    elif value < 55:
+        return 'Neutral'
+    elif value < 76:
+        return 'Greed'
+    return 'Extreme Greed'
+
+# Snapshot dari collector dianggap basi kalau lebih tua dari ini
+COLLECTOR_MAX_AGE = 90  # detik
+
+def read_coin_data(store, symbol, max_age=COLLECTOR_MAX_AGE):
+    """Baca snapshot coin terakhir dari store collector (None kalau belum ada / basi)"""
+    latest = store.latest(symbol)
+    if latest is None or time.time() - latest['ts'] > max_age or latest['price'] is None:
+        return None
+    # NULL di store = NaN; OI NULL berarti tidak diambil, funding NULL = degraded
+    coin_data = {key: np.nan if latest[key] is None else latest[key] for key in EMPTY_COIN_DATA}
+    coin_data['degraded'] = bool(np.isnan(coin_data['funding_rate']))
+    return coin_data
+
+def read_all_coins_data(store, coins=None, max_age=COLLECTOR_MAX_AGE):
+    """Baca semua coin dari store collector (None kalau ada yang belum ada / basi)"""
+    coins = coins or SUPPORTED_COINS
+    all_data = {}
+    for coin, symbol in coins.items():
+        data = read_coin_data(store, symbol, max_age)
+        if data is None:
+            return None
+        all_data[coin] = data
+    return all_data
+
+def read_snapshot(store, coins=None, max_age=COLLECTOR_MAX_AGE):
+    """read_all_coins_data dalam bentuk MarketSnapshot per symbol (None kalau ada yang basi)"""
+    coins = coins or SUPPORTED_COINS
+    all_data = read_all_coins_data(store, coins, max_age)
+    if all_data is None:
+        return None
+    return MarketSnapshot.from_coin_data({coins[coin]: data for coin, data in all_data.items()})
+
+def read_fear_greed(store, max_age=COLLECTOR_MAX_AGE):
+    """Baca Fear & Greed terakhir dari store collector (None kalau belum ada / basi)"""
+    latest = store.latest(FEAR_GREED_SYMBOL)
+    if latest is None or time.time() - latest['ts'] > max_age or latest['fear_greed'] is None:
+        return None
+    value = int(latest['fear_greed'])
+    return {'value': value, 'classification': classify_fear_greed(value)}
@@ -0,0 +1,118 @@
+"""
+Snapshot market kolom untuk banyak symbol sekaligus.
+
+Satu array float64 per field (price, funding_rate, ...) + index symbol -> baris,
+dipakai bersama oleh fetcher, scoring dan render. Untuk seluruh universe
+futures (~400 symbol) ukurannya ~25 KB, tidak ada dict per coin.
+
+Kolom dianggap read-only: snapshot dari cache dipakai bersama semua session,
+jadi perubahan dibuat lewat copy()/with_freshness() atau kolom baru.
+"""
+import time
+
+import numpy as np
+
+SNAPSHOT_FIELDS = ('price', 'change_24h', 'volume', 'high_24h', 'low_24h', 'funding_rate', 'open_interest')
+
+
+class MarketSnapshot:
+    """Kolom NumPy per field + index symbol, dengan metadata kesegaran"""
+
+    __slots__ = ('symbols', 'index', 'columns', 'degraded', 'ts', 'data_age', 'stale')
+
+    def __init__(self, symbols, columns=None, degraded=None, ts=None, data_age=0.0, stale=False):
+        self.symbols = list(symbols)
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+        count = len(self.symbols)
+        self.columns = {field: np.zeros(count) for field in SNAPSHOT_FIELDS}
+        for field, values in (columns or {}).items():
+            self.columns[field] = np.asarray(values, dtype=np.float64)
+        self.degraded = np.zeros(count, dtype=bool) if degraded is None else np.asarray(degraded, dtype=bool)
+        self.ts = time.time() if ts is None else ts
+        self.data_age = data_age
+        self.stale = stale
+
+    @classmethod
+    def from_coin_data(cls, all_coin_data, ts=None):
+        """Bangun snapshot dari dict {key: coin_data}; key (coin atau symbol) jadi label baris"""
+        keys = list(all_coin_data)
+        rows = [all_coin_data[key] for key in keys]
+        columns = {field: [row.get(field, 0) for row in rows] for field in SNAPSHOT_FIELDS}
+        # RSI asli hanya ada kalau coin_data diperkaya dari indicators.py
+        if any(row.get('rsi') is not None for row in rows):
+            columns['rsi'] = [np.nan if row.get('rsi') is None else row['rsi'] for row in rows]
+        # Skor whale hanya ada kalau coin_data diperkaya dari whale_stream.py
+        if any(row.get('whale') is not None for row in rows):
+            columns['whale_score'] = [np.nan if row.get('whale') is None else row['whale'][0] for row in rows]
+        # Metrik order book hanya ada kalau coin_data diperkaya dari orderbook.py
+        if any(row.get('depth') is not None for row in rows):
+            columns['depth_imbalance'] = [np.nan if row.get('depth') is None else row['depth']['imbalance'] for row in rows]
+        # Cascade likuidasi hanya ada kalau coin_data diperkaya dari liquidations.py
+        if any(row.get('liquidations') is not None for row in rows):
+            columns['liquidation_cascade'] = [np.nan if row.get('liquidations') is None else row['liquidations']['cascade']
+                                              for row in rows]
+        degraded = [bool(row.get('degraded')) for row in rows]
+        return cls(keys, columns, degraded, ts)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values()) + self.degraded.nbytes
+
+    def add_column(self, name, values):
+        """Tambah kolom baru (mis. rsi) sejajar dengan symbols"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != len(self.symbols):
+            raise ValueError(f"Kolom {name} punya {len(values)} baris, snapshot {len(self.symbols)}")
+        self.columns[name] = values
+
+    def row(self, symbol):
+        """Satu baris sebagai dict coin_data (format lama get_coin_data)"""
+        position = self.index[symbol]
+        data = {field: float(column[position]) for field, column in self.columns.items()}
+        if 'rsi' in data and np.isnan(data['rsi']):
+            data['rsi'] = None
+        data['degraded'] = bool(self.degraded[position])
+        data['data_age'] = self.data_age
+        data['stale'] = self.stale
+        return data
+
+    def to_coin_data(self, coins):
+        """Dict {coin: coin_data} untuk mapping coin -> symbol"""
+        return {coin: self.row(symbol) for coin, symbol in coins.items() if symbol in self.index}
+
+    def select(self, symbols):
+        """Snapshot baru berisi symbol tertentu saja (urutan mengikuti argumen)"""
+        rows = np.array([self.index[symbol] for symbol in symbols], dtype=np.intp)
+        columns = {field: column[rows] for field, column in self.columns.items()}
+        return MarketSnapshot(symbols, columns, self.degraded[rows], self.ts, self.data_age, self.stale)
+
+    def copy(self):
+        """Copy dengan kolom sendiri, aman untuk diubah in-place"""
+        columns = {field: column.copy() for field, column in self.columns.items()}
+        return MarketSnapshot(self.symbols, columns, self.degraded.copy(), self.ts, self.data_age, self.stale)
+
+    def with_freshness(self, data_age, stale, degraded=False):
+        """View dengan metadata kesegaran baru; array kolom tidak dicopy"""
+        view = MarketSnapshot.__new__(MarketSnapshot)
+        view.symbols = self.symbols
+        view.index = self.index
+        view.columns = dict(self.columns)
+        view.degraded = self.degraded | degraded
+        view.ts = self.ts
+        view.data_age = data_age
+        view.stale = stale
+        return view
+
+
+def empty_snapshot(symbols=()):
+    """Snapshot tanpa data: semua baris degraded"""
+    return MarketSnapshot(symbols, degraded=np.ones(len(symbols), dtype=bool), data_age=None, stale=True)
@@ -1,7 +1,20 @@
 import streamlit as st
-import requests
 from datetime import datetime
 import time
+import numpy as np
+from market_data import (SUPPORTED_COINS, get_coin_data, get_market_snapshot, get_fear_greed,
+                         read_coin_data, read_snapshot, read_fear_greed)
+from strategy import calculate_entry_signal
+from signal_engine import score_snapshot, signal_names, SIGNAL_CONFIDENCE
+from timeseries_store import get_store
+from indicators import get_latest_rsi
+from stream_ingest import get_market_stream
+from whale_stream import get_whale_tracker
+from orderbook import get_depth_stream
+from liquidations import get_liquidation_stream
+from instrumentation import get_metrics, timed, diagnostics_panel, export
+from exchanges import get_cross_exchange_view
+from live_refresh import is_fragment_rerun, live_fragment, live_interval
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -10,6 +23,16 @@ st.set_page_config(
     layout="wide"
 )
 
+run_started = time.perf_counter()
+
+def finish_run(render_started):
+    """Catat durasi render + total run, tampilkan panel Diagnostics dan export metrik"""
+    now = time.perf_counter()
+    get_metrics().record("dashboard.multi_coin.render", now - render_started)
+    get_metrics().record("dashboard.multi_coin.run", now - run_started)
+    diagnostics_panel(st.sidebar.expander("🩺 Diagnostics"))
+    export()
+
 # CSS styling
 st.markdown("""
 <style>
@@ -27,227 +50,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Daftar coin yang didukung
-SUPPORTED_COINS = {
-    'BTC': 'BTCUSDT',
-    'ETH': 'ETHUSDT', 
-    'BNB': 'BNBUSDT',
-    'SOL': 'SOLUSDT',
-    'ADA': 'ADAUSDT',
-    'XRP': 'XRPUSDT',
-    'DOGE': 'DOGEUSDT',
-    'MATIC': 'MATICUSDT',
-    'DOT': 'DOTUSDT',
-    'AVAX': 'AVAXUSDT'
-}
-
-def get_coin_data(symbol):
-    """Ambil data coin dari Binance API"""
-    try:
-        # Price data
-        price_url = f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}"
-        price_response = requests.get(price_url, timeout=10)
-        price_data = price_response.json()
-        
-        # Funding Rate (futures)
-        funding_url = "https://fapi.binance.com/fapi/v1/premiumIndex"
-        funding_response = requests.get(funding_url, timeout=10)
-        funding_data = funding_response.json()
-        
-        coin_funding = next((item for item in funding_data if item['symbol'] == symbol), None)
-        
-        # Open Interest
-        try:
-            oi_response = requests.get(f"https://fapi.binance.com/fapi/v1/openInterest?symbol={symbol}", timeout=10)
-            oi_data = oi_response.json()
-            open_interest = float(oi_data['openInterest'])
-        except:
-            open_interest = 0
-        
-        return {
-            'price': float(price_data['lastPrice']),
-            'change_24h': float(price_data['priceChangePercent']),
-            'volume': float(price_data['volume']),
-            'funding_rate': float(coin_funding['lastFundingRate']) * 100 if coin_funding else 0,
-            'open_interest': open_interest,
-            'high_24h': float(price_data['highPrice']),
-            'low_24h': float(price_data['lowPrice'])
-        }
-    except:
-        return {
-            'price': 0, 'change_24h': 0, 'volume': 0, 
-            'funding_rate': 0, 'open_interest': 0,
-            'high_24h': 0, 'low_24h': 0
-        }
-
-def get_fear_greed():
-    """Ambil Fear & Greed Index"""
-    try:
-        response = requests.get("https://api.alternative.me/fng/", timeout=10)
-        data = response.json()
-        return {
-            'value': int(data['data'][0]['value']),
-            'classification': data['data'][0]['value_classification']
-        }
-    except:
-        return {'value': 50, 'classification': 'Neutral'}
-
-def technical_analysis(coin_data):
-    """Analisis teknikal sederhana"""
-    price = coin_data['price']
-    high_24h = coin_data['high_24h']
-    low_24h = coin_data['low_24h']
-    change_24h = coin_data['change_24h']
-    
-    # RSI simulasi berdasarkan posisi harga dalam range 24h
-    price_position = (price - low_24h) / (high_24h - low_24h) if high_24h != low_24h else 0.5
-    simulated_rsi = price_position * 100
-    
-    signals = []
-    score = 0
-    
-    # RSI Analysis
-    if simulated_rsi < 30:
-        signals.append("🟢 RSI Oversold (bullish)")
-        score += 1
-    elif simulated_rsi > 70:
-        signals.append("🔴 RSI Overbought (bearish)")
-        score -= 1
-    
-    # Price momentum
-    if change_24h > 5:
-        signals.append("🟢 Strong upward momentum")
-        score += 1
-    elif change_24h < -5:
-        signals.append("🔴 Strong downward momentum")
-        score -= 1
-    
-    return score, signals, simulated_rsi
-
-def fundamental_analysis(coin_data, fear_greed_value):
-    """Analisis fundamental"""
-    funding_rate = coin_data['funding_rate']
-    volume = coin_data['volume']
-    
-    signals = []
-    score = 0
-    
-    # Funding Rate Analysis
-    if funding_rate > 0.1:
-        signals.append("🔴 High funding rate - shorts paying longs")
-        score -= 1
-    elif funding_rate < -0.05:
-        signals.append("🟢 Negative funding rate - longs paying shorts")
-        score += 1
-    
-    # Volume Analysis (simplified)
-    if volume > 1000000:  # High volume threshold
-        signals.append("🟢 High trading volume")
-        score += 0.5
-    
-    # Fear & Greed Impact
-    if fear_greed_value < 25:
-        signals.append("🟢 Market fear - contrarian opportunity")
-        score += 1
-    elif fear_greed_value > 75:
-        signals.append("🔴 Market greed - potential reversal")
-        score -= 1
-    
-    return score, signals
-
-def whale_analysis():
-    """Simulasi analisis whale movement"""
-    # Simulasi data whale (dalam implementasi nyata bisa pakai API premium)
-    whale_signals = [
-        "🐋 Large accumulation detected",
-        "🟢 Whale outflow from exchanges",
-        "📈 Institutional buying pressure"
-    ]
-    return 1, whale_signals
-
-def calculate_entry_signal(coin, coin_data, fear_greed):
-    """Hitung sinyal entry berdasarkan semua strategi"""
-    
-    # 1. Technical Analysis
-    tech_score, tech_signals, rsi = technical_analysis(coin_data)
-    
-    # 2. Fundamental Analysis  
-    fund_score, fund_signals = fundamental_analysis(coin_data, fear_greed['value'])
-    
-    # 3. Whale Analysis
-    whale_score, whale_signals = whale_analysis()
-    
-    # 4. On-chain Analysis (funding rate focus)
-    onchain_score = 0
-    onchain_signals = []
-    if coin_data['funding_rate'] < -0.02:
-        onchain_score += 1
-        onchain_signals.append("🟢 Negative funding - bullish setup")
-    elif coin_data['funding_rate'] > 0.05:
-        onchain_score -= 1
-        onchain_signals.append("🔴 High funding - bearish setup")
-    
-    # Total Score
-    total_score = tech_score + fund_score + whale_score + onchain_score
-    
-    # Entry Signal
-    if total_score >= 3:
-        entry_signal = "STRONG LONG"
-        entry_color = "bullish"
-        confidence = "High"
-    elif total_score >= 1.5:
-        entry_signal = "LONG"
-        entry_color = "bullish" 
-        confidence = "Medium"
-    elif total_score <= -3:
-        entry_signal = "STRONG SHORT"
-        entry_color = "bearish"
-        confidence = "High"
-    elif total_score <= -1.5:
-        entry_signal = "SHORT"
-        entry_color = "bearish"
-        confidence = "Medium"
-    else:
-        entry_signal = "NO TRADE"
-        entry_color = "neutral"
-        confidence = "Low"
-    
-    # Entry levels
-    price = coin_data['price']
-    if "LONG" in entry_signal:
-        entry_price = price * 0.995  # 0.5% below current
-        stop_loss = price * 0.97     # 3% stop loss
-        take_profit = price * 1.06   # 6% take profit
-    elif "SHORT" in entry_signal:
-        entry_price = price * 1.005  # 0.5% above current
-        stop_loss = price * 1.03     # 3% stop loss
-        take_profit = price * 0.94   # 6% take profit
-    else:
-        entry_price = price
-        stop_loss = 0
-        take_profit = 0
-    
-    return {
-        'signal': entry_signal,
-        'color': entry_color,
-        'confidence': confidence,
-        'total_score': total_score,
-        'entry_price': entry_price,
-        'stop_loss': stop_loss,
-        'take_profit': take_profit,
-        'rsi': rsi,
-        'tech_score': tech_score,
-        'fund_score': fund_score,
-        'whale_score': whale_score,
-        'onchain_score': onchain_score,
-        'all_signals': {
-            'technical': tech_signals,
-            'fundamental': fund_signals,
-            'whale': whale_signals,
-            'onchain': onchain_signals
-        }
-    }
-
 # Header
 st.title("🚀 Multi-Coin Trading Dashboard")
 st.markdown("**Advanced Trading Signals with Entry Analysis**")
@@ -259,35 +61,153 @@ with col1:
 with col2:
     if st.button("🔄 Refresh"):
         st.rerun()
+with col3:
+    scan_all = st.checkbox("Scan All Coins", value=False)
+    auto_refresh = st.checkbox("Auto Refresh", value=True)
 
 selected_symbol = SUPPORTED_COINS[selected_coin]
 
+# Mode scan: semua coin dengan bulk endpoint, diranking berdasarkan total score
+if scan_all:
+    with st.spinner(f"Scanning {len(SUPPORTED_COINS)} coins..."), timed("dashboard.multi_coin.fetch"):
+        # Baca dari collector kalau jalan, fallback ke fetch langsung
+        store = get_store()
+        snapshot = read_snapshot(store) or get_market_snapshot(list(SUPPORTED_COINS.values()))
+        fear_greed = read_fear_greed(store) or get_fear_greed()
+        
+        # Harga & funding terbaru dari websocket kalau stream aktif
+        market_stream = get_market_stream()
+        if market_stream:
+            snapshot, _ = market_stream.apply_to_snapshot(snapshot)
+        
+        # RSI asli dari klines 1h semua coin (paralel)
+        latest_rsi = get_latest_rsi(snapshot.symbols)
+        snapshot.add_column('rsi', [latest_rsi.get(symbol, np.nan) for symbol in snapshot.symbols])
+        
+        # Skor whale dari stream aggTrade (0 kalau stream tidak aktif)
+        whale_tracker = get_whale_tracker()
+        if whale_tracker:
+            snapshot.add_column('whale_score', whale_tracker.scores(snapshot.symbols))
+        
+        # Imbalance order book lokal (NaN kalau book belum sinkron)
+        depth_stream = get_depth_stream()
+        if depth_stream:
+            snapshot.add_column('depth_imbalance', depth_stream.imbalances(snapshot.symbols))
+        
+        # Cascade likuidasi (hanya kalau stream forceOrder tersambung)
+        liquidation_stream = get_liquidation_stream()
+        if liquidation_stream and liquidation_stream.connected:
+            snapshot.add_column('liquidation_cascade', liquidation_stream.tracker.cascades(snapshot.symbols))
+        
+        # Semua coin diskor sekaligus dalam satu pass vectorized
+        scores = score_snapshot(snapshot, fear_greed)
+    
+    render_started = time.perf_counter()
+    ranking = np.argsort(-scores['total_score'], kind='stable')
+    coin_by_symbol = {symbol: coin for coin, symbol in SUPPORTED_COINS.items()}
+    signals = signal_names(scores['signal'][ranking])
+    
+    st.markdown("### 🔎 All Coins Scan")
+    st.metric("Fear & Greed", fear_greed['value'], fear_greed['classification'])
+    # Kolom langsung dari array snapshot/score, tidak ada dict per coin
+    st.dataframe({
+        'Coin': [coin_by_symbol[snapshot.symbols[i]] for i in ranking],
+        'Signal': signals,
+        'Confidence': [SIGNAL_CONFIDENCE[code] for code in scores['signal'][ranking].tolist()],
+        'Score': np.round(scores['total_score'][ranking], 1),
+        'Whale': scores['whale_score'][ranking],
+        'Depth': scores['depth_score'][ranking],
+        'Liq': scores['liquidation_score'][ranking],
+        'Price': snapshot['price'][ranking],
+        '24h %': np.round(snapshot['change_24h'][ranking], 2),
+        'Funding %': np.round(snapshot['funding_rate'][ranking], 4),
+        'Open Interest': snapshot['open_interest'][ranking],
+        'Entry': scores['entry_price'][ranking],
+        'Stop Loss': scores['stop_loss'][ranking],
+        'Take Profit': scores['take_profit'][ranking]
+    }, use_container_width=True, hide_index=True)
+    
+    st.write(f"**Last Update:** {datetime.now().strftime('%H:%M:%S')} | **Coins:** {len(snapshot)}")
+    finish_run(render_started)
+    st.stop()
+
+def load_coin(coin, symbol):
+    """coin_data + Fear & Greed + analisis untuk satu coin, dari collector/cache SWR/websocket"""
+    # Baca dari collector kalau jalan, fallback ke fetch langsung
+    store = get_store()
+    stored_coin_data = read_coin_data(store, symbol)
+    coin_data = stored_coin_data or get_coin_data(symbol)
+    
+    # Harga & funding terbaru dari websocket kalau stream aktif
+    market_stream = get_market_stream()
+    streamed = False
+    if market_stream:
+        coin_data, streamed = market_stream.apply_to_coin_data(symbol, coin_data)
+    fear_greed = read_fear_greed(store) or get_fear_greed()
+    coin_data['rsi'] = get_latest_rsi([symbol]).get(symbol)
+    whale_tracker = get_whale_tracker()
+    coin_data['whale'] = whale_tracker.analysis(symbol) if whale_tracker else None
+    depth_stream = get_depth_stream()
+    coin_data['depth'] = depth_stream.metrics(symbol) if depth_stream else None
+    liquidation_stream = get_liquidation_stream()
+    live_liquidations = liquidation_stream is not None and liquidation_stream.connected
+    coin_data['liquidations'] = liquidation_stream.tracker.cascade(symbol) if live_liquidations else None
+    analysis = calculate_entry_signal(coin, coin_data, fear_greed)
+    return coin_data, fear_greed, analysis, bool(stored_coin_data), streamed
+
 # Fetch data
-with st.spinner(f"Loading {selected_coin} data..."):
-    coin_data = get_coin_data(selected_symbol)
-    fear_greed = get_fear_greed()
-    analysis = calculate_entry_signal(selected_coin, coin_data, fear_greed)
+with st.spinner(f"Loading {selected_coin} data..."), timed("dashboard.multi_coin.fetch"):
+    coin_data, fear_greed, analysis, stored_coin_data, streamed = load_coin(selected_coin, selected_symbol)
 
-# Main Signal & Entry Analysis
-st.markdown("### 🎯 Trading Signal & Entry Analysis")
+render_started = time.perf_counter()
+signal_time = datetime.now()
 
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.markdown(f"<div class='{analysis['color']} big-font'>{analysis['signal']}</div>", unsafe_allow_html=True)
-    st.write(f"**Confidence:** {analysis['confidence']}")
+def signal_state(analysis, fear_greed):
+    """Bagian sinyal yang juga tampil di panel dan score breakdown; kalau berubah saat tick, seluruh halaman di-rerun"""
+    return (analysis['signal'], analysis['confidence'], analysis['total_score'], analysis['all_signals'],
+            analysis['whale_score'], analysis['onchain_score'], analysis['liquidation_score'],
+            analysis['depth_score'], fear_greed['value'])
 
-with col2:
-    st.metric(f"{selected_coin} Price", f"${coin_data['price']:,.4f}", f"{coin_data['change_24h']:+.2f}%")
+# Auto refresh: tiap interval tile sinyal + entry box memuat ulang input (store collector / cache
+# SWR / websocket / RSI) dan menghitung ulang sinyal. Kalau sinyal berubah, seluruh halaman di-rerun
+@live_fragment("dashboard.multi_coin.tiles", run_every=live_interval(auto_refresh))
+def signal_tiles(coin, symbol, coin_data, fear_greed, analysis, signal_time):
+    if is_fragment_rerun("dashboard.multi_coin.tiles"):
+        previous = signal_state(analysis, fear_greed)
+        coin_data, fear_greed, analysis, _, _ = load_coin(coin, symbol)
+        signal_time = datetime.now()
+        if signal_state(analysis, fear_greed) != previous:
+            st.rerun()
+    if analysis['degraded']:
+        st.error("⚠️ Data upstream tidak tersedia atau terlalu lama, sinyal dinonaktifkan")
+    elif coin_data.get('stale') or fear_greed.get('stale'):
+        st.caption(f"⏳ Menampilkan data terakhir ({analysis['data_age']:.0f} detik), refresh berjalan di background")
 
-with col3:
-    st.metric("Simulated RSI", f"{analysis['rsi']:.1f}", 
-              "Oversold" if analysis['rsi'] < 30 else "Overbought" if analysis['rsi'] > 70 else "Neutral")
+    # Main Signal & Entry Analysis
+    st.markdown("### 🎯 Trading Signal & Entry Analysis")
 
-with col4:
-    st.metric("Fear & Greed", fear_greed['value'], fear_greed['classification'])
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(f"<div class='{analysis['color']} big-font'>{analysis['signal']}</div>", unsafe_allow_html=True)
+        st.write(f"**Confidence:** {analysis['confidence']}")
+
+    with col2:
+        st.metric(f"{coin} Price", f"${coin_data['price']:,.4f}", f"{coin_data['change_24h']:+.2f}%")
+
+    with col3:
+        st.metric("RSI (14, 1h)" if coin_data['rsi'] is not None else "Simulated RSI", f"{analysis['rsi']:.1f}", 
+                  "Oversold" if analysis['rsi'] < 30 else "Overbought" if analysis['rsi'] > 70 else "Neutral")
+
+    with col4:
+        st.metric("Fear & Greed", fear_greed['value'], fear_greed['classification'])
+
+    st.caption(f"Last Update: {signal_time.strftime('%H:%M:%S')}")
+    entry_box(coin, coin_data, fear_greed, analysis)
 
 # Entry Box with Advice
-if analysis['signal'] != "NO TRADE":
+def entry_box(coin, coin_data, fear_greed, analysis):
+    if analysis['signal'] == "NO TRADE":
+        return
     # Generate entry advice
     entry_advice = ""
     entry_reasons = []
@@ -338,7 +258,7 @@ if analysis['signal'] != "NO TRADE":
     
     st.markdown(f"""
     <div class="entry-box">
-    <h3>📍 Entry Setup for {selected_coin}</h3>
+    <h3>📍 Entry Setup for {coin}</h3>
     <p><strong>Signal:</strong> <span class="{analysis['color']}">{analysis['signal']}</span></p>
     <p><strong>Advice:</strong> {entry_advice}</p>
     <hr>
@@ -375,6 +295,8 @@ if analysis['signal'] != "NO TRADE":
     else:
         st.warning("⚠️ Medium confidence setup. Consider 1-2% position size. Wait for additional confirmation.")
 
+signal_tiles(selected_coin, selected_symbol, coin_data, fear_greed, analysis, signal_time)
+
 st.divider()
 
 # 4 Strategy Analysis Panels
@@ -404,24 +326,79 @@ with col2:
     if not analysis['all_signals']['onchain']:
         st.write("• Neutral on-chain signals")
     st.write(f"• Open Interest: {coin_data['open_interest']:,.0f}")
+    for signal in analysis['all_signals']['liquidations']:
+        st.write(signal)
+    liquidation_stream = get_liquidation_stream()
+    if liquidation_stream and liquidation_stream.tracker.events:
+        rollup = liquidation_stream.tracker.summary(selected_symbol)
+        st.write("• Liquidations long / short: " + " | ".join(
+            f"{window} ${rollup[window]['long'] / 1e6:,.2f}M / ${rollup[window]['short'] / 1e6:,.2f}M"
+            for window in ('1m', '1h', '24h')))
+    
+    st.markdown("### 📚 Order Book")
+    for signal in analysis['all_signals']['depth']:
+        st.write(signal)
+
+# Price & Funding History (24 jam terakhir dari store lokal)
+history = get_store().query_range(selected_symbol, start=time.time() - 86400, fields=('price', 'funding_rate'))
+if len(history['ts']) > 1:
+    st.markdown("### 📉 History (24h)")
+    history_times = [datetime.fromtimestamp(ts) for ts in history['ts']]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.line_chart({'time': history_times, 'price': history['price']}, x='time', y='price')
+    with col2:
+        st.line_chart({'time': history_times, 'funding_rate': history['funding_rate']}, x='time', y='funding_rate')
+
+# Cross-Exchange: harga, funding dan OI dari semua exchange sekaligus (opsional, request tambahan)
+if st.checkbox("🌐 Cross-Exchange", value=False):
+    with timed("dashboard.multi_coin.cross_exchange"):
+        cross = get_cross_exchange_view()
+    if cross is None:
+        st.warning("⚠️ Data cross-exchange belum tersedia")
+    else:
+        st.markdown("### 🌐 Cross-Exchange")
+        summary = cross.summary(selected_symbol)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Consensus Price", f"${summary['consensus_price']:,.4f}", f"{summary['exchanges']} exchanges")
+        with col2:
+            st.metric("Price Dispersion", f"{summary['price_dispersion']:.3f}%")
+        with col3:
+            st.metric("Mean Funding", f"{summary['mean_funding']:.4f}%", f"spread {summary['funding_spread']:.4f}%")
+        with col4:
+            st.metric("Total OI", f"{summary['total_open_interest']:,.0f}")
+        st.dataframe([
+            {
+                'Exchange': row['Exchange'],
+                'Price': row['price'],
+                '24h %': row['change_24h'],
+                'Funding %': row['funding_rate'],
+                'Open Interest': row['open_interest'],
+                'Status': row.get('error') or 'OK'
+            }
+            for row in cross.for_symbol(selected_symbol)
+        ], hide_index=True, use_container_width=True)
 
 # Score Summary
 st.markdown("### 📈 Strategy Score Summary")
-col1, col2, col3, col4, col5 = st.columns(5)
+col1, col2, col3, col4, col5, col6 = st.columns(6)
 with col1:
     st.metric("Technical", len([s for s in analysis['all_signals']['technical'] if '🟢' in s]) - len([s for s in analysis['all_signals']['technical'] if '🔴' in s]))
 with col2:
     st.metric("Fundamental", len([s for s in analysis['all_signals']['fundamental'] if '🟢' in s]) - len([s for s in analysis['all_signals']['fundamental'] if '🔴' in s]))
 with col3:
-    st.metric("Whale", 1)
+    st.metric("Whale", f"{analysis['whale_score']:+d}")
 with col4:
-    st.metric("On-Chain", len([s for s in analysis['all_signals']['onchain'] if '🟢' in s]) - len([s for s in analysis['all_signals']['onchain'] if '🔴' in s]))
+    st.metric("On-Chain", analysis['onchain_score'] + analysis['liquidation_score'])
 with col5:
+    st.metric("Order Book", f"{analysis['depth_score']:+d}")
+with col6:
     st.metric("Total Score", f"{analysis['total_score']:.1f}")
 
 # Footer
 st.divider()
-st.write(f"**Last Update:** {datetime.now().strftime('%H:%M:%S')} | **Coin:** {selected_coin} | **Price:** ${coin_data['price']:,.4f}")
+st.write(f"**Last Update:** {datetime.now().strftime('%H:%M:%S')} | **Coin:** {selected_coin} | **Price:** ${coin_data['price']:,.4f} | **Source:** {'Collector' if stored_coin_data else 'Live API'}{' + WebSocket' if streamed else ''}")
 
 # Sidebar
 with st.sidebar:
@@ -440,14 +417,21 @@ with st.sidebar:
     st.write("• Market sentiment")
     
     st.write("**Whale Analysis:**")
-    st.write("• Large transactions")
-    st.write("• Exchange flows")
+    st.write("• Large aggTrades (buy vs sell, 5m)")
+    st.write("• Whale flow imbalance")
     
     st.write("**On-Chain Analysis:**")
     st.write("• Network metrics")
     st.write("• Open interest")
+    st.write("• Liquidation cascades (5m vs 1h avg)")
+    
+    st.write("**Order Book:**")
+    st.write("• Top-10 bid/ask imbalance")
+    st.write("• Spread & liquidity ±1%")
     
     st.markdown("### ⚠️ Risk Management")
     st.write("• Always use stop loss")
     st.write("• Risk max 2% per trade")
-    st.write("• Follow R:R ratio 1:2")
\ No newline at end of file
+    st.write("• Follow R:R ratio 1:2")
+
+finish_run(render_started)
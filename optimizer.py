@@ -0,0 +1,163 @@
+"""
+Parameter sweep threshold sinyal lewat backtest, paralel di process pool.
+
+Setiap worker memuat fixture dan menghitung snapshot 24h sekali saja, lalu
+hanya scoring + simulasi trade yang diulang per kombinasi threshold.
+
+    python optimizer.py fixtures/*.csv --scorer entry --random 500 --workers 8
+"""
+import argparse
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backtest import (load_fixture, rolling_snapshot, simulate_trades, summarize,
+                      DEFAULT_WINDOW, DEFAULT_ENTRY_TIMEOUT, DEFAULT_MAX_HOLD, DEFAULT_FEE)
+from signal_engine import score_batch, signal_score_batch, entry_levels
+from strategy import DEFAULT_THRESHOLDS, resolve_thresholds
+
+# Ruang pencarian default untuk setiap threshold
+DEFAULT_GRID = {
+    'funding_high': [0.03, 0.05, 0.1, 0.15],
+    'funding_low': [-0.1, -0.05, -0.02, 0.0],
+    'fear_low': [15, 20, 25, 30, 35],
+    'greed_high': [65, 70, 75, 80, 85],
+    'volume_high': [250000, 500000, 1000000, 2000000],
+    'strong_score': [2.5, 3, 3.5],
+    'score': [1, 1.5, 2]
+}
+
+# Threshold yang dipakai calculate_signal_score
+SIGNAL_SCORE_KEYS = ('funding_high', 'funding_low', 'fear_low', 'greed_high')
+
+_worker = {}
+
+
+def _init_worker(paths, window, simulation):
+    """Muat fixture dan snapshot 24h sekali per worker"""
+    _worker['coins'] = []
+    for path in paths:
+        bars = load_fixture(path)
+        _worker['coins'].append((bars, rolling_snapshot(bars, window)))
+    _worker['window'] = window
+    _worker['simulation'] = simulation
+
+
+def _score(scorer, bars, snapshot, thresholds):
+    if scorer == 'entry':
+        return score_batch(fear_greed=bars['fear_greed'], thresholds=thresholds, **snapshot)
+
+    # calculate_signal_score: hanya funding + Fear & Greed, level entry sama
+    signal = signal_score_batch(snapshot['funding_rate'], bars['fear_greed'], thresholds)
+    entry_price, stop_loss, take_profit = entry_levels(snapshot['price'], signal)
+    return {'signal': signal, 'total_score': signal, 'entry_price': entry_price,
+            'stop_loss': stop_loss, 'take_profit': take_profit}
+
+
+def evaluate(params, scorer='entry'):
+    """Backtest satu kombinasi threshold di semua coin (dijalankan di worker)"""
+    thresholds = resolve_thresholds(params)
+    trades = []
+    for bars, snapshot in _worker['coins']:
+        scores = _score(scorer, bars, snapshot, thresholds)
+        trades.extend(simulate_trades(bars, scores, window=_worker['window'], **_worker['simulation']))
+    return params, summarize(trades)
+
+
+def _evaluate_entry(params):
+    return evaluate(params, 'entry')
+
+
+def _evaluate_signal_score(params):
+    return evaluate(params, 'signal_score')
+
+
+def grid_combinations(grid):
+    """Semua kombinasi dari grid {nama: [nilai]}"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def random_combinations(grid, count, seed=None):
+    """Sampel acak kombinasi dari grid (tanpa duplikat)"""
+    rng = random.Random(seed)
+    total = int(np.prod([len(values) for values in grid.values()]))
+    count = min(count, total)
+    seen = set()
+    combinations = []
+    while len(combinations) < count:
+        params = {key: rng.choice(values) for key, values in grid.items()}
+        key = tuple(params.values())
+        if key not in seen:
+            seen.add(key)
+            combinations.append(params)
+    return combinations
+
+
+def _is_valid(params):
+    # Threshold harus konsisten: batas atas > batas bawah, strong >= biasa
+    merged = resolve_thresholds(params)
+    return (merged['funding_high'] > merged['funding_low']
+            and merged['greed_high'] > merged['fear_low']
+            and merged['strong_score'] >= merged['score'])
+
+
+def optimize(paths, combinations, scorer='entry', objective='total_return', min_trades=10,
+             workers=None, window=DEFAULT_WINDOW, **simulation):
+    """
+    Jalankan backtest untuk semua kombinasi di process pool.
+
+    Return list (params, summary) terurut dari objective terbaik. Kombinasi
+    dengan trade kurang dari min_trades ditaruh di belakang.
+    """
+    simulation = {
+        'entry_timeout': simulation.get('entry_timeout', DEFAULT_ENTRY_TIMEOUT),
+        'max_hold': simulation.get('max_hold', DEFAULT_MAX_HOLD),
+        'fee': simulation.get('fee', DEFAULT_FEE)
+    }
+    combinations = [params for params in combinations if _is_valid(params)]
+    workers = workers or os.cpu_count()
+    task = _evaluate_entry if scorer == 'entry' else _evaluate_signal_score
+
+    # Chunk besar supaya overhead IPC kecil dibanding waktu backtest
+    chunksize = max(1, len(combinations) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(list(paths), window, simulation)) as executor:
+        results = list(executor.map(task, combinations, chunksize=chunksize))
+
+    results.sort(key=lambda item: (item[1]['trades'] >= min_trades, item[1][objective]), reverse=True)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep threshold sinyal lewat backtest paralel")
+    parser.add_argument("paths", nargs="+", help="File fixture CSV/Parquet, satu per coin")
+    parser.add_argument("--scorer", choices=['entry', 'signal_score'], default='entry',
+                        help="entry = calculate_entry_signal, signal_score = DataFetcher.calculate_signal_score")
+    parser.add_argument("--random", type=int, default=0, help="Jumlah sampel random search (0 = full grid)")
+    parser.add_argument("--objective", default='total_return',
+                        choices=['total_return', 'profit_factor', 'win_rate', 'avg_pnl'])
+    parser.add_argument("--min-trades", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.scorer == 'signal_score':
+        grid = {key: values for key, values in DEFAULT_GRID.items() if key in SIGNAL_SCORE_KEYS}
+    combinations = random_combinations(grid, args.random, args.seed) if args.random else grid_combinations(grid)
+
+    started = time.time()
+    results = optimize(args.paths, combinations, scorer=args.scorer, objective=args.objective,
+                       min_trades=args.min_trades, workers=args.workers, window=args.window)
+    print(f"{len(results)} kombinasi dalam {time.time() - started:.1f}s")
+    print(f"Default: {DEFAULT_THRESHOLDS}")
+    for rank, (params, summary) in enumerate(results[:args.top], 1):
+        print(f"#{rank} {args.objective}={summary[args.objective]:.4f} trades={summary['trades']} "
+              f"win={summary['win_rate']:.1%} DD={summary['max_drawdown']:.2%} | {params}")
@@ -0,0 +1,325 @@
+"""
+Order book lokal dari snapshot REST + diff-depth stream Binance Futures.
+
+Prosedur sinkronisasi (dokumentasi Binance "How to manage a local order book"):
+1. Subscribe <symbol>@depth@100ms, event disimpan di buffer.
+2. Ambil snapshot /fapi/v1/depth, catat lastUpdateId.
+3. Buang event dengan u < lastUpdateId; event pertama harus U <= lastUpdateId + 1
+   dan u >= lastUpdateId (snapshot bisa jatuh tepat di batas dua event).
+4. Setiap event berikutnya harus punya pu == u event sebelumnya. Kalau tidak,
+   ada event yang hilang: book dianggap tidak sinkron dan snapshot diambil ulang.
+
+Setiap sisi disimpan sebagai dict harga -> qty plus list harga terurut (bisect),
+jadi update level O(log n) + memmove kecil, top-N dan likuiditas dalam X% dari
+mid cukup slice / bisect tanpa sort ulang.
+
+    python orderbook.py                                        # Binance asli
+    python orderbook.py --replay diffs.jsonl --port 8767       # stand-in lokal
+    python orderbook.py --url ws://localhost:8767/stream
+"""
+import argparse
+import asyncio
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+import http_client
+from fast_json import loads
+from instrumentation import get_metrics
+from market_data import SUPPORTED_COINS
+from stream_ingest import BINANCE_FSTREAM_URL, STREAM_MAX_AGE, MarketStream, serve_replay, websockets
+
+DEPTH_URL = "https://fapi.binance.com/fapi/v1/depth"
+SNAPSHOT_LIMIT = 1000     # weight 20 per snapshot
+DEPTH_SPEED = "100ms"
+TOP_LEVELS = 10           # level per sisi untuk imbalance
+LIQUIDITY_BANDS = (0.5, 1.0, 2.0)  # % dari mid
+MAX_BUFFER = 1000         # event yang ditahan selama menunggu snapshot
+RESYNC_DELAY = 1          # detik sebelum snapshot ulang setelah gagal
+
+
+class BookSide:
+    """Satu sisi book: dict harga -> qty + list key terurut (bid disimpan negatif, best selalu di index 0)"""
+
+    __slots__ = ('levels', 'keys', 'sign')
+
+    def __init__(self, is_bid):
+        self.levels = {}
+        self.keys = []
+        self.sign = -1.0 if is_bid else 1.0
+
+    def clear(self):
+        self.levels.clear()
+        self.keys.clear()
+
+    def set(self, price, qty):
+        """Set qty level, qty 0 menghapus level"""
+        levels = self.levels
+        if qty == 0:
+            if price in levels:
+                del levels[price]
+                key = price * self.sign
+                del self.keys[bisect_left(self.keys, key)]
+        else:
+            if price not in levels:
+                insort(self.keys, price * self.sign)
+            levels[price] = qty
+
+    def load(self, rows):
+        """Isi ulang dari list [price, qty] (string) snapshot"""
+        self.levels = {float(price): float(qty) for price, qty in rows if float(qty)}
+        self.keys = sorted(price * self.sign for price in self.levels)
+
+    def best(self):
+        return self.keys[0] * self.sign if self.keys else None
+
+    def top(self, n):
+        """[(price, qty)] n level terbaik"""
+        sign = self.sign
+        levels = self.levels
+        return [(key * sign, levels[key * sign]) for key in self.keys[:n]]
+
+    def notional_within(self, limit_prices):
+        """Notional kumulatif dari best sampai tiap limit_price (inklusif), satu pass untuk semua band"""
+        sign = self.sign
+        levels = self.levels
+        keys = self.keys
+        ends = [bisect_right(keys, limit * sign) for limit in limit_prices]
+        totals = []
+        total = 0.0
+        position = 0
+        for end in ends:
+            for key in keys[position:end]:
+                price = key * sign
+                total += price * levels[price]
+            position = max(position, end)
+            totals.append(total)
+        return totals
+
+    def __len__(self):
+        return len(self.levels)
+
+
+class OrderBook:
+    """Book lokal satu symbol dengan penanganan sequence gap"""
+
+    def __init__(self, symbol, top_levels=TOP_LEVELS, max_buffer=MAX_BUFFER):
+        self.symbol = symbol
+        self.top_levels = top_levels
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = None
+        self.synced = False
+        self.buffer = deque(maxlen=max_buffer)
+        self.updates = 0
+        self.gaps = 0
+        self.resyncs = 0
+        self.updated_at = 0.0
+        self._first_event = False
+        self._lock = threading.Lock()
+
+    def load_snapshot(self, snapshot):
+        """Pasang snapshot REST lalu terapkan event buffer yang masih berlaku"""
+        with self._lock:
+            self.bids.load(snapshot['bids'])
+            self.asks.load(snapshot['asks'])
+            self.last_update_id = snapshot['lastUpdateId']
+            self.synced = True
+            self._first_event = True
+            self.resyncs += 1
+            self.updated_at = time.time()
+            buffered = list(self.buffer)
+            self.buffer.clear()
+            for event in buffered:
+                if not self._apply(event):
+                    break
+
+    def apply_diff(self, event):
+        """Terapkan satu event depthUpdate; False kalau book perlu snapshot ulang"""
+        with self._lock:
+            if not self.synced:
+                self.buffer.append(event)
+                return False
+            return self._apply(event)
+
+    def _apply(self, event):
+        final_id = event['u']
+        if final_id < self.last_update_id or (final_id == self.last_update_id and not self._first_event):
+            return True  # sudah tercakup snapshot / event duplikat
+        if self._first_event:
+            valid = event['U'] <= self.last_update_id + 1 and final_id >= self.last_update_id
+        else:
+            valid = event['pu'] == self.last_update_id
+        if not valid:
+            # Event hilang: tahan event ini untuk snapshot berikutnya
+            self.gaps += 1
+            self.synced = False
+            self.buffer.clear()
+            self.buffer.append(event)
+            return False
+
+        bids = self.bids
+        for price, qty in event['b']:
+            bids.set(float(price), float(qty))
+        asks = self.asks
+        for price, qty in event['a']:
+            asks.set(float(price), float(qty))
+        self.last_update_id = final_id
+        self._first_event = False
+        self.updates += 1
+        self.updated_at = time.time()
+        return True
+
+    def metrics(self, levels=None, bands=LIQUIDITY_BANDS):
+        """
+        Spread, imbalance top-N dan likuiditas dalam X% dari mid, None kalau book kosong.
+        imbalance = (qty bid - qty ask) / (qty bid + qty ask) pada N level teratas.
+        """
+        levels = levels or self.top_levels
+        with self._lock:
+            best_bid = self.bids.best()
+            best_ask = self.asks.best()
+            if best_bid is None or best_ask is None:
+                return None
+            mid = (best_bid + best_ask) / 2
+            bid_qty = sum(qty for _, qty in self.bids.top(levels))
+            ask_qty = sum(qty for _, qty in self.asks.top(levels))
+            result = {
+                'best_bid': best_bid,
+                'best_ask': best_ask,
+                'mid': mid,
+                'spread': best_ask - best_bid,
+                'spread_bps': (best_ask - best_bid) / mid * 10000,
+                'imbalance': (bid_qty - ask_qty) / (bid_qty + ask_qty) if bid_qty + ask_qty else 0.0,
+                'levels': (len(self.bids), len(self.asks))
+            }
+            bands = sorted(bands)
+            bid_notionals = self.bids.notional_within([mid * (1 - band / 100) for band in bands])
+            ask_notionals = self.asks.notional_within([mid * (1 + band / 100) for band in bands])
+            for band, bid_notional, ask_notional in zip(bands, bid_notionals, ask_notionals):
+                result[f'bid_liquidity_{band:g}'] = bid_notional
+                result[f'ask_liquidity_{band:g}'] = ask_notional
+                total = bid_notional + ask_notional
+                result[f'liquidity_imbalance_{band:g}'] = (bid_notional - ask_notional) / total if total else 0.0
+        return result
+
+
+def fetch_depth_snapshot(symbol, limit=SNAPSHOT_LIMIT):
+    """Snapshot REST /fapi/v1/depth"""
+    response = http_client.get(DEPTH_URL, params={'symbol': symbol, 'limit': limit}, timeout=10)
+    response.raise_for_status()
+    return loads(response.content)
+
+
+class DepthStream(MarketStream):
+    """Diff-depth stream semua symbol; snapshot diambil di background saat book belum / tidak lagi sinkron"""
+
+    def __init__(self, symbols=None, url=BINANCE_FSTREAM_URL, speed=DEPTH_SPEED,
+                 snapshot_fetcher=fetch_depth_snapshot, **kwargs):
+        symbols = list(symbols or SUPPORTED_COINS.values())
+        super().__init__(url=url, streams=tuple(f"{symbol.lower()}@depth@{speed}" for symbol in symbols), **kwargs)
+        self.books = {symbol: OrderBook(symbol) for symbol in symbols}
+        self.snapshot_fetcher = snapshot_fetcher
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+    def handle_message(self, raw):
+        message = loads(raw)
+        event = message.get('data', message)
+        if event.get('e') == 'depthUpdate':
+            book = self.books.get(event['s'])
+            if book is not None and not book.apply_diff(event):
+                self._request_snapshot(book)
+        self.messages += 1
+
+    def _request_snapshot(self, book):
+        with self._pending_lock:
+            if book.symbol in self._pending:
+                return
+            self._pending.add(book.symbol)
+        threading.Thread(target=self._load_snapshot, args=(book,), name=f"depth-snapshot-{book.symbol}",
+                         daemon=True).start()
+
+    def _load_snapshot(self, book):
+        if book.synced:
+            # Snapshot sebelumnya sudah selesai dan ikut menerapkan event yang memicu request ini
+            with self._pending_lock:
+                self._pending.discard(book.symbol)
+            return
+        started = time.perf_counter()
+        try:
+            book.load_snapshot(self.snapshot_fetcher(book.symbol))
+            get_metrics().record("orderbook.snapshot", time.perf_counter() - started)
+        except Exception:
+            get_metrics().record("orderbook.snapshot", time.perf_counter() - started, error=True)
+            time.sleep(RESYNC_DELAY)
+        finally:
+            with self._pending_lock:
+                self._pending.discard(book.symbol)
+
+    def metrics(self, symbol, max_age=STREAM_MAX_AGE):
+        """Metrik book symbol, None kalau belum sinkron atau update terakhir terlalu lama"""
+        book = self.books.get(symbol)
+        if book is None or not book.synced or time.time() - book.updated_at > max_age:
+            return None
+        return book.metrics()
+
+    def imbalances(self, symbols, max_age=STREAM_MAX_AGE):
+        """Imbalance top-N per symbol (NaN kalau tidak ada book), sejajar dengan symbols"""
+        result = []
+        for symbol in symbols:
+            metrics = self.metrics(symbol, max_age)
+            result.append(metrics['imbalance'] if metrics else float('nan'))
+        return result
+
+    def status(self):
+        """Status sinkronisasi per book untuk panel diagnostics"""
+        return [
+            {'Symbol': symbol, 'Synced': book.synced, 'Updates': book.updates, 'Gaps': book.gaps,
+             'Snapshots': book.resyncs, 'Levels': f"{len(book.bids)}/{len(book.asks)}"}
+            for symbol, book in self.books.items()
+        ]
+
+
+_depth_stream = None
+
+
+def get_depth_stream():
+    """Stream depth bersama untuk satu proses, otomatis start (None kalau websockets tidak ada)"""
+    global _depth_stream
+    if websockets is None:
+        return None
+    if _depth_stream is None:
+        _depth_stream = DepthStream()
+        _depth_stream.start()
+    return _depth_stream
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Order book lokal Binance Futures")
+    parser.add_argument("--url", default=BINANCE_FSTREAM_URL, help="URL combined stream")
+    parser.add_argument("--replay", help="File .jsonl berisi frame depthUpdate rekaman untuk stand-in lokal")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--interval", type=float, default=0.1, help="Jeda antar frame replay (detik)")
+    args = parser.parse_args()
+
+    try:
+        if args.replay:
+            with open(args.replay) as f:
+                frames = [line.strip() for line in f if line.strip()]
+            print(f"Replaying {len(frames)} frames on ws://localhost:{args.port}/stream")
+            asyncio.run(serve_replay(frames, port=args.port, interval=args.interval))
+        else:
+            stream = DepthStream(url=args.url)
+            stream.start()
+            while True:
+                time.sleep(5)
+                print(f"connected={stream.connected} messages={stream.messages} reconnects={stream.reconnects}")
+                for symbol in list(stream.books)[:3]:
+                    metrics = stream.metrics(symbol)
+                    if metrics:
+                        print(f"  {symbol} spread {metrics['spread_bps']:.2f} bps imbalance {metrics['imbalance']:+.2f} "
+                              f"bid 1% ${metrics['bid_liquidity_1']:,.0f} ask 1% ${metrics['ask_liquidity_1']:,.0f}")
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,190 @@
+"""
+Rate limiter sisi client untuk request weight Binance.
+
+Token bucket per host yang tahu weight setiap endpoint, sinkron dengan header
+X-MBX-USED-WEIGHT-1M dari Binance, dan berhenti total saat menerima 429/418
+sampai Retry-After lewat. Request yang melebihi budget diantrikan (menunggu
+token) sampai max_wait, setelah itu gagal dengan RateLimitExceeded.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Limit weight per menit per IP, dipakai dengan margin aman
+HOST_LIMITS = {
+    'fapi.binance.com': 2400,
+    'api.binance.com': 6000
+}
+SAFETY_FACTOR = float(os.environ.get("BINANCE_WEIGHT_SAFETY", 0.8))
+MAX_WAIT = float(os.environ.get("BINANCE_WEIGHT_MAX_WAIT", 5))  # detik menunggu token sebelum menyerah
+
+
+class RateLimitExceeded(Exception):
+    """Budget weight habis (atau host sedang di-ban) lebih lama dari max_wait"""
+
+
+def _klines_weight(params):
+    limit = int(params.get('limit', 500))
+    if limit < 100:
+        return 1
+    elif limit < 500:
+        return 2
+    elif limit <= 1000:
+        return 5
+    return 10
+
+
+def _depth_weight(params):
+    limit = int(params.get('limit', 500))
+    if limit <= 50:
+        return 2
+    elif limit <= 100:
+        return 5
+    elif limit <= 500:
+        return 10
+    return 20
+
+
+def _spot_ticker_weight(params):
+    if 'symbol' in params:
+        return 2
+    if 'symbols' in params:
+        count = params['symbols'].count(',') + 1
+        return 2 if count <= 20 else 40 if count <= 100 else 80
+    return 80
+
+
+def endpoint_weight(url, params=None):
+    """Weight request Binance berdasarkan path dan parameter"""
+    parts = urlsplit(url)
+    params = dict(params or {})
+    # Parameter yang ditulis langsung di URL juga dihitung
+    for pair in filter(None, parts.query.split('&')):
+        key, _, value = pair.partition('=')
+        params.setdefault(key, value)
+    path = parts.path
+
+    if path == '/fapi/v1/premiumIndex':
+        return 1 if 'symbol' in params else 10
+    if path == '/fapi/v1/openInterest':
+        return 1
+    if path == '/fapi/v1/klines':
+        return _klines_weight(params)
+    if path == '/fapi/v1/depth':
+        return _depth_weight(params)
+    if path == '/fapi/v1/ticker/24hr':
+        return 1 if 'symbol' in params else 40
+    if path == '/fapi/v1/aggTrades':
+        return 20
+    if path == '/api/v3/ticker/24hr':
+        return _spot_ticker_weight(params)
+    return 1
+
+
+class WeightBucket:
+    """Token bucket weight per menit untuk satu host"""
+
+    def __init__(self, limit_per_minute, safety_factor=SAFETY_FACTOR):
+        self.limit = limit_per_minute
+        self.capacity = limit_per_minute * safety_factor
+        self.refill_rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.server_used_weight = None
+        self.throttled = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def acquire(self, weight, max_wait=MAX_WAIT):
+        """Ambil token sebanyak weight, tunggu kalau perlu (raise RateLimitExceeded kalau kelamaan)"""
+        deadline = time.monotonic() + max_wait
+        waited = False
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= weight:
+                    self.tokens -= weight
+                    if waited:
+                        self.throttled += 1
+                    return
+                if now >= self.blocked_until:
+                    wait = (weight - self.tokens) / self.refill_rate
+                else:
+                    wait = self.blocked_until - now
+                if now + wait > deadline:
+                    self.rejected += 1
+                    raise RateLimitExceeded(f"Weight budget habis, perlu menunggu {wait:.1f}s")
+                waited = True
+                self._cond.wait(wait)
+
+    def observe(self, status_code, headers):
+        """Sinkronkan dengan header weight dan status 429/418 dari Binance"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('x-mbx-used-weight-1m')
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if used is not None:
+                self.server_used_weight = int(used)
+                # Server lebih tahu: jangan pernah punya token lebih dari sisa budget server
+                self.tokens = min(self.tokens, self.capacity - int(used))
+            if status_code in (418, 429):
+                retry_after = headers.get('Retry-After')
+                self.blocked_until = now + (float(retry_after) if retry_after else 60)
+                self.tokens = 0
+            self._cond.notify_all()
+
+    def budget(self):
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                'limit': self.limit,
+                'capacity': self.capacity,
+                'remaining': self.tokens,
+                'server_used_weight': self.server_used_weight,
+                'blocked_for': max(0.0, self.blocked_until - now),
+                'throttled': self.throttled,
+                'rejected': self.rejected
+            }
+
+
+class RateLimiter:
+    """Kumpulan bucket per host, hanya host yang terdaftar yang dibatasi"""
+
+    def __init__(self, host_limits=HOST_LIMITS, safety_factor=SAFETY_FACTOR):
+        self.safety_factor = safety_factor
+        self.buckets = {host: WeightBucket(limit, safety_factor) for host, limit in host_limits.items()}
+
+    def register_host(self, host, limit_per_minute):
+        self.buckets[host] = WeightBucket(limit_per_minute, self.safety_factor)
+
+    def _bucket(self, url):
+        return self.buckets.get(urlsplit(url).netloc)
+
+    def acquire(self, url, params=None, max_wait=MAX_WAIT):
+        bucket = self._bucket(url)
+        if bucket is not None:
+            bucket.acquire(endpoint_weight(url, params), max_wait)
+
+    def observe(self, url, response):
+        bucket = self._bucket(url)
+        if bucket is not None:
+            bucket.observe(response.status_code, response.headers)
+
+    def budget(self):
+        """Budget weight saat ini per host"""
+        return {host: bucket.budget() for host, bucket in self.buckets.items()}
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter():
+    return _rate_limiter
@@ -0,0 +1,11 @@
+@echo off
+echo Starting Market Data Collector...
+echo.
+echo Installing requirements...
+pip install -r requirements.txt
+echo.
+echo Collector writes snapshots to data\market.db every 30 seconds
+echo Dashboards read from the same store while the collector is running
+echo.
+python collector.py --interval 30
+pause
\ No newline at end of file
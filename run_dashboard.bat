@@ -2,7 +2,7 @@
 echo Starting Trading Future Dashboard...
 echo.
 echo Installing requirements...
-pip install streamlit requests plotly
+pip install -r requirements.txt
 echo.
 echo Starting Streamlit dashboard...
 echo Dashboard will open at: http://localhost:8501
@@ -2,7 +2,7 @@
 echo Starting Multi-Coin Trading Dashboard...
 echo.
 echo Installing requirements...
-pip install streamlit requests plotly
+pip install -r requirements.txt
 echo.
 echo Starting Multi-Coin Dashboard...
 echo Dashboard will open at: http://localhost:8501
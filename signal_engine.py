@@ -0,0 +1,191 @@
+import numpy as np
+
+from instrumentation import instrument
+from market_snapshot import MarketSnapshot
+from strategy import resolve_thresholds
+
+# Kode kelas sinyal, urutan sama dengan if/elif di calculate_entry_signal
+STRONG_LONG, LONG, NO_TRADE, SHORT, STRONG_SHORT = 2, 1, 0, -1, -2
+
+SIGNAL_NAMES = {
+    STRONG_LONG: "STRONG LONG",
+    LONG: "LONG",
+    NO_TRADE: "NO TRADE",
+    SHORT: "SHORT",
+    STRONG_SHORT: "STRONG SHORT"
+}
+SIGNAL_COLORS = {
+    STRONG_LONG: "bullish", LONG: "bullish", NO_TRADE: "neutral",
+    SHORT: "bearish", STRONG_SHORT: "bearish"
+}
+SIGNAL_CONFIDENCE = {
+    STRONG_LONG: "High", LONG: "Medium", NO_TRADE: "Low",
+    SHORT: "Medium", STRONG_SHORT: "High"
+}
+
+COLUMNS = ('price', 'high_24h', 'low_24h', 'change_24h', 'volume', 'funding_rate')
+
+
+def columns_from_coin_data(all_coin_data):
+    """Ubah dict {coin: coin_data} jadi (coins, dict kolom numpy)"""
+    snapshot = MarketSnapshot.from_coin_data(all_coin_data)
+    return snapshot.symbols, _snapshot_columns(snapshot)
+
+
+def _snapshot_columns(snapshot):
+    # Array snapshot langsung dipakai, tidak dicopy
+    columns = {name: snapshot.columns[name] for name in COLUMNS}
+    columns['degraded'] = snapshot.degraded
+    if 'rsi' in snapshot.columns:
+        columns['rsi'] = snapshot.columns['rsi']
+    for name in ('depth_imbalance', 'liquidation_cascade'):
+        if name in snapshot.columns:
+            columns[name] = snapshot.columns[name]
+    return columns
+
+
+def entry_levels(price, signal):
+    """Level entry, stop loss dan take profit per kode sinyal (sama dengan calculate_entry_signal)"""
+    price = np.asarray(price, dtype=np.float64)
+    is_long = signal > 0
+    is_short = signal < 0
+    entry_price = np.select([is_long, is_short], [price * 0.995, price * 1.005], default=price)
+    stop_loss = np.select([is_long, is_short], [price * 0.97, price * 1.03], default=0.0)
+    take_profit = np.select([is_long, is_short], [price * 1.06, price * 0.94], default=0.0)
+    return entry_price, stop_loss, take_profit
+
+
+def score_batch(price, high_24h, low_24h, change_24h, volume, funding_rate, fear_greed, whale_score=0, rsi=None,
+                thresholds=None, degraded=False, depth_imbalance=None, liquidation_cascade=None):
+    """
+    Versi vectorized dari calculate_entry_signal untuk banyak symbol sekaligus.
+
+    Semua input berupa array dengan panjang sama (fear_greed dan whale_score boleh
+    scalar). rsi opsional: RSI asli dari klines, NaN berarti pakai RSI simulasi.
+    whale_score default 0 (tanpa data aggTrade whale tidak menyumbang skor).
+    degraded (bool / array bool) memaksa NO TRADE seperti di jalur scalar.
+    depth_imbalance opsional: imbalance order book per symbol, NaN = tidak ada book.
+    liquidation_cascade opsional: cascade factor bertanda per symbol, NaN = tidak ada data.
+    Hasil identik dengan jalur scalar di strategy.py.
+    """
+    thresholds = resolve_thresholds(thresholds)
+    price = np.asarray(price, dtype=np.float64)
+    high_24h = np.asarray(high_24h, dtype=np.float64)
+    low_24h = np.asarray(low_24h, dtype=np.float64)
+    change_24h = np.asarray(change_24h, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    funding_rate = np.asarray(funding_rate, dtype=np.float64)
+    fear_greed = np.broadcast_to(np.asarray(fear_greed, dtype=np.float64), price.shape)
+    whale_score = np.broadcast_to(np.asarray(whale_score, dtype=np.float64), price.shape)
+
+    # 1. Technical: RSI asli kalau ada, selain itu simulasi dari posisi harga dalam range 24h
+    price_range = high_24h - low_24h
+    flat = price_range == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_position = np.where(flat, 0.5, (price - low_24h) / np.where(flat, 1.0, price_range))
+    simulated_rsi = price_position * 100
+    if rsi is None:
+        rsi = simulated_rsi
+    else:
+        rsi = np.asarray(rsi, dtype=np.float64)
+        rsi = np.where(np.isnan(rsi), simulated_rsi, rsi)
+
+    tech_score = (
+        np.where(rsi < 30, 1.0, np.where(rsi > 70, -1.0, 0.0))
+        + np.where(change_24h > 5, 1.0, np.where(change_24h < -5, -1.0, 0.0))
+    )
+
+    # 2. Fundamental
+    fund_score = (
+        np.where(funding_rate > thresholds['funding_high'], -1.0,
+                 np.where(funding_rate < thresholds['funding_low'], 1.0, 0.0))
+        + np.where(volume > thresholds['volume_high'], 0.5, 0.0)
+        + np.where(fear_greed < thresholds['fear_low'], 1.0,
+                   np.where(fear_greed > thresholds['greed_high'], -1.0, 0.0))
+    )
+
+    # 4. On-chain (funding rate focus)
+    onchain_score = np.where(funding_rate < -0.02, 1.0, np.where(funding_rate > 0.05, -1.0, 0.0))
+
+    # 5. Order book depth
+    if depth_imbalance is None:
+        depth_score = np.zeros(price.shape)
+    else:
+        depth_imbalance = np.asarray(depth_imbalance, dtype=np.float64)
+        depth_score = np.where(depth_imbalance >= thresholds['depth_imbalance'], 1.0,
+                               np.where(depth_imbalance <= -thresholds['depth_imbalance'], -1.0, 0.0))
+
+    # 6. Liquidation cascade
+    if liquidation_cascade is None:
+        liquidation_score = np.zeros(price.shape)
+    else:
+        liquidation_cascade = np.asarray(liquidation_cascade, dtype=np.float64)
+        liquidation_score = np.where(liquidation_cascade >= thresholds['liquidation_cascade'], 1.0,
+                                     np.where(liquidation_cascade <= -thresholds['liquidation_cascade'], -1.0, 0.0))
+
+    total_score = tech_score + fund_score + whale_score + onchain_score + depth_score + liquidation_score
+
+    signal = np.select(
+        [total_score >= thresholds['strong_score'], total_score >= thresholds['score'],
+         total_score <= -thresholds['strong_score'], total_score <= -thresholds['score']],
+        [STRONG_LONG, LONG, STRONG_SHORT, SHORT],
+        default=NO_TRADE
+    ).astype(np.int8)
+    signal[np.broadcast_to(np.asarray(degraded, dtype=bool), price.shape)] = NO_TRADE
+
+    entry_price, stop_loss, take_profit = entry_levels(price, signal)
+
+    return {
+        'signal': signal,
+        'total_score': total_score,
+        'entry_price': entry_price,
+        'stop_loss': stop_loss,
+        'take_profit': take_profit,
+        'rsi': rsi,
+        'tech_score': tech_score,
+        'fund_score': fund_score,
+        'whale_score': np.array(whale_score),
+        'onchain_score': onchain_score,
+        'depth_score': depth_score,
+        'liquidation_score': liquidation_score
+    }
+
+
+def signal_score_batch(funding_rate, fear_greed, thresholds=None):
+    """Versi vectorized dari DataFetcher.calculate_signal_score (funding BTC per bar)"""
+    thresholds = resolve_thresholds(thresholds)
+    funding_rate = np.asarray(funding_rate, dtype=np.float64)
+    fear_greed = np.broadcast_to(np.asarray(fear_greed, dtype=np.float64), funding_rate.shape)
+
+    score = (
+        np.where(funding_rate > thresholds['funding_high'], -1,
+                 np.where(funding_rate < thresholds['funding_low'], 1, 0))
+        + np.where(fear_greed < thresholds['fear_low'], 1,
+                   np.where(fear_greed > thresholds['greed_high'], -1, 0))
+    ).astype(np.int8)
+    # Skor -2..2 langsung sama dengan kode sinyal (STRONG SHORT..STRONG LONG)
+    return score
+
+
+@instrument("score.batch")
+def score_snapshot(snapshot, fear_greed, whale_score=None, thresholds=None):
+    """
+    Skor semua baris MarketSnapshot dengan dict Fear & Greed, hasil sejajar dengan snapshot.symbols.
+    Tanpa whale_score dipakai kolom 'whale_score' snapshot kalau ada (NaN = 0).
+    """
+    columns = _snapshot_columns(snapshot)
+    if whale_score is None:
+        whale_score = np.nan_to_num(snapshot.columns['whale_score']) if 'whale_score' in snapshot.columns else 0
+    columns['degraded'] = columns['degraded'] | bool(fear_greed.get('degraded'))
+    return score_batch(fear_greed=fear_greed['value'], whale_score=whale_score, thresholds=thresholds, **columns)
+
+
+def score_coin_data(all_coin_data, fear_greed, whale_score=None, thresholds=None):
+    """Skor dict {coin: coin_data} sekaligus dengan dict Fear & Greed, return (coins, hasil score_batch)"""
+    snapshot = MarketSnapshot.from_coin_data(all_coin_data)
+    return snapshot.symbols, score_snapshot(snapshot, fear_greed, whale_score, thresholds)
+
+
+def signal_names(signal):
+    """Array kode sinyal -> list nama sinyal"""
+    return [SIGNAL_NAMES[int(code)] for code in signal]
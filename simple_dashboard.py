@@ -1,7 +1,13 @@
 import streamlit as st
-import requests
 from datetime import datetime
 import time
+import numpy as np
+from binance_cache import get_premium_index_cache
+from market_data import get_fear_greed, get_open_interest
+from swr_cache import serve
+from instrumentation import timed, diagnostics_panel, export
+from live_refresh import LIVE_REFRESH_SECONDS, is_fragment_rerun, live_fragment, live_interval
+from whale_stream import get_whale_tracker
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -20,41 +26,30 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def _fetch_binance_data():
+    # Funding Rate
+    premium_index = get_premium_index_cache()
+    btc_funding = premium_index.get('BTCUSDT')
+    eth_funding = premium_index.get('ETHUSDT')
+    
+    # Open Interest (NaN kalau gagal)
+    oi_btc = get_open_interest('BTCUSDT')
+    oi_eth = get_open_interest('ETHUSDT')
+    
+    # Record yang tidak ada = NaN + degraded, bukan 0
+    data = {
+        'btc_funding': float(btc_funding['lastFundingRate']) * 100 if btc_funding else np.nan,
+        'eth_funding': float(eth_funding['lastFundingRate']) * 100 if eth_funding else np.nan,
+        'btc_oi': oi_btc,
+        'eth_oi': oi_eth
+    }
+    data['degraded'] = bool(np.isnan(list(data.values())).any())
+    return data
+
 def get_binance_data():
-    """Ambil data dari Binance API"""
-    try:
-        # Funding Rate
-        funding_url = "https://fapi.binance.com/fapi/v1/premiumIndex"
-        funding_response = requests.get(funding_url, timeout=10)
-        funding_data = funding_response.json()
-        
-        btc_funding = next((item for item in funding_data if item['symbol'] == 'BTCUSDT'), None)
-        eth_funding = next((item for item in funding_data if item['symbol'] == 'ETHUSDT'), None)
-        
-        # Open Interest
-        oi_btc = requests.get("https://fapi.binance.com/fapi/v1/openInterest?symbol=BTCUSDT", timeout=10).json()
-        oi_eth = requests.get("https://fapi.binance.com/fapi/v1/openInterest?symbol=ETHUSDT", timeout=10).json()
-        
-        return {
-            'btc_funding': float(btc_funding['lastFundingRate']) * 100 if btc_funding else 0,
-            'eth_funding': float(eth_funding['lastFundingRate']) * 100 if eth_funding else 0,
-            'btc_oi': float(oi_btc['openInterest']) if oi_btc else 0,
-            'eth_oi': float(oi_eth['openInterest']) if oi_eth else 0
-        }
-    except:
-        return {'btc_funding': 0, 'eth_funding': 0, 'btc_oi': 0, 'eth_oi': 0}
-
-def get_fear_greed():
-    """Ambil Fear & Greed Index"""
-    try:
-        response = requests.get("https://api.alternative.me/fng/", timeout=10)
-        data = response.json()
-        return {
-            'value': int(data['data'][0]['value']),
-            'classification': data['data'][0]['value_classification']
-        }
-    except:
-        return {'value': 50, 'classification': 'Neutral'}
+    """Ambil data dari Binance API (nilai terakhir langsung dipakai, refresh di background)"""
+    return serve(('simple_dashboard', 'binance'), _fetch_binance_data,
+                 {'btc_funding': np.nan, 'eth_funding': np.nan, 'btc_oi': np.nan, 'eth_oi': np.nan})
 
 def calculate_signal(btc_funding, eth_funding, fear_greed_value):
     """Hitung sinyal trading"""
@@ -107,18 +102,15 @@ def calculate_signal(btc_funding, eth_funding, fear_greed_value):
 st.title("🚀 Trading Future Dashboard")
 st.markdown("**Real-time Crypto Trading Signals**")
 
-# Auto refresh
-if 'last_update' not in st.session_state:
-    st.session_state.last_update = datetime.now()
-
-col1, col2 = st.columns([1, 9])
+col1, col2, col3 = st.columns([1, 1, 8])
 with col1:
     if st.button("🔄 Refresh"):
-        st.session_state.last_update = datetime.now()
         st.rerun()
+with col2:
+    auto_refresh = st.checkbox("Auto Refresh", value=True)
 
-# Fetch data
-with st.spinner("Loading data..."):
+def load_data():
+    """Data dari cache SWR + sinyal; data gagal / terlalu basi = NO TRADE"""
     binance_data = get_binance_data()
     fear_greed = get_fear_greed()
     signal, signal_color, signal_list, score = calculate_signal(
@@ -126,11 +118,50 @@ with st.spinner("Loading data..."):
         binance_data['eth_funding'], 
         fear_greed['value']
     )
+    # Jangan hitung sinyal dari nilai default
+    if binance_data['degraded'] or fear_greed['degraded']:
+        signal, signal_color, score = "NO TRADE", "neutral", 0
+    return binance_data, fear_greed, signal, signal_color, signal_list, score
+
+# Fetch data
+with st.spinner("Loading data..."), timed("dashboard.simple.fetch"):
+    binance_data, fear_greed, signal, signal_color, signal_list, score = load_data()
 
-# Main Signal
-st.markdown("### 🎯 Trading Signal")
-st.markdown(f"<div class='{signal_color} big-font'>{signal}</div>", unsafe_allow_html=True)
-st.write(f"**Score:** {score}/4")
+# Waktu data + sinyal terakhir dimuat (rerun penuh atau tick tile sinyal)
+signal_time = st.session_state.last_update = datetime.now()
+
+# Auto refresh: tiap interval tile sinyal membaca ulang cache SWR dan menghitung ulang sinyal.
+# Kalau sinyal / F&G berubah, seluruh halaman di-rerun supaya panel di bawah ikut sama
+@live_fragment("dashboard.simple.tiles", run_every=live_interval(auto_refresh))
+def signal_tiles(binance_data, fear_greed, signal, signal_color, signal_list, score, signal_time):
+    if is_fragment_rerun("dashboard.simple.tiles"):
+        previous = (signal, signal_list, score, fear_greed['value'])
+        binance_data, fear_greed, signal, signal_color, signal_list, score = load_data()
+        signal_time = st.session_state.last_update = datetime.now()
+        if (signal, signal_list, score, fear_greed['value']) != previous:
+            st.rerun()
+    if binance_data['degraded'] or fear_greed['degraded']:
+        st.error("⚠️ Data upstream tidak tersedia, sinyal dinonaktifkan")
+    elif binance_data['stale'] or fear_greed['stale']:
+        st.caption(f"⏳ Menampilkan data terakhir ({max(binance_data['data_age'], fear_greed['data_age']):.0f} detik), refresh berjalan di background")
+
+    # Main Signal
+    st.markdown("### 🎯 Trading Signal")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(f"<div class='{signal_color} big-font'>{signal}</div>", unsafe_allow_html=True)
+        st.write(f"**Score:** {score}/4")
+    with col2:
+        st.metric("BTC Funding Rate", f"{binance_data['btc_funding']:.4f}%", 
+                  "Bullish" if binance_data['btc_funding'] < 0 else "Bearish")
+    with col3:
+        st.metric("ETH Funding Rate", f"{binance_data['eth_funding']:.4f}%",
+                  "Bullish" if binance_data['eth_funding'] < 0 else "Bearish")
+    with col4:
+        st.metric("Fear & Greed Index", fear_greed['value'], fear_greed['classification'])
+    st.caption(f"Last Update: {signal_time.strftime('%H:%M:%S')}")
+
+signal_tiles(binance_data, fear_greed, signal, signal_color, signal_list, score, signal_time)
 
 st.divider()
 
@@ -141,11 +172,6 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown("### 📈 On-Chain Metrics")
     
-    st.metric("BTC Funding Rate", f"{binance_data['btc_funding']:.4f}%", 
-              "Bullish" if binance_data['btc_funding'] < 0 else "Bearish")
-    st.metric("ETH Funding Rate", f"{binance_data['eth_funding']:.4f}%",
-              "Bullish" if binance_data['eth_funding'] < 0 else "Bearish")
-    
     st.write(f"**BTC Open Interest:** {binance_data['btc_oi']:,.0f}")
     st.write(f"**ETH Open Interest:** {binance_data['eth_oi']:,.0f}")
 
@@ -153,8 +179,6 @@ with col1:
 with col2:
     st.markdown("### 🐋 Market Sentiment")
     
-    st.metric("Fear & Greed Index", fear_greed['value'], fear_greed['classification'])
-    
     # Simple gauge visualization
     if fear_greed['value'] < 25:
         gauge_color = "🔴 Extreme Fear"
@@ -169,11 +193,16 @@ with col2:
     
     st.write(f"**Status:** {gauge_color}")
     
-    # Simulated whale data
+    # Trade whale BTC/ETH dari stream aggTrade
     st.write("**🐋 Recent Whale Activity:**")
-    st.write("• 1,250 BTC moved to exchange")
-    st.write("• 15,000 ETH withdrawn from Binance")
-    st.write("• Large accumulation detected")
+    whale_tracker = get_whale_tracker()
+    if whale_tracker and whale_tracker.is_live():
+        for symbol in ('BTCUSDT', 'ETHUSDT'):
+            whale = whale_tracker.analysis(symbol)
+            if whale:
+                st.write(f"**{symbol[:3]}:** " + " | ".join(whale[1]))
+    else:
+        st.write("• Whale stream tidak aktif")
 
 # Panel 3 & 4
 col3, col4 = st.columns(2)
@@ -209,7 +238,7 @@ with col4:
 
 # Footer
 st.divider()
-st.write(f"**Last Update:** {st.session_state.last_update.strftime('%H:%M:%S')}")
+st.write(f"**Rerun penuh:** {signal_time.strftime('%H:%M:%S')} | **Live Tiles:** {f'setiap {LIVE_REFRESH_SECONDS:.0f} detik' if live_interval(auto_refresh) else 'off'}")
 st.write("**Data Sources:** Binance API, Alternative.me")
 
 # Sidebar
@@ -219,6 +248,7 @@ with st.sidebar:
     st.write("• Binance Funding Rates")
     st.write("• Open Interest")
     st.write("• Fear & Greed Index")
+    st.write("• Whale trades (aggTrade)")
     
     st.markdown("### 📊 Signal Logic")
     st.write("**Bullish (+1 each):**")
@@ -234,4 +264,9 @@ with st.sidebar:
     st.write("• +1: LONG")
     st.write("• 0: NO TRADE")
     st.write("• -1: SHORT")
-    st.write("• -2: STRONG SHORT")
\ No newline at end of file
+    st.write("• -2: STRONG SHORT")
+
+    with st.expander("🩺 Diagnostics"):
+        diagnostics_panel(st)
+
+export()
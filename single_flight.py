@@ -0,0 +1,80 @@
+"""
+Request coalescing (single-flight) untuk satu proses.
+
+Kalau beberapa session Streamlit meminta hal yang sama di saat bersamaan,
+hanya satu yang benar-benar memanggil upstream; sisanya menunggu dan menerima
+hasil (atau exception) yang sama.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Gabungkan panggilan yang sedang berjalan dengan key yang sama"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """Jalankan fn sekali untuk key; pemanggil lain dengan key sama menunggu hasilnya"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # Hapus dulu baru bangunkan waiter, supaya panggilan berikutnya memulai flight baru
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        total = self.executed + self.shared
+        return {
+            'executed': self.executed,
+            'shared': self.shared,
+            'coalesce_rate': self.shared / total if total else 0,
+            'in_flight': self.in_flight()
+        }
+
+
+def request_key(url, params=None):
+    """Key stabil dari URL + params (urutan params tidak berpengaruh)"""
+    if not params:
+        return (url,)
+    return (url,) + tuple(sorted((str(key), str(value)) for key, value in dict(params).items()))
@@ -0,0 +1,239 @@
+from instrumentation import instrument
+
+# Threshold sinyal, bisa dioverride per panggilan (lihat optimizer.py)
+DEFAULT_THRESHOLDS = {
+    'funding_high': 0.1,        # funding rate (%) di atas ini bearish
+    'funding_low': -0.05,       # funding rate (%) di bawah ini bullish
+    'fear_low': 25,             # Fear & Greed di bawah ini extreme fear
+    'greed_high': 75,           # Fear & Greed di atas ini extreme greed
+    'volume_high': 1000000,     # volume 24h di atas ini dianggap tinggi
+    'depth_imbalance': 0.25,    # imbalance top-10 level order book di atas ini bullish (di bawah minus ini bearish)
+    'liquidation_cascade': 3.0, # likuidasi 5m minimal kelipatan ini dari rata-rata 1 jam untuk disebut cascade
+    'strong_score': 3,          # total score minimal untuk STRONG LONG / SHORT
+    'score': 1.5                # total score minimal untuk LONG / SHORT
+}
+
+def resolve_thresholds(thresholds=None):
+    """Gabungkan override threshold dengan default"""
+    if not thresholds:
+        return DEFAULT_THRESHOLDS
+    return {**DEFAULT_THRESHOLDS, **thresholds}
+
+def technical_analysis(coin_data):
+    """Analisis teknikal sederhana"""
+    price = coin_data['price']
+    high_24h = coin_data['high_24h']
+    low_24h = coin_data['low_24h']
+    change_24h = coin_data['change_24h']
+    
+    if coin_data.get('rsi') is not None:
+        # RSI asli dari klines (indicators.py)
+        simulated_rsi = coin_data['rsi']
+    else:
+        # RSI simulasi berdasarkan posisi harga dalam range 24h
+        price_position = (price - low_24h) / (high_24h - low_24h) if high_24h != low_24h else 0.5
+        simulated_rsi = price_position * 100
+    
+    signals = []
+    score = 0
+    
+    # RSI Analysis
+    if simulated_rsi < 30:
+        signals.append("🟢 RSI Oversold (bullish)")
+        score += 1
+    elif simulated_rsi > 70:
+        signals.append("🔴 RSI Overbought (bearish)")
+        score -= 1
+    
+    # Price momentum
+    if change_24h > 5:
+        signals.append("🟢 Strong upward momentum")
+        score += 1
+    elif change_24h < -5:
+        signals.append("🔴 Strong downward momentum")
+        score -= 1
+    
+    return score, signals, simulated_rsi
+
+def fundamental_analysis(coin_data, fear_greed_value, thresholds=None):
+    """Analisis fundamental"""
+    thresholds = resolve_thresholds(thresholds)
+    funding_rate = coin_data['funding_rate']
+    volume = coin_data['volume']
+    
+    signals = []
+    score = 0
+    
+    # Funding Rate Analysis
+    if funding_rate > thresholds['funding_high']:
+        signals.append("🔴 High funding rate - shorts paying longs")
+        score -= 1
+    elif funding_rate < thresholds['funding_low']:
+        signals.append("🟢 Negative funding rate - longs paying shorts")
+        score += 1
+    
+    # Volume Analysis (simplified)
+    if volume > thresholds['volume_high']:
+        signals.append("🟢 High trading volume")
+        score += 0.5
+    
+    # Fear & Greed Impact
+    if fear_greed_value < thresholds['fear_low']:
+        signals.append("🟢 Market fear - contrarian opportunity")
+        score += 1
+    elif fear_greed_value > thresholds['greed_high']:
+        signals.append("🔴 Market greed - potential reversal")
+        score -= 1
+    
+    return score, signals
+
+def whale_analysis(coin_data):
+    """Analisis whale dari aggTrade (coin_data['whale'] diisi WhaleTracker.analysis)"""
+    whale = coin_data.get('whale')
+    if whale is None:
+        # Stream tidak aktif: whale tidak ikut menyumbang skor
+        return 0, ["• Whale stream tidak aktif"]
+    return whale
+
+def depth_analysis(coin_data, thresholds=None):
+    """Analisis order book (coin_data['depth'] diisi DepthStream.metrics)"""
+    thresholds = resolve_thresholds(thresholds)
+    depth = coin_data.get('depth')
+    if depth is None:
+        return 0, ["• Order book stream tidak aktif"]
+    
+    signals = [f"• Spread: {depth['spread_bps']:.2f} bps",
+               f"• Liquidity ±1%: bid ${depth['bid_liquidity_1'] / 1e6:,.2f}M / ask ${depth['ask_liquidity_1'] / 1e6:,.2f}M"]
+    score = 0
+    if depth['imbalance'] >= thresholds['depth_imbalance']:
+        signals.insert(0, f"🟢 Bid-heavy order book (imbalance {depth['imbalance']:+.2f})")
+        score += 1
+    elif depth['imbalance'] <= -thresholds['depth_imbalance']:
+        signals.insert(0, f"🔴 Ask-heavy order book (imbalance {depth['imbalance']:+.2f})")
+        score -= 1
+    
+    return score, signals
+
+def liquidation_analysis(coin_data, thresholds=None):
+    """Analisis cascade likuidasi (coin_data['liquidations'] diisi LiquidationTracker.cascade)"""
+    thresholds = resolve_thresholds(thresholds)
+    liquidations = coin_data.get('liquidations')
+    if liquidations is None:
+        return 0, ["• Liquidation stream tidak aktif"]
+    
+    signals = [f"• Liquidations 5m: long ${liquidations['long'] / 1e6:,.2f}M / short ${liquidations['short'] / 1e6:,.2f}M "
+               f"(avg 5m ${liquidations['baseline'] / 1e6:,.2f}M)"]
+    score = 0
+    # Contrarian: cascade likuidasi satu sisi biasanya menghabiskan tekanan paksa sisi itu
+    if liquidations['cascade'] >= thresholds['liquidation_cascade']:
+        signals.insert(0, f"🟢 Long liquidation cascade ({liquidations['cascade']:.1f}x) - forced selling flush")
+        score += 1
+    elif liquidations['cascade'] <= -thresholds['liquidation_cascade']:
+        signals.insert(0, f"🔴 Short squeeze cascade ({-liquidations['cascade']:.1f}x) - forced buying spike")
+        score -= 1
+    
+    return score, signals
+
+@instrument("score.entry_signal")
+def calculate_entry_signal(coin, coin_data, fear_greed, thresholds=None):
+    """Hitung sinyal entry berdasarkan semua strategi"""
+    thresholds = resolve_thresholds(thresholds)
+    
+    # 1. Technical Analysis
+    tech_score, tech_signals, rsi = technical_analysis(coin_data)
+    
+    # 2. Fundamental Analysis  
+    fund_score, fund_signals = fundamental_analysis(coin_data, fear_greed['value'], thresholds)
+    
+    # 3. Whale Analysis
+    whale_score, whale_signals = whale_analysis(coin_data)
+    
+    # 4. On-chain Analysis (funding rate focus)
+    onchain_score = 0
+    onchain_signals = []
+    if coin_data['funding_rate'] < -0.02:
+        onchain_score += 1
+        onchain_signals.append("🟢 Negative funding - bullish setup")
+    elif coin_data['funding_rate'] > 0.05:
+        onchain_score -= 1
+        onchain_signals.append("🔴 High funding - bearish setup")
+    
+    # 5. Order book depth
+    depth_score, depth_signals = depth_analysis(coin_data, thresholds)
+    
+    # 6. Liquidation cascade
+    liquidation_score, liquidation_signals = liquidation_analysis(coin_data, thresholds)
+    
+    # Total Score
+    total_score = tech_score + fund_score + whale_score + onchain_score + depth_score + liquidation_score
+    
+    # Data gagal diambil / terlalu basi: jangan keluarkan sinyal trade
+    degraded = bool(coin_data.get('degraded') or fear_greed.get('degraded'))
+    
+    # Entry Signal
+    if degraded:
+        entry_signal = "NO TRADE"
+        entry_color = "neutral"
+        confidence = "Low"
+    elif total_score >= thresholds['strong_score']:
+        entry_signal = "STRONG LONG"
+        entry_color = "bullish"
+        confidence = "High"
+    elif total_score >= thresholds['score']:
+        entry_signal = "LONG"
+        entry_color = "bullish" 
+        confidence = "Medium"
+    elif total_score <= -thresholds['strong_score']:
+        entry_signal = "STRONG SHORT"
+        entry_color = "bearish"
+        confidence = "High"
+    elif total_score <= -thresholds['score']:
+        entry_signal = "SHORT"
+        entry_color = "bearish"
+        confidence = "Medium"
+    else:
+        entry_signal = "NO TRADE"
+        entry_color = "neutral"
+        confidence = "Low"
+    
+    # Entry levels
+    price = coin_data['price']
+    if "LONG" in entry_signal:
+        entry_price = price * 0.995  # 0.5% below current
+        stop_loss = price * 0.97     # 3% stop loss
+        take_profit = price * 1.06   # 6% take profit
+    elif "SHORT" in entry_signal:
+        entry_price = price * 1.005  # 0.5% above current
+        stop_loss = price * 1.03     # 3% stop loss
+        take_profit = price * 0.94   # 6% take profit
+    else:
+        entry_price = price
+        stop_loss = 0
+        take_profit = 0
+    
+    return {
+        'signal': entry_signal,
+        'color': entry_color,
+        'confidence': confidence,
+        'total_score': total_score,
+        'entry_price': entry_price,
+        'stop_loss': stop_loss,
+        'take_profit': take_profit,
+        'rsi': rsi,
+        'tech_score': tech_score,
+        'fund_score': fund_score,
+        'whale_score': whale_score,
+        'onchain_score': onchain_score,
+        'depth_score': depth_score,
+        'liquidation_score': liquidation_score,
+        'degraded': degraded,
+        'data_age': max(coin_data.get('data_age') or 0, fear_greed.get('data_age') or 0),
+        'all_signals': {
+            'technical': tech_signals,
+            'fundamental': fund_signals,
+            'whale': whale_signals,
+            'onchain': onchain_signals,
+            'depth': depth_signals,
+            'liquidations': liquidation_signals
+        }
+    }
@@ -0,0 +1,218 @@
+"""
+Ingestion streaming Binance Futures lewat websocket.
+
+Subscribe ke combined stream `!markPrice@arr` dan `!ticker@arr`, simpan state
+terakhir per symbol di memori. Dashboard dan calculate_entry_signal membaca
+state ini tanpa request REST.
+
+    python stream_ingest.py                                   # Binance asli
+    python stream_ingest.py --replay frames.jsonl --port 8765 # stand-in lokal
+    python stream_ingest.py --url ws://localhost:8765/stream
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+BINANCE_FSTREAM_URL = "wss://fstream.binance.com/stream"
+DEFAULT_STREAMS = ('!markPrice@arr', '!ticker@arr')
+
+# Data stream dianggap basi kalau tidak ada update selama ini
+STREAM_MAX_AGE = 10  # detik
+
+
+class MarketStream:
+    """State terakhir per symbol dari combined stream Binance, dengan reconnect + backoff"""
+
+    def __init__(self, url=BINANCE_FSTREAM_URL, streams=DEFAULT_STREAMS,
+                 initial_backoff=1, max_backoff=60):
+        self.url = url
+        self.streams = streams
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.state = {}
+        self.connected = False
+        self.reconnects = 0
+        self.messages = 0
+        self._lock = threading.Lock()
+        self._stop = False
+        self._thread = None
+        self._loop = None
+
+    @property
+    def stream_url(self):
+        return f"{self.url}?streams={'/'.join(self.streams)}"
+
+    def handle_message(self, raw):
+        """Proses satu frame combined stream dan update state"""
+        message = json.loads(raw)
+        data = message.get('data', message)
+        items = data if isinstance(data, list) else [data]
+        now = time.time()
+
+        with self._lock:
+            for item in items:
+                event = item.get('e')
+                if event not in ('markPriceUpdate', '24hrTicker'):
+                    continue
+                entry = self.state.setdefault(item['s'], {})
+                if event == 'markPriceUpdate':
+                    entry['mark_price'] = float(item['p'])
+                    # r kosong (kontrak delivery / settling) = NaN, bukan 0
+                    entry['funding_rate'] = float(item['r']) * 100 if item.get('r') else math.nan
+                    entry['next_funding_time'] = item.get('T')
+                elif event == '24hrTicker':
+                    entry['price'] = float(item['c'])
+                    entry['change_24h'] = float(item['P'])
+                    entry['volume'] = float(item['v'])
+                    entry['high_24h'] = float(item['h'])
+                    entry['low_24h'] = float(item['l'])
+                entry['updated_at'] = now
+        self.messages += 1
+
+    async def run(self):
+        """Loop utama: connect, baca frame, reconnect dengan exponential backoff"""
+        if websockets is None:
+            raise RuntimeError("Package websockets belum terinstall")
+
+        backoff = self.initial_backoff
+        while not self._stop:
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20) as ws:
+                    self.connected = True
+                    backoff = self.initial_backoff
+                    async for raw in ws:
+                        self.handle_message(raw)
+                        if self._stop:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+            finally:
+                self.connected = False
+
+            if self._stop:
+                break
+            self.reconnects += 1
+            # Jitter supaya banyak client tidak reconnect bersamaan
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def start(self):
+        """Jalankan stream di thread background dengan event loop sendiri"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+
+        def _run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.run())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=_run, name="market-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop = True
+
+    def get(self, symbol, max_age=STREAM_MAX_AGE):
+        """State terakhir satu symbol (None kalau belum ada / basi)"""
+        with self._lock:
+            entry = self.state.get(symbol)
+            if not entry or time.time() - entry['updated_at'] > max_age:
+                return None
+            return dict(entry)
+
+    def apply_to_coin_data(self, symbol, coin_data, max_age=STREAM_MAX_AGE):
+        """Timpa field coin_data dengan nilai streaming terbaru kalau ada"""
+        entry = self.get(symbol, max_age)
+        if entry is None:
+            return coin_data, False
+        updated = dict(coin_data)
+        for key in ('price', 'change_24h', 'volume', 'high_24h', 'low_24h', 'funding_rate'):
+            if key in entry and not math.isnan(entry[key]):
+                updated[key] = entry[key]
+        # Funding tidak ada di REST maupun stream = degraded
+        updated['degraded'] = bool(coin_data.get('degraded') or math.isnan(updated.get('funding_rate', math.nan)))
+        return updated, True
+
+    def apply_to_snapshot(self, snapshot, max_age=STREAM_MAX_AGE):
+        """Versi MarketSnapshot dari apply_to_coin_data, return (snapshot baru, jumlah symbol yang ditimpa)"""
+        updated = None
+        count = 0
+        for symbol in snapshot.symbols:
+            entry = self.get(symbol, max_age)
+            if entry is None:
+                continue
+            if updated is None:
+                # Kolom snapshot dari cache dipakai bersama, jadi copy sekali sebelum ditimpa
+                updated = snapshot.copy()
+            row = updated.index[symbol]
+            for key in ('price', 'change_24h', 'volume', 'high_24h', 'low_24h', 'funding_rate'):
+                if key in entry and not math.isnan(entry[key]):
+                    updated.columns[key][row] = entry[key]
+            count += 1
+        return (updated or snapshot), count
+
+
+_market_stream = None
+
+
+def get_market_stream():
+    """Stream bersama untuk satu proses, otomatis start (None kalau websockets tidak ada)"""
+    global _market_stream
+    if websockets is None:
+        return None
+    if _market_stream is None:
+        _market_stream = MarketStream()
+        _market_stream.start()
+    return _market_stream
+
+
+async def serve_replay(frames, host="localhost", port=8765, interval=0.1, loop_forever=True):
+    """Stand-in websocket lokal yang memutar ulang frame rekaman ke setiap client"""
+    async def handler(ws):
+        while True:
+            for frame in frames:
+                await ws.send(frame)
+                await asyncio.sleep(interval)
+            if not loop_forever:
+                break
+
+    async with websockets.serve(handler, host, port):
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming mark price & ticker Binance")
+    parser.add_argument("--url", default=BINANCE_FSTREAM_URL, help="URL combined stream")
+    parser.add_argument("--replay", help="File .jsonl berisi frame rekaman untuk stand-in lokal")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    try:
+        if args.replay:
+            with open(args.replay) as f:
+                frames = [line.strip() for line in f if line.strip()]
+            print(f"Replaying {len(frames)} frames on ws://localhost:{args.port}/stream")
+            asyncio.run(serve_replay(frames, port=args.port))
+        else:
+            stream = MarketStream(url=args.url)
+            stream.start()
+            while True:
+                time.sleep(5)
+                print(f"connected={stream.connected} symbols={len(stream.state)} "
+                      f"messages={stream.messages} reconnects={stream.reconnects}")
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,143 @@
+"""
+Cache stale-while-revalidate untuk semua fetcher.
+
+Kalau ada nilai terakhir yang masih cukup baru, nilai itu langsung dipakai
+(beserta umurnya) dan refresh berjalan di background. Render halaman hanya
+menunggu upstream kalau belum pernah ada nilai sama sekali.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import get_metrics
+from single_flight import SingleFlight
+
+FRESH_TTL = float(os.environ.get("SWR_FRESH_TTL", 15))   # detik, sebelum ini tidak perlu refresh
+MAX_STALE = float(os.environ.get("SWR_MAX_STALE", 300))  # detik, setelah ini data dianggap degraded
+
+
+class Served:
+    """Nilai yang disajikan cache beserta metadata kesegarannya"""
+
+    __slots__ = ('value', 'age', 'stale', 'degraded', 'error')
+
+    def __init__(self, value, age, stale, degraded, error=None):
+        self.value = value
+        self.age = age
+        self.stale = stale
+        self.degraded = degraded
+        self.error = error
+
+    def freshness(self):
+        """Metadata untuk ditempel ke dict hasil fetch"""
+        return {'data_age': self.age, 'stale': self.stale, 'degraded': self.degraded}
+
+
+class SWRCache:
+    """Simpan nilai terakhir yang sukses per key, refresh di background saat sudah tua"""
+
+    def __init__(self, fresh_ttl=FRESH_TTL, max_stale=MAX_STALE, max_workers=4):
+        self.fresh_ttl = fresh_ttl
+        self.max_stale = max_stale
+        self._entries = {}      # key -> (value, fetched_at)
+        self._errors = {}       # key -> error terakhir
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="swr")
+        self._flight = SingleFlight()
+
+    def _refresh(self, key, loader):
+        try:
+            value = loader()
+            with self._lock:
+                self._entries[key] = (value, time.time())
+                self._errors.pop(key, None)
+            return value
+        except Exception as e:
+            with self._lock:
+                self._errors[key] = str(e)
+            raise
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _load_first(self, key, loader):
+        with self._lock:
+            self._refreshing.add(key)
+        return self._refresh(key, loader)
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        future = self._executor.submit(self._refresh, key, loader)
+        # Error sudah dicatat di _errors, jangan sampai muncul sebagai warning future
+        future.add_done_callback(lambda f: f.exception())
+
+    def get(self, key, loader, fresh_ttl=None, max_stale=None):
+        """
+        Ambil nilai untuk key.
+
+        - Segar: langsung return.
+        - Basi tapi ada: return nilai lama + refresh di background.
+        - Belum ada: load sinkron; kalau gagal return Served(None, degraded=True).
+        """
+        fresh_ttl = self.fresh_ttl if fresh_ttl is None else fresh_ttl
+        max_stale = self.max_stale if max_stale is None else max_stale
+
+        with self._lock:
+            entry = self._entries.get(key)
+            error = self._errors.get(key)
+
+        get_metrics().record_cache(f"swr {key[0]}", entry is not None)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < fresh_ttl:
+                return Served(value, age, False, False)
+            self._refresh_in_background(key, loader)
+            return Served(value, age, True, age > max_stale, error)
+
+        # Load pertama: session lain yang datang bersamaan ikut menunggu load yang sama
+        try:
+            value = self._flight.do(key, lambda: self._load_first(key, loader))
+            return Served(value, 0.0, False, False)
+        except Exception as e:
+            return Served(None, None, True, True, str(e))
+
+    def peek(self, key):
+        """Nilai terakhir tanpa memicu refresh (None kalau belum ada)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+_swr_cache = SWRCache()
+
+
+def get_swr_cache():
+    """Cache bersama untuk satu proses (dipakai semua session Streamlit)"""
+    return _swr_cache
+
+
+def serve(key, loader, fallback, fresh_ttl=None, max_stale=None):
+    """
+    Helper untuk fetcher yang return dict: hasil loader (atau fallback kalau belum
+    pernah sukses) ditambah data_age / stale / degraded.
+    """
+    served = _swr_cache.get(key, loader, fresh_ttl, max_stale)
+    value = served.value if served.value is not None else fallback
+    result = dict(value)
+    result.update(served.freshness())
+    # Nilai yang sudah ditandai degraded oleh loader (mis. funding / OI gagal) tetap degraded
+    result['degraded'] = served.degraded or bool(value.get('degraded'))
+    return result
@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# Modul dashboard ada di root repo (bukan package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        with server.lock:
+            server.hits += 1
+            if parts.path in server.routes:
+                status, headers, body, delay = server.routes[parts.path]
+            else:
+                status, headers, body, delay = server.responses.pop(0) if server.responses else server.default
+        if callable(body):
+            body = body(parse_qs(parts.query))
+        if delay:
+            time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """HTTP lokal dengan respons yang diatur per test (status, header Binance, delay), antrean atau per path"""
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.hits = 0
+        self.httpd.responses = []
+        self.httpd.default = (200, {}, b'{}', 0)
+        self.httpd.routes = {}
+        self.host = f"127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def hits(self):
+        return self.httpd.hits
+
+    def url(self, path):
+        return f"http://{self.host}{path}"
+
+    def respond(self, status=200, headers=None, body=b'{}', delay=0, default=False):
+        """Antrikan satu respons (default=True: respons untuk semua request berikutnya)"""
+        response = (status, dict(headers or {}), body, delay)
+        if default:
+            self.httpd.default = response
+        else:
+            self.httpd.responses.append(response)
+
+    def route(self, path, body=b'{}', status=200, headers=None, delay=0):
+        """Respons tetap untuk satu path (query diabaikan); body boleh callable(query dict) -> bytes"""
+        self.httpd.routes[path] = (status, dict(headers or {}), body, delay)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
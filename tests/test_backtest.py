@@ -0,0 +1,62 @@
+import numpy as np
+
+from backtest import klines_rsi, score_bars, simulate_trades
+from indicators import rsi
+
+WINDOW = 1440
+
+
+def _bars(count, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, count)))
+    return {
+        'timestamp': np.arange(count, dtype=np.float64) * 60,
+        'open': close,
+        'high': close * 1.001,
+        'low': close * 0.999,
+        'close': close,
+        'volume': np.full(count, 1000.0),
+        'funding_rate': np.full(count, 0.01),
+        'fear_greed': np.full(count, 50.0)
+    }
+
+
+def test_klines_rsi_matches_hourly_rsi():
+    bars = _bars(WINDOW * 5)
+    values = klines_rsi(bars, WINDOW)
+    # Bar terakhir tiap jam = RSI setelah bar 1h ditutup
+    hourly = rsi(bars['close'][59::60])
+    seeded = ~np.isnan(values[59::60])
+    assert seeded.sum() > 0
+    np.testing.assert_allclose(values[59::60][seeded], hourly[seeded])
+    assert np.isnan(values[:60]).all()
+
+
+def test_score_bars_uses_klines_rsi():
+    bars = _bars(WINDOW * 5)
+    scores = score_bars(bars, WINDOW)
+    values = klines_rsi(bars, WINDOW)
+    seeded = ~np.isnan(values)
+    np.testing.assert_allclose(scores['rsi'][seeded], values[seeded])
+
+
+def _scores(bars, signal_bars):
+    signal = np.zeros(len(bars['close']), dtype=np.int8)
+    signal[signal_bars] = 1
+    return {
+        'signal': signal,
+        'entry_price': bars['close'] * 1.01,
+        'stop_loss': bars['close'] * 0.97,
+        'take_profit': bars['close'] * 1.06
+    }
+
+
+def test_signal_on_last_bar_does_not_fail():
+    bars = _bars(WINDOW + 10)
+    count = len(bars['close'])
+    # Sinyal di bar terakhir tidak punya bar untuk fill
+    assert simulate_trades(bars, _scores(bars, [count - 1]), window=WINDOW) == []
+    # Sinyal di bar n-2 terisi di bar terakhir lalu ditutup timeout
+    trades = simulate_trades(bars, _scores(bars, [count - 2]), window=WINDOW)
+    assert [(trade['signal_bar'], trade['fill_bar'], trade['reason']) for trade in trades] == \
+        [(count - 2, count - 1, 'timeout')]
@@ -0,0 +1,112 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from exchanges import BybitAdapter, CoinbaseAdapter, ExchangeAggregator, OKXAdapter
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def _okx_funding(query):
+    # Endpoint asli menyaring per ?instId=
+    payload = _fixture('okx_funding_rate.json')
+    inst_id = query['instId'][0]
+    return json.dumps(dict(payload, data=[item for item in payload['data'] if item['instId'] == inst_id])).encode()
+
+
+def _coinbase_paths():
+    return {f"/products/{product}/stats": json.dumps(stats).encode()
+            for product, stats in _fixture('coinbase_product_stats.json').items()}
+
+
+def _serve(stub_server, delay=0):
+    stub_server.route('/v5/market/tickers', json.dumps(_fixture('bybit_tickers.json')).encode(), delay=delay)
+    stub_server.route('/api/v5/market/tickers', json.dumps(_fixture('okx_tickers.json')).encode(), delay=delay)
+    stub_server.route('/api/v5/public/open-interest', json.dumps(_fixture('okx_open_interest.json')).encode(), delay=delay)
+    stub_server.route('/api/v5/public/funding-rate', _okx_funding, delay=delay)
+    for path, body in _coinbase_paths().items():
+        stub_server.route(path, body, delay=delay)
+
+
+def _adapters(stub_server):
+    bybit, okx, coinbase = BybitAdapter(), OKXAdapter(), CoinbaseAdapter()
+    bybit.URL = stub_server.url('/v5/market/tickers')
+    okx.BASE_URL = stub_server.url('/api/v5')
+    coinbase.URL = stub_server.url('/products/{product}/stats')
+    return bybit, okx, coinbase
+
+
+def _record(records, key, value):
+    return next(item for item in records if item[key] == value)
+
+
+def test_adapters_normalize_symbols_and_units(stub_server):
+    _serve(stub_server)
+    bybit, okx, coinbase = _adapters(stub_server)
+
+    snapshot = bybit.fetch(SYMBOLS)
+    raw = _record(_fixture('bybit_tickers.json')['result']['list'], 'symbol', 'ETHUSDT')
+    row = snapshot.index['ETHUSDT']
+    assert snapshot['price'][row] == float(raw['lastPrice'])
+    assert snapshot['funding_rate'][row] == pytest.approx(float(raw['fundingRate']) * 100)
+    assert snapshot['change_24h'][row] == pytest.approx(float(raw['price24hPcnt']) * 100)
+    # Linear Bybit: volume dan OI sudah dalam coin dasar
+    assert snapshot['volume'][row] == float(raw['volume24h'])
+    assert snapshot['open_interest'][row] == float(raw['openInterest'])
+
+    snapshot = okx.fetch(SYMBOLS)
+    ticker = _record(_fixture('okx_tickers.json')['data'], 'instId', 'BTC-USDT-SWAP')
+    oi = _record(_fixture('okx_open_interest.json')['data'], 'instId', 'BTC-USDT-SWAP')
+    funding = _record(_fixture('okx_funding_rate.json')['data'], 'instId', 'BTC-USDT-SWAP')
+    row = snapshot.index['BTCUSDT']
+    assert snapshot['price'][row] == float(ticker['last'])
+    assert snapshot['funding_rate'][row] == pytest.approx(float(funding['fundingRate']) * 100)
+    # OKX: volCcy24h / oiCcy dalam coin, bukan jumlah kontrak
+    assert snapshot['volume'][row] == float(ticker['volCcy24h'])
+    assert snapshot['open_interest'][row] == float(oi['oiCcy'])
+
+    snapshot = coinbase.fetch(SYMBOLS)
+    stats = _fixture('coinbase_product_stats.json')['SOL-USD']
+    row = snapshot.index['SOLUSDT']
+    assert snapshot['price'][row] == float(stats['last'])
+    assert snapshot['volume'][row] == float(stats['volume'])
+    # Spot: tidak ada funding / OI
+    assert np.isnan(snapshot['funding_rate'][row]) and np.isnan(snapshot['open_interest'][row])
+    assert not snapshot.degraded.any()
+
+
+def test_failing_adapter_only_shows_in_status(stub_server):
+    _serve(stub_server)
+    stub_server.route('/v5/market/tickers', b'{"error": "boom"}', status=500)
+    aggregator = ExchangeAggregator(adapters=list(_adapters(stub_server)), call_timeout=5, deadline=6)
+
+    view = aggregator.fetch(SYMBOLS)
+    assert view.exchanges == ['OKX', 'Coinbase']
+    assert view.status['Bybit']['status'] == 'error'
+    assert view.status['OKX']['status'] == 'ok' and view.status['Coinbase']['status'] == 'ok'
+    assert view.summary('BTCUSDT')['exchanges'] == 2
+    assert _record(view.for_symbol('BTCUSDT'), 'Exchange', 'Bybit')['price'] is None
+
+
+def test_aggregate_latency_is_slowest_adapter(stub_server):
+    delay = 0.3
+    _serve(stub_server, delay=delay)
+    aggregator = ExchangeAggregator(adapters=list(_adapters(stub_server)), call_timeout=5, deadline=6)
+
+    started = time.perf_counter()
+    view = aggregator.fetch(SYMBOLS)
+    elapsed = time.perf_counter() - started
+
+    assert view.exchanges == ['Bybit', 'OKX', 'Coinbase']
+    # Bybit 1 request, OKX 2 bulk + funding per symbol paralel, Coinbase per symbol paralel:
+    # semua adapter ~1x delay; berurutan minimal 3x delay
+    assert elapsed < 2 * delay
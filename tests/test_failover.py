@@ -0,0 +1,57 @@
+import time
+
+import failover
+from failover import FailoverChain
+
+
+def _failing():
+    raise RuntimeError("down")
+
+
+def test_half_open_source_not_launched_can_still_probe(monkeypatch):
+    monkeypatch.setattr(failover, 'COOLDOWN', 0.05)
+    calls = []
+    healthy = True
+
+    def primary():
+        calls.append('primary')
+        return 'primary'
+
+    def flaky():
+        calls.append('flaky')
+        if not healthy:
+            raise RuntimeError("down")
+        return 'flaky'
+
+    chain = FailoverChain('test', {'primary': primary, 'flaky': flaky}, min_hedge=0.5, max_hedge=0.5)
+    # Buka circuit flaky
+    healthy = False
+    for _ in range(failover.FAILURE_THRESHOLD):
+        chain.health['flaky'].record(0.01, error="down")
+    assert chain.health['flaky'].state() == 'open'
+    time.sleep(0.06)
+    assert chain.health['flaky'].state() == 'half-open'
+
+    # Sumber yang lebih sehat menang sebelum hedge delay: flaky tidak pernah ditembak
+    assert chain.call() == ('primary', 'primary')
+    assert calls == ['primary']
+    assert chain.health['flaky'].probing is False
+
+    # Flaky sudah pulih dan tetap bisa dicoba saat primary mati
+    healthy = True
+    chain.sources['primary'] = _failing
+    assert chain.call() == ('flaky', 'flaky')
+    assert chain.health['flaky'].state() == 'closed'
+
+
+def test_half_open_allows_single_probe(monkeypatch):
+    monkeypatch.setattr(failover, 'COOLDOWN', 0.05)
+    health = failover.SourceHealth()
+    for _ in range(failover.FAILURE_THRESHOLD):
+        health.record(0.01, error="down")
+    time.sleep(0.06)
+    assert health.try_acquire() is True
+    assert health.try_acquire() is False
+    # Probe gagal membuka circuit lagi
+    health.record(0.01, error="down")
+    assert health.state() == 'open'
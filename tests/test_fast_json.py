@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from fast_json import BACKENDS, decode_columns
+
+FIELDS = ('markPrice', 'lastFundingRate')
+
+# Kontrak delivery / settling dikirim dengan lastFundingRate kosong
+PAYLOAD = (b'[{"symbol": "BTCUSDT", "markPrice": "65000.10", "lastFundingRate": "0.00010000"},'
+           b' {"symbol": "BTCUSDT_241227", "markPrice": "66000.5", "lastFundingRate": ""},'
+           b' {"symbol": "ETHUSDT", "markPrice": 3200.25}]')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_empty_and_missing_fields_become_nan(backend):
+    columns = decode_columns(PAYLOAD, FIELDS, backend=backend)
+    assert columns['symbol'].tolist() == ['BTCUSDT', 'BTCUSDT_241227', 'ETHUSDT']
+    np.testing.assert_array_equal(columns['markPrice'], [65000.10, 66000.5, 3200.25])
+    np.testing.assert_array_equal(columns['lastFundingRate'], [0.0001, np.nan, np.nan])
+
+
+def test_backends_agree():
+    results = [decode_columns(PAYLOAD, FIELDS, backend=backend) for backend in BACKENDS]
+    for columns in results[1:]:
+        for field in FIELDS:
+            np.testing.assert_array_equal(columns[field], results[0][field])
+    # Satu object (bukan array) juga lewat jalur yang sama
+    single = decode_columns(b'{"symbol": "X", "markPrice": "", "lastFundingRate": "1"}', FIELDS)
+    np.testing.assert_array_equal(single['markPrice'], [np.nan])
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+import http_client
+from fetch_engine import FetchEngine
+
+
+@pytest.fixture
+def engine():
+    engine = FetchEngine(max_workers=8)
+    yield engine
+    engine.shutdown()
+
+
+def _tasks(stub_server, delays):
+    """Satu task HTTP per path, tiap path dengan delay sendiri di stub server"""
+    tasks = {}
+    for name, delay in delays.items():
+        stub_server.route(f'/{name}', b'{"name": "%s"}' % name.encode(), delay=delay)
+        tasks[name] = lambda url=stub_server.url(f'/{name}'): http_client.get_json(url, timeout=10)
+    return tasks
+
+
+def test_total_time_is_slowest_call_not_sum(stub_server, engine):
+    delays = {'ticker': 0.3, 'premium': 0.2, 'oi': 0.25, 'fng': 0.1}
+    started = time.perf_counter()
+    results, status = engine.run(_tasks(stub_server, delays), call_timeout=5, deadline=6)
+    elapsed = time.perf_counter() - started
+
+    assert results == {name: {'name': name} for name in delays}
+    assert all(status[name]['status'] == 'ok' for name in delays)
+    assert status['ticker']['elapsed'] >= 0.3
+    # Paralel: ~max(delay) = 0.3s, berurutan minimal sum(delay) = 0.85s
+    assert max(delays.values()) <= elapsed < 0.6
+
+
+def test_call_past_timeout_reports_timeout(stub_server, engine):
+    started = time.perf_counter()
+    results, status = engine.run(_tasks(stub_server, {'fast': 0.05, 'slow': 2}), call_timeout=0.3, deadline=5)
+    elapsed = time.perf_counter() - started
+
+    assert results == {'fast': {'name': 'fast'}}
+    assert status['fast']['status'] == 'ok'
+    assert status['slow']['status'] == 'timeout'
+    assert status['slow']['error'] == "call timeout (0.3s)"
+    # Caller tidak menunggu call lambat selesai
+    assert elapsed < 1
+
+
+def test_deadline_cuts_off_stragglers(stub_server, engine):
+    delays = {'fast': 0.05, 'slow': 2, 'slower': 3}
+    started = time.perf_counter()
+    results, status = engine.run(_tasks(stub_server, delays), call_timeout=5, deadline=0.4)
+    elapsed = time.perf_counter() - started
+
+    assert results == {'fast': {'name': 'fast'}}
+    assert [status[name]['status'] for name in delays] == ['ok', 'timeout', 'timeout']
+    assert status['slow']['error'] == "deadline (0.4s)"
+    assert 0.4 <= elapsed < 1
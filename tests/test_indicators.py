@@ -0,0 +1,45 @@
+import numpy as np
+
+import indicators
+from indicators import RSIFeed, rsi
+
+HOUR_MS = 3_600_000
+
+
+def _klines(count, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    return {
+        'open_time': np.arange(count, dtype=np.float64) * HOUR_MS,
+        'open': close,
+        'high': close + 0.5,
+        'low': close - 0.5,
+        'close': close,
+        'volume': np.ones(count)
+    }
+
+
+def _window(klines, end, limit):
+    return {field: values[max(0, end - limit):end] for field, values in klines.items()}
+
+
+def test_rsi_feed_matches_full_history(monkeypatch):
+    klines = _klines(400)
+    requests = []
+    position = {'end': 200}
+
+    def fake_batch(symbols, interval='1h', limit=500):
+        requests.append((tuple(symbols), limit))
+        return {symbol: _window(klines, position['end'], limit) for symbol in symbols}
+
+    monkeypatch.setattr(indicators, 'fetch_klines_batch', fake_batch)
+    feed = RSIFeed(history=200, tail=5)
+    for end in (200, 200, 201, 204, 207, 230, 400):
+        position['end'] = end
+        value = feed.refresh(['BTCUSDT'])['BTCUSDT']
+        # Bar terakhir (masih berjalan) ikut dihitung; beda titik seed Wilder hanya menyisakan selisih kecil
+        assert abs(value - rsi(klines['close'][:end])[-1]) < 1e-4
+
+    limits = [limit for _, limit in requests]
+    # Seed sekali, refresh berikutnya hanya tail; bar yang terlewat (207 -> 230) memicu seed ulang
+    assert limits == [200, 5, 5, 5, 5, 5, 200, 5, 200]
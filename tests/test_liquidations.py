@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+import liquidations
+from liquidations import LiquidationStream, LiquidationTracker
+from timeseries_store import TimeSeriesStore
+
+
+def _frame(side):
+    return ('{"data": {"e": "forceOrder", "o": {"s": "BTCUSDT", "S": "%s", "ap": "100", "z": "10", "T": %d}}}'
+            % (side, time.time() * 1000))
+
+
+@pytest.fixture
+def store():
+    store = TimeSeriesStore(":memory:")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def dashboard_stream(store, monkeypatch):
+    """get_liquidation_stream() dengan store test, tanpa koneksi websocket"""
+    monkeypatch.setattr(liquidations, 'get_store', lambda: store)
+    monkeypatch.setattr(liquidations, '_liquidation_stream', None)
+    monkeypatch.setattr(LiquidationStream, 'start', lambda self: None)
+    if liquidations.websockets is None:
+        monkeypatch.setattr(liquidations, 'websockets', object())
+    return liquidations.get_liquidation_stream
+
+
+def test_dashboard_stream_reads_store_without_writing(store, dashboard_stream, monkeypatch):
+    writer = LiquidationTracker(track_changes=True)
+    writer.add('BTCUSDT', True, 250_000.0, time.time() - 120)
+    assert writer.persist(store) == len(liquidations.RESOLUTIONS)
+
+    writes = []
+    monkeypatch.setattr(store, 'record_liquidation_buckets', lambda rows: writes.append(rows))
+
+    stream = dashboard_stream()
+    assert stream.store is None
+    assert stream.tracker.summary('BTCUSDT')['5m']['long'] == 250_000.0
+
+    # Likuidasi baru di dashboard tidak pernah ditulis balik ke store, walaupun PERSIST_INTERVAL lewat
+    stream._persisted_at = 0
+    for side in ('SELL', 'BUY'):
+        stream.handle_message(_frame(side))
+    assert stream.tracker.events == 2
+    assert writes == []
+    assert not stream.tracker._dirty
+
+
+def test_dashboard_restart_does_not_double_count_open_bucket(store, dashboard_stream):
+    # Collector sudah menulis bucket yang sedang berjalan, berisi likuidasi yang juga diterima live oleh dashboard
+    frame = _frame('SELL')
+    writer = LiquidationTracker(track_changes=True)
+    writer.handle_message(frame)
+    writer.persist(store)
+
+    stream = dashboard_stream()
+    assert stream.tracker.summary('BTCUSDT')['1m']['long'] == 0.0
+    stream.handle_message(frame)
+    assert stream.tracker.cascade('BTCUSDT')['long'] == 1000.0
+
+    # Collector (penulis) tetap memuat bucket berjalan supaya persist berikutnya tidak menimpanya dengan sebagian
+    collector = LiquidationTracker(track_changes=True)
+    assert collector.restore(store) == len(liquidations.RESOLUTIONS)
+    assert collector.summary('BTCUSDT')['1m']['long'] == 1000.0
@@ -0,0 +1,28 @@
+import types
+
+import live_refresh
+
+
+def test_fragment_rerun_is_detected(monkeypatch):
+    registered = []
+    fake_st = types.SimpleNamespace(session_state={})
+    monkeypatch.setattr(live_refresh, 'st', fake_st)
+    monkeypatch.setattr(live_refresh, 'FRAGMENTS_SUPPORTED', True)
+    # Fragment palsu: simpan fungsi yang akan dipanggil ulang oleh timer
+    monkeypatch.setattr(live_refresh, '_fragment', lambda fn, run_every=None: registered.append(fn) or fn)
+
+    @live_refresh.live_fragment("test.tiles", run_every=30)
+    def tiles(value):
+        return value, live_refresh.is_fragment_rerun("test.tiles")
+
+    # Dipanggil dari script = rerun penuh
+    assert tiles(1) == (1, False)
+    # Tick timer memanggil fragment langsung dengan argumen rerun penuh terakhir
+    assert registered[0](1) == (1, True)
+    assert registered[0](1) == (1, True)
+    assert tiles(2) == (2, False)
+
+
+def test_without_fragments_every_call_is_full_run(monkeypatch):
+    monkeypatch.setattr(live_refresh, 'FRAGMENTS_SUPPORTED', False)
+    assert not live_refresh.is_fragment_rerun("test.tiles")
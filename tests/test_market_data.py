@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+import pytest
+
+import binance_cache
+from binance_cache import PremiumIndexCache, parse_premium_index
+from data_fetcher import DataFetcher
+from market_data import read_coin_data
+from timeseries_store import TimeSeriesStore
+
+PREMIUM_INDEX = (b'[{"symbol": "BTCUSDT", "markPrice": "65000", "lastFundingRate": "0.00010000"},'
+                 b' {"symbol": "BTCUSDT_241227", "markPrice": "66000", "lastFundingRate": ""}]')
+
+
+@pytest.fixture
+def store():
+    store = TimeSeriesStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_read_coin_data_keeps_missing_values_as_nan(store):
+    store.append('BTCUSDT', {'price': 65000.0, 'funding_rate': 0.01}, ts=time.time())
+    store.append('ETHUSDT', {'price': 3200.0}, ts=time.time())
+
+    btc = read_coin_data(store, 'BTCUSDT')
+    assert btc['funding_rate'] == 0.01 and not btc['degraded']
+    # OI tidak diambil = NaN tanpa degraded
+    assert np.isnan(btc['open_interest'])
+
+    eth = read_coin_data(store, 'ETHUSDT')
+    assert np.isnan(eth['funding_rate']) and eth['degraded']
+
+
+def test_missing_funding_is_nan_and_degraded(monkeypatch):
+    cache = PremiumIndexCache()
+    monkeypatch.setattr(cache, 'get_index', lambda: parse_premium_index(PREMIUM_INDEX))
+    assert cache.get_funding_rate('BTCUSDT') == pytest.approx(0.01)
+    assert np.isnan(cache.get_funding_rate('BTCUSDT_241227'))
+    assert np.isnan(cache.get_funding_rate('ETHUSDT'))
+
+    monkeypatch.setattr(binance_cache, 'get_premium_index_cache', lambda: cache)
+    monkeypatch.setattr('data_fetcher.get_premium_index_cache', lambda: cache)
+    funding = DataFetcher()._fetch_funding_rate()
+    assert np.isnan(funding['ETH']) and funding['degraded']
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+
+import pytest
+
+from orderbook import DepthStream, OrderBook
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+@pytest.fixture(scope='module')
+def snapshot():
+    with open(os.path.join(FIXTURES, 'depth_snapshot.json')) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='module')
+def frames():
+    with open(os.path.join(FIXTURES, 'depth_diffs.jsonl')) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+@pytest.fixture(scope='module')
+def events(frames):
+    return [json.loads(frame)['data'] for frame in frames]
+
+
+def _reference(snapshot, events, last_update_id):
+    """Book acuan: dict biasa, semua event dengan u > snapshot sampai last_update_id diterapkan berurutan"""
+    sides = {side: {float(price): float(qty) for price, qty in snapshot[side]} for side in ('bids', 'asks')}
+    for event in events:
+        if event['u'] <= snapshot['lastUpdateId'] or event['u'] > last_update_id:
+            continue
+        for side, key in (('bids', 'b'), ('asks', 'a')):
+            for price, qty in event[key]:
+                sides[side][float(price)] = float(qty)
+    return {side: {price: qty for price, qty in levels.items() if qty} for side, levels in sides.items()}
+
+
+def _as_snapshot(reference, last_update_id):
+    return {'lastUpdateId': last_update_id,
+            'bids': [[str(price), str(qty)] for price, qty in reference['bids'].items()],
+            'asks': [[str(price), str(qty)] for price, qty in reference['asks'].items()]}
+
+
+def _assert_book(book, reference):
+    assert book.bids.levels == reference['bids']
+    assert book.asks.levels == reference['asks']
+    assert [price for price, _ in book.bids.top(len(book.bids))] == sorted(reference['bids'], reverse=True)
+    assert [price for price, _ in book.asks.top(len(book.asks))] == sorted(reference['asks'])
+
+
+def _first_synced(snapshot, events):
+    return next(i for i, event in enumerate(events) if event['u'] >= snapshot['lastUpdateId'])
+
+
+def test_buffered_events_replayed_after_snapshot(snapshot, events):
+    book = OrderBook('BTCUSDT')
+    # Belum ada snapshot: semua event ditahan
+    assert not any(book.apply_diff(event) for event in events)
+    assert len(book.buffer) == len(events)
+
+    book.load_snapshot(snapshot)
+    first = _first_synced(snapshot, events)
+    assert first > 0  # rekaman punya event basi sebelum snapshot
+    assert book.synced and book.gaps == 0 and not book.buffer
+    assert book.updates == len(events) - first
+    assert book.last_update_id == events[-1]['u']
+    _assert_book(book, _reference(snapshot, events, events[-1]['u']))
+
+
+def test_first_event_must_straddle_snapshot(snapshot, events):
+    first = _first_synced(snapshot, events)
+    assert events[first]['U'] <= snapshot['lastUpdateId'] <= events[first]['u']
+
+    # Event basi (u < lastUpdateId) dibuang tanpa mengubah book
+    book = OrderBook('BTCUSDT')
+    book.load_snapshot(snapshot)
+    for event in events[:first]:
+        assert book.apply_diff(event)
+    assert book.updates == 0 and book.last_update_id == snapshot['lastUpdateId']
+
+    # Event pertama yang lompat melewati lastUpdateId berarti ada event hilang
+    assert not book.apply_diff(events[first + 1])
+    assert not book.synced and book.gaps == 1
+    assert list(book.buffer) == [events[first + 1]]
+
+
+def test_first_event_at_snapshot_boundary(snapshot, events):
+    # Snapshot tepat di u suatu event: event berikutnya (U = lastUpdateId + 1) sah sebagai event pertama
+    boundary = _first_synced(snapshot, events) + 5
+    last_update_id = events[boundary]['u']
+    book = OrderBook('BTCUSDT')
+    book.load_snapshot(_as_snapshot(_reference(snapshot, events, last_update_id), last_update_id))
+    for event in events[boundary + 1:]:
+        assert book.apply_diff(event)
+    assert book.gaps == 0
+    _assert_book(book, _reference(snapshot, events, events[-1]['u']))
+
+
+def test_sequence_gap_triggers_resync(snapshot, frames, events):
+    gap = 100
+    resync_id = events[gap + 5]['u']
+    snapshots = [snapshot, _as_snapshot(_reference(snapshot, events, resync_id), resync_id)]
+    fetched = []
+
+    def fetch(symbol):
+        fetched.append(symbol)
+        return snapshots[len(fetched) - 1]
+
+    stream = DepthStream(symbols=['BTCUSDT'], snapshot_fetcher=fetch)
+    book = stream.books['BTCUSDT']
+
+    def wait_synced():
+        deadline = time.monotonic() + 5
+        while (not book.synced or stream._pending) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert book.synced
+
+    stream.handle_message(frames[0])
+    wait_synced()
+    for frame in frames[1:gap]:
+        stream.handle_message(frame)
+    assert book.last_update_id == events[gap - 1]['u'] and book.gaps == 0
+
+    # Event `gap` hilang: pu event berikutnya tidak cocok, book tidak sinkron dan snapshot diambil ulang
+    for frame in frames[gap + 1:]:
+        stream.handle_message(frame)
+    wait_synced()
+
+    assert fetched == ['BTCUSDT', 'BTCUSDT']
+    assert book.gaps == 1 and book.resyncs == 2
+    assert book.last_update_id == events[-1]['u']
+    assert stream.messages == len(frames) - 1
+    _assert_book(book, _reference(snapshot, events, events[-1]['u']))
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+import http_client
+from rate_limiter import RateLimiter, RateLimitExceeded, endpoint_weight
+
+
+@pytest.fixture
+def limiter(stub_server, monkeypatch):
+    # safety_factor=1: capacity = limit, supaya angka di test mudah dihitung
+    limiter = RateLimiter(host_limits={stub_server.host: 120}, safety_factor=1.0)
+    monkeypatch.setattr(http_client, 'get_rate_limiter', lambda: limiter)
+    return limiter
+
+
+def test_endpoint_weights():
+    assert endpoint_weight("https://fapi.binance.com/fapi/v1/premiumIndex") == 10
+    assert endpoint_weight("https://fapi.binance.com/fapi/v1/premiumIndex?symbol=BTCUSDT") == 1
+    assert endpoint_weight("https://fapi.binance.com/fapi/v1/ticker/24hr") == 40
+    assert endpoint_weight("https://fapi.binance.com/fapi/v1/klines", {'limit': 1500}) == 10
+    assert endpoint_weight("https://fapi.binance.com/fapi/v1/depth", {'limit': 1000}) == 20
+
+
+def test_used_weight_header_shrinks_budget(stub_server, limiter):
+    stub_server.respond(200, {'X-MBX-USED-WEIGHT-1M': '115'})
+    http_client._get(stub_server.url('/fapi/v1/openInterest'))
+    bucket = limiter.buckets[stub_server.host]
+    assert bucket.server_used_weight == 115
+    assert bucket.tokens <= 5.1
+
+    # Weight 10 perlu ~2.5 detik refill, lebih lama dari max_wait
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(stub_server.url('/fapi/v1/klines'), {'limit': 1500}, max_wait=0.05)
+    assert bucket.rejected == 1
+    assert stub_server.hits == 1
+
+
+def test_429_blocks_until_retry_after(stub_server, limiter):
+    stub_server.respond(429, {'Retry-After': '0.5'})
+    response = http_client._get(stub_server.url('/fapi/v1/openInterest'))
+    assert response.status_code == 429
+    assert limiter.buckets[stub_server.host].budget()['blocked_for'] > 0.4
+
+    # Request berikutnya menunggu Retry-After lewat, baru dikirim
+    started = time.monotonic()
+    response = http_client._get(stub_server.url('/fapi/v1/openInterest'))
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.5
+    assert limiter.buckets[stub_server.host].throttled == 1
+    assert stub_server.hits == 2
+
+
+def test_ban_longer_than_max_wait_fails_fast(stub_server, limiter):
+    stub_server.respond(418, {'Retry-After': '30'})
+    http_client._get(stub_server.url('/fapi/v1/openInterest'))
+    started = time.monotonic()
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire(stub_server.url('/fapi/v1/openInterest'), max_wait=0.1)
+    # Tidak menunggu sampai ban selesai, dan tidak ada request yang dikirim
+    assert time.monotonic() - started < 0.1
+    assert stub_server.hits == 1
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from signal_engine import SIGNAL_NAMES, score_batch
+from strategy import DEFAULT_THRESHOLDS, calculate_entry_signal
+
+ROWS = 2000
+FIELDS = ('total_score', 'entry_price', 'stop_loss', 'take_profit', 'tech_score', 'fund_score',
+          'whale_score', 'onchain_score', 'depth_score', 'liquidation_score')
+
+
+def _pick(rng, values, nan_share=0.1):
+    """Nilai acak dari grid (termasuk tepat di threshold) dengan sebagian NaN"""
+    column = rng.choice(np.asarray(values, dtype=np.float64), ROWS)
+    column[rng.random(ROWS) < nan_share] = np.nan
+    return column
+
+
+def _columns(seed):
+    rng = np.random.default_rng(seed)
+    low = rng.uniform(50, 150, ROWS)
+    high = low + rng.choice([0.0, 1.0, 10.0, 50.0], ROWS)  # 0 = range datar
+    price = low + (high - low) * rng.random(ROWS)
+    columns = {
+        'price': price,
+        'high_24h': high,
+        'low_24h': low,
+        'change_24h': _pick(rng, [-10, -5, -5.01, 0, 5, 5.01, 10]),
+        'volume': _pick(rng, [0, 5e5, 1e6, 1e6 + 1, 5e7]),
+        'funding_rate': _pick(rng, [-0.2, -0.05, -0.03, -0.02, 0, 0.01, 0.05, 0.06, 0.1, 0.2]),
+        'rsi': _pick(rng, [10, 29.9, 30, 50, 70, 70.1, 90], nan_share=0.3),
+        'whale_score': rng.choice([-1.0, 0.0, 1.0], ROWS),
+        'depth_imbalance': _pick(rng, [-0.8, -0.25, -0.1, 0, 0.1, 0.25, 0.8], nan_share=0.3),
+        'liquidation_cascade': _pick(rng, [-6, -3, -1, 0, 1, 3, 6], nan_share=0.3),
+        'degraded': rng.random(ROWS) < 0.1
+    }
+    # Baris degraded meniru fetch gagal: harga NaN
+    for name in ('price', 'high_24h', 'low_24h'):
+        columns[name][columns['degraded'] & (rng.random(ROWS) < 0.5)] = np.nan
+    return columns
+
+
+def _coin_data(columns, i):
+    """Baris ke-i dalam bentuk coin_data jalur scalar (NaN opsional = tidak ada data)"""
+    depth = columns['depth_imbalance'][i]
+    cascade = columns['liquidation_cascade'][i]
+    rsi = columns['rsi'][i]
+    return {
+        'price': columns['price'][i],
+        'high_24h': columns['high_24h'][i],
+        'low_24h': columns['low_24h'][i],
+        'change_24h': columns['change_24h'][i],
+        'volume': columns['volume'][i],
+        'funding_rate': columns['funding_rate'][i],
+        'rsi': None if np.isnan(rsi) else rsi,
+        'whale': (columns['whale_score'][i], []),
+        'depth': None if np.isnan(depth) else {'imbalance': depth, 'spread_bps': 1.0,
+                                                'bid_liquidity_1': 0.0, 'ask_liquidity_1': 0.0},
+        'liquidations': None if np.isnan(cascade) else {'cascade': cascade, 'long': 0.0, 'short': 0.0,
+                                                        'baseline': 0.0},
+        'degraded': bool(columns['degraded'][i])
+    }
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('fear_greed', [{'value': 10}, {'value': 50}, {'value': 75}, {'value': 90},
+                                        {'value': 50, 'degraded': True}])
+@pytest.mark.parametrize('thresholds', [None, {'score': 1, 'strong_score': 2.5, 'depth_imbalance': 0.1}])
+def test_score_batch_matches_scalar_path(seed, fear_greed, thresholds):
+    columns = _columns(seed)
+    batch = score_batch(fear_greed=fear_greed['value'], thresholds=thresholds,
+                        degraded=columns['degraded'] | bool(fear_greed.get('degraded')), **{
+                            name: value for name, value in columns.items() if name != 'degraded'})
+
+    scalar = [calculate_entry_signal('X', _coin_data(columns, i), fear_greed, thresholds) for i in range(ROWS)]
+    assert [SIGNAL_NAMES[int(code)] for code in batch['signal']] == [result['signal'] for result in scalar]
+    np.testing.assert_array_equal(batch['rsi'], [result['rsi'] for result in scalar])
+    for field in FIELDS:
+        np.testing.assert_array_equal(batch[field], [result[field] for result in scalar], err_msg=field)
+
+
+def test_columns_cover_every_branch():
+    # Pastikan data acak benar-benar melewati semua kelas sinyal dan kedua arah tiap komponen
+    columns = _columns(0)
+    batch = score_batch(fear_greed=50, **{name: value for name, value in columns.items() if name != 'degraded'})
+    assert set(batch['signal'].tolist()) == set(SIGNAL_NAMES)
+    for field in ('tech_score', 'fund_score', 'onchain_score', 'depth_score', 'liquidation_score'):
+        assert batch[field].min() < 0 < batch[field].max(), field
+    assert DEFAULT_THRESHOLDS['depth_imbalance'] in columns['depth_imbalance']
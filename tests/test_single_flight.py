@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import http_client
+from single_flight import SingleFlight, request_key
+
+BURST = 50
+
+
+def _burst(fn):
+    barrier = threading.Barrier(BURST)
+
+    def call(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(BURST) as pool:
+        return list(pool.map(call, range(BURST)))
+
+
+def test_burst_collapses_into_one_upstream_call(stub_server):
+    stub_server.respond(200, body=b'[{"symbol": "BTCUSDT"}]', delay=0.3, default=True)
+    url = stub_server.url('/fapi/v1/premiumIndex')
+
+    results = _burst(lambda: http_client.get(url).content)
+    assert stub_server.hits == 1
+    assert set(results) == {b'[{"symbol": "BTCUSDT"}]'}
+
+    # Setelah flight selesai, panggilan berikutnya memulai request baru
+    http_client.get(url)
+    assert stub_server.hits == 2
+
+
+def test_different_params_are_not_coalesced(stub_server):
+    stub_server.respond(200, delay=0.2, default=True)
+    url = stub_server.url('/fapi/v1/openInterest')
+    with ThreadPoolExecutor(2) as pool:
+        list(pool.map(lambda symbol: http_client.get(url, params={'symbol': symbol}), ('BTCUSDT', 'ETHUSDT')))
+    assert stub_server.hits == 2
+
+
+def test_error_is_shared_by_all_waiters():
+    flight = SingleFlight()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.2)
+        raise RuntimeError("upstream down")
+
+    def call():
+        with pytest.raises(RuntimeError, match="upstream down"):
+            flight.do('key', failing)
+        return True
+
+    assert all(_burst(call))
+    assert len(calls) == 1
+    assert flight.stats()['executed'] == 1
+    assert flight.stats()['shared'] == BURST - 1
+    assert flight.in_flight() == 0
+
+
+def test_request_key_ignores_param_order():
+    assert request_key('u', {'a': 1, 'b': 2}) == request_key('u', {'b': 2, 'a': 1})
+    assert request_key('u') != request_key('u', {'a': 1})
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import math
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import stream_ingest
+from market_snapshot import MarketSnapshot
+from stream_ingest import MarketStream, serve_replay
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'benchmarks', 'fixtures', 'market_stream.jsonl')
+
+
+@pytest.fixture
+def frames():
+    with open(FIXTURE) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _last(frames, stream, symbol):
+    for frame in reversed(frames):
+        message = json.loads(frame)
+        if message['stream'] == stream:
+            return next(item for item in message['data'] if item['s'] == symbol)
+
+
+def test_replay_keeps_latest_mark_price_and_ticker(frames):
+    stream = MarketStream()
+    for frame in frames:
+        stream.handle_message(frame)
+    assert stream.messages == len(frames)
+
+    mark = _last(frames, '!markPrice@arr', 'BTCUSDT')
+    ticker = _last(frames, '!ticker@arr', 'BTCUSDT')
+    entry = stream.get('BTCUSDT')
+    assert entry['mark_price'] == float(mark['p'])
+    assert entry['funding_rate'] == pytest.approx(float(mark['r']) * 100)
+    assert entry['price'] == float(ticker['c'])
+    assert entry['change_24h'] == float(ticker['P'])
+    assert entry['high_24h'] == float(ticker['h'])
+
+    # Overlay ke snapshot: hanya symbol yang ada di stream yang ditimpa, snapshot asal tidak berubah
+    snapshot = MarketSnapshot(['BTCUSDT', 'UNKNOWNUSDT'])
+    updated, count = stream.apply_to_snapshot(snapshot)
+    assert count == 1
+    assert updated['price'][0] == float(ticker['c'])
+    assert updated['price'][1] == 0 and snapshot['price'][0] == 0
+
+
+def test_stale_state_is_ignored(frames):
+    stream = MarketStream()
+    stream.handle_message(frames[0])
+    stream.state['BTCUSDT']['updated_at'] -= stream_ingest.STREAM_MAX_AGE + 1
+    assert stream.get('BTCUSDT') is None
+    assert stream.apply_to_coin_data('BTCUSDT', {'price': 1.0}) == ({'price': 1.0}, False)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(stream_ingest.websockets is None, reason="websockets tidak terinstall")
+def test_reconnects_after_server_closes(frames):
+    port = _free_port()
+    # Server memutar rekaman sekali lalu menutup koneksi, client harus reconnect sendiri
+    server = threading.Thread(
+        target=lambda: asyncio.run(serve_replay(frames, '127.0.0.1', port, interval=0, loop_forever=False)),
+        daemon=True)
+    server.start()
+    time.sleep(0.3)
+
+    stream = MarketStream(url=f"ws://127.0.0.1:{port}/stream", initial_backoff=0.05, max_backoff=0.1)
+    stream.start()
+    try:
+        deadline = time.monotonic() + 10
+        while (stream.reconnects < 2 or stream.messages < 2 * len(frames)) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert stream.reconnects >= 2
+        assert stream.messages >= 2 * len(frames)
+        assert stream.get('BTCUSDT') is not None
+    finally:
+        stream.stop()
+
+
+def test_empty_funding_is_nan_and_does_not_overwrite_rest():
+    stream = MarketStream()
+    stream.handle_message(json.dumps({'stream': '!markPrice@arr', 'data': [
+        {'e': 'markPriceUpdate', 's': 'BTCUSDT_241227', 'p': '66000.0', 'r': '', 'T': 0},
+        {'e': 'markPriceUpdate', 's': 'ETHUSDT', 'p': '3200.0', 'r': '', 'T': 0}
+    ]}))
+    assert math.isnan(stream.get('BTCUSDT_241227')['funding_rate'])
+
+    # Funding REST yang valid tetap dipakai, tidak diganti NaN dari stream
+    coin_data, streamed = stream.apply_to_coin_data('ETHUSDT', {'price': 3100.0, 'funding_rate': 0.01})
+    assert streamed and coin_data['funding_rate'] == 0.01 and not coin_data['degraded']
+    # Funding tidak ada di REST maupun stream = degraded
+    coin_data, _ = stream.apply_to_coin_data('BTCUSDT_241227', {'price': 65000.0})
+    assert coin_data['degraded']
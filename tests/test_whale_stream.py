@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import stream_ingest
+from stream_ingest import serve_replay
+from whale_stream import IMBALANCE_THRESHOLD, WHALE_THRESHOLDS, WhaleStream, WhaleTracker
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'benchmarks', 'fixtures', 'agg_trades.jsonl')
+SYMBOLS = ('BTCUSDT', 'ETHUSDT')
+
+
+@pytest.fixture(scope='module')
+def frames():
+    with open(FIXTURE) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def _expected(frames, symbol, seconds):
+    """Total window dihitung langsung dari rekaman, tanpa ring buffer"""
+    trades = [json.loads(frame)['data'] for frame in frames]
+    newest = max(trade['T'] for trade in trades) // 1000
+    totals = {'buy': 0.0, 'sell': 0.0, 'whale_buy': 0.0, 'whale_sell': 0.0, 'whale_trades': 0, 'trades': 0}
+    for trade in trades:
+        if trade['s'] != symbol or trade['T'] // 1000 <= newest - seconds:
+            continue
+        notional = float(trade['p']) * float(trade['q'])
+        side = 'sell' if trade['m'] else 'buy'
+        totals['trades'] += 1
+        totals[side] += notional
+        if notional >= WHALE_THRESHOLDS[symbol]:
+            totals['whale_trades'] += 1
+            totals['whale_' + side] += notional
+    return totals
+
+
+def _expected_score(totals):
+    imbalance = (totals['whale_buy'] - totals['whale_sell']) / (totals['whale_buy'] + totals['whale_sell'])
+    if imbalance >= IMBALANCE_THRESHOLD:
+        return 1
+    return -1 if imbalance <= -IMBALANCE_THRESHOLD else 0
+
+
+def _assert_matches_fixture(tracker, frames):
+    for symbol in SYMBOLS:
+        for seconds in (60, 300, 900):
+            expected = _expected(frames, symbol, seconds)
+            totals = tracker.window(symbol, seconds)
+            assert totals.keys() == expected.keys()
+            for key, value in expected.items():
+                assert totals[key] == pytest.approx(value), (symbol, seconds, key)
+        # Rekaman ~280 detik, jadi 5m dan 15m mencakup semua trade
+        assert tracker.window(symbol, 300) == tracker.window(symbol, 900)
+
+        events = tracker.recent_events(symbol, limit=100)
+        assert len(events) == _expected(frames, symbol, 900)['whale_trades']
+        assert all(event['notional'] >= WHALE_THRESHOLDS[symbol] for event in events)
+        assert [event['time'] for event in events] == sorted((event['time'] for event in events), reverse=True)
+
+    # Rekaman: whale BTC semuanya jual, whale ETH campuran
+    scores = [_expected_score(_expected(frames, symbol, 300)) for symbol in SYMBOLS]
+    assert scores == [-1, 0]
+    assert tracker.scores(list(SYMBOLS)) == scores
+
+
+def test_replay_fixture_directly(frames):
+    tracker = WhaleTracker()
+    for frame in frames:
+        tracker.handle_message(frame)
+    assert tracker.trades == len(frames)
+    _assert_matches_fixture(tracker, frames)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(stream_ingest.websockets is None, reason="websockets tidak terinstall")
+def test_replay_fixture_over_websocket(frames):
+    port = _free_port()
+    server = threading.Thread(
+        target=lambda: asyncio.run(serve_replay(frames, '127.0.0.1', port, interval=0, loop_forever=False)),
+        daemon=True)
+    server.start()
+    time.sleep(0.3)
+
+    # Backoff panjang supaya rekaman tidak terhitung dua kali lewat reconnect
+    stream = WhaleStream(symbols=SYMBOLS, url=f"ws://127.0.0.1:{port}/stream", initial_backoff=30, max_backoff=30)
+    stream.start()
+    try:
+        deadline = time.monotonic() + 10
+        while stream.messages < len(frames) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert stream.messages == len(frames)
+        _assert_matches_fixture(stream.tracker, frames)
+    finally:
+        stream.stop()
@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_DB_PATH = os.environ.get("MARKET_DB_PATH", os.path.join("data", "market.db"))
+
+# Kolom yang disimpan per snapshot, kolom yang tidak diisi disimpan NULL (NaN saat query)
+FIELDS = (
+    'price', 'change_24h', 'volume', 'high_24h', 'low_24h',
+    'funding_rate', 'open_interest', 'fear_greed'
+)
+
+# Fear & Greed tidak punya symbol, disimpan dengan symbol khusus
+FEAR_GREED_SYMBOL = 'FEAR_GREED'
+# Riwayat harian Fear & Greed (ts = waktu publikasi index), terpisah dari snapshot collector
+FEAR_GREED_DAILY_SYMBOL = 'FEAR_GREED_DAILY'
+
+
+class TimeSeriesStore:
+    """Store append-only snapshot market di SQLite, dikunci per (symbol, ts)"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=500):
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f"{field} REAL" for field in FIELDS)
+        # WITHOUT ROWID: data tersusun fisik per (symbol, ts), range query cukup satu scan berurutan
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS snapshots ("
+            f"symbol TEXT NOT NULL, ts REAL NOT NULL, {columns}, "
+            f"PRIMARY KEY (symbol, ts)) WITHOUT ROWID"
+        )
+        # Rollup likuidasi per bucket (liquidations.py); width = lebar bucket (detik), ts = awal bucket
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS liquidations ("
+            "symbol TEXT NOT NULL, width INTEGER NOT NULL, ts REAL NOT NULL, "
+            "long_notional REAL, short_notional REAL, long_count INTEGER, short_count INTEGER, "
+            "PRIMARY KEY (symbol, width, ts)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def append(self, symbol, values, ts=None):
+        """Tambah satu snapshot ke buffer, ditulis per batch"""
+        ts = time.time() if ts is None else ts
+        row = (symbol, ts) + tuple(values.get(field) for field in FIELDS)
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def append_many(self, rows):
+        """Tambah banyak snapshot sekaligus: iterable (symbol, ts, values)"""
+        with self._lock:
+            for symbol, ts, values in rows:
+                self._buffer.append((symbol, ts) + tuple(values.get(field) for field in FIELDS))
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        placeholders = ", ".join("?" * (len(FIELDS) + 2))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO snapshots (symbol, ts, {', '.join(FIELDS)}) VALUES ({placeholders})",
+            self._buffer
+        )
+        self._conn.commit()
+        self._buffer = []
+
+    def query_range(self, symbol, start=None, end=None, fields=FIELDS):
+        """Ambil snapshot satu symbol dalam range waktu, return dict {'ts': array, field: array}"""
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts, {', '.join(fields)} FROM snapshots "
+                f"WHERE symbol = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                (symbol, start, end)
+            ).fetchall()
+
+        # NULL -> NaN lewat dtype float
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), len(fields) + 1)
+        result = {'ts': table[:, 0].copy()}
+        for i, field in enumerate(fields):
+            result[field] = table[:, i + 1].copy()
+        return result
+
+    def latest(self, symbol):
+        """Snapshot terakhir satu symbol sebagai dict (None kalau belum ada)"""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT ts, {', '.join(FIELDS)} FROM snapshots WHERE symbol = ? ORDER BY ts DESC LIMIT 1",
+                (symbol,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('ts',) + FIELDS, row))
+
+    def symbols(self):
+        self.flush()
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT symbol FROM snapshots")]
+
+    def record_coin_data(self, symbol, coin_data, ts=None):
+        """Simpan hasil get_coin_data / get_all_coins_data untuk satu symbol"""
+        self.append(symbol, coin_data, ts)
+
+    def record_snapshot(self, snapshot, ts=None):
+        """Simpan semua baris MarketSnapshot yang tidak degraded, return jumlah baris"""
+        ts = snapshot.ts if ts is None else ts
+        keep = ~snapshot.degraded
+        symbols = [symbol for symbol, kept in zip(snapshot.symbols, keep) if kept]
+        values = [
+            snapshot.columns[field][keep].tolist() if field in snapshot.columns else [None] * len(symbols)
+            for field in FIELDS
+        ]
+        with self._lock:
+            self._buffer.extend((symbol, ts) + row for symbol, row in zip(symbols, zip(*values)))
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+        return len(symbols)
+
+    def record_fear_greed(self, fear_greed, ts=None):
+        self.append(FEAR_GREED_SYMBOL, {'fear_greed': fear_greed['value']}, ts)
+
+    def record_fear_greed_daily(self, points):
+        """Simpan nilai harian Fear & Greed: iterable (ts publikasi, value)"""
+        self.append_many((FEAR_GREED_DAILY_SYMBOL, ts, {'fear_greed': value}) for ts, value in points)
+        self.flush()
+
+    def record_liquidation_buckets(self, rows):
+        """Tulis / timpa bucket likuidasi: iterable (symbol, width, ts, long, short, jumlah long, jumlah short)"""
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO liquidations VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def load_liquidation_buckets(self, width, start=None, symbol=None):
+        """Bucket satu resolusi sejak start: list (symbol, ts, long, short, jumlah long, jumlah short)"""
+        start = float('-inf') if start is None else start
+        query = ("SELECT symbol, ts, long_notional, short_notional, long_count, short_count "
+                 "FROM liquidations WHERE width = ? AND ts >= ?")
+        params = (width, start)
+        if symbol is not None:
+            query += " AND symbol = ?"
+            params += (symbol,)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY symbol, ts", params).fetchall()
+
+    def query_liquidations(self, symbol, width, start=None, end=None):
+        """Bucket likuidasi satu symbol, return dict {'ts', 'long', 'short', 'long_count', 'short_count'} array"""
+        end = float('inf') if end is None else end
+        rows = [row[1:] for row in self.load_liquidation_buckets(width, start, symbol) if row[1] <= end]
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), 5)
+        return {field: table[:, i].copy() for i, field in enumerate(('ts', 'long', 'short', 'long_count', 'short_count'))}
+
+    def prune_liquidation_buckets(self, width, before):
+        """Hapus bucket satu resolusi yang lebih tua dari before"""
+        with self._lock:
+            self._conn.execute("DELETE FROM liquidations WHERE width = ? AND ts < ?", (width, before))
+            self._conn.commit()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+_stores = {}
+
+
+def get_store(path=DEFAULT_DB_PATH):
+    """Store bersama per path untuk satu proses"""
+    if path not in _stores:
+        _stores[path] = TimeSeriesStore(path)
+    return _stores[path]
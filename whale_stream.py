@@ -0,0 +1,236 @@
+"""
+Deteksi whale dari stream aggTrade Binance Futures.
+
+Setiap aggTrade dengan notional >= threshold symbol dihitung sebagai trade
+whale, dipisah buyer-initiated (m=false) dan seller-initiated (m=true).
+Agregat disimpan per symbol dalam ring buffer bucket 1 detik sepanjang
+HORIZON, jadi memori konstan berapa pun trade rate-nya; window 1m/5m/15m
+dijumlahkan dari bucket yang masih berlaku.
+
+Jam tracker mengikuti waktu trade (T) terakhir, sehingga replay rekaman
+menghasilkan window yang sama dengan saat live.
+
+    python whale_stream.py                                          # Binance asli
+    python whale_stream.py --replay trades.jsonl --port 8766        # stand-in lokal
+    python whale_stream.py --url ws://localhost:8766/stream
+"""
+import argparse
+import asyncio
+import threading
+import time
+from collections import deque
+
+from fast_json import loads
+from market_data import SUPPORTED_COINS
+from stream_ingest import BINANCE_FSTREAM_URL, STREAM_MAX_AGE, MarketStream, serve_replay, websockets
+
+# Notional (USDT) minimal satu aggTrade untuk dianggap whale
+WHALE_THRESHOLDS = {
+    'BTCUSDT': 500_000,
+    'ETHUSDT': 250_000,
+    'BNBUSDT': 100_000,
+    'SOLUSDT': 100_000
+}
+DEFAULT_WHALE_THRESHOLD = 50_000
+
+BUCKET_SECONDS = 1
+HORIZON = 900             # detik, window terpanjang
+WINDOWS = (60, 300, 900)
+SCORE_WINDOW = 300        # window untuk whale_score
+IMBALANCE_THRESHOLD = 0.3 # (beli - jual) / total notional whale
+MIN_WHALE_TRADES = 2
+MAX_EVENTS = 200
+
+
+class _SymbolWindow:
+    """Ring buffer bucket per detik untuk satu symbol"""
+
+    __slots__ = ('epochs', 'buy', 'sell', 'whale_buy', 'whale_sell', 'whale_trades', 'trades')
+
+    def __init__(self, slots):
+        self.epochs = [-1] * slots
+        self.buy = [0.0] * slots
+        self.sell = [0.0] * slots
+        self.whale_buy = [0.0] * slots
+        self.whale_sell = [0.0] * slots
+        self.whale_trades = [0] * slots
+        self.trades = [0] * slots
+
+
+class WhaleTracker:
+    """Agregat sliding-window notional beli/jual (semua trade dan whale) + event whale terakhir"""
+
+    def __init__(self, thresholds=None, horizon=HORIZON, bucket_seconds=BUCKET_SECONDS, max_events=MAX_EVENTS):
+        self.thresholds = dict(WHALE_THRESHOLDS, **(thresholds or {}))
+        self.bucket_ms = int(bucket_seconds * 1000)
+        self.slots = int(horizon // bucket_seconds)
+        self.windows = {}
+        self.events = deque(maxlen=max_events)
+        self.clock = 0          # waktu trade terakhir (ms)
+        self.received_at = 0.0  # time.time() trade terakhir diterima
+        self.trades = 0
+        self._lock = threading.Lock()
+
+    def add_trade(self, symbol, price, qty, buyer_maker, trade_time):
+        """Catat satu aggTrade, return event whale (dict) atau None"""
+        notional = price * qty
+        bucket = trade_time // self.bucket_ms
+        slot = bucket % self.slots
+        with self._lock:
+            window = self.windows.get(symbol)
+            if window is None:
+                window = self.windows[symbol] = _SymbolWindow(self.slots)
+            if window.epochs[slot] != bucket:
+                # Bucket lama (satu putaran ring yang lalu) ditimpa
+                window.epochs[slot] = bucket
+                window.buy[slot] = window.sell[slot] = 0.0
+                window.whale_buy[slot] = window.whale_sell[slot] = 0.0
+                window.whale_trades[slot] = window.trades[slot] = 0
+            window.trades[slot] += 1
+            # m=true: buyer adalah maker, jadi trade diinisiasi seller
+            if buyer_maker:
+                window.sell[slot] += notional
+            else:
+                window.buy[slot] += notional
+            if trade_time > self.clock:
+                self.clock = trade_time
+            self.trades += 1
+
+            if notional < self.thresholds.get(symbol, DEFAULT_WHALE_THRESHOLD):
+                return None
+            window.whale_trades[slot] += 1
+            if buyer_maker:
+                window.whale_sell[slot] += notional
+            else:
+                window.whale_buy[slot] += notional
+            event = {'symbol': symbol, 'side': 'sell' if buyer_maker else 'buy', 'notional': notional,
+                     'price': price, 'qty': qty, 'time': trade_time / 1000}
+            self.events.append(event)
+            return event
+
+    def handle_message(self, raw):
+        """Proses satu frame (combined stream atau raw stream) berisi satu / beberapa aggTrade"""
+        message = loads(raw)
+        data = message.get('data', message) if isinstance(message, dict) else message
+        for item in (data if isinstance(data, list) else (data,)):
+            if item.get('e') == 'aggTrade':
+                self.add_trade(item['s'], float(item['p']), float(item['q']), item['m'], item['T'])
+        self.received_at = time.time()
+
+    def window(self, symbol, seconds):
+        """Jumlah notional dalam `seconds` terakhir (relatif ke jam stream)"""
+        newest = self.clock // self.bucket_ms
+        count = min(int(seconds * 1000 // self.bucket_ms), self.slots)
+        totals = {'buy': 0.0, 'sell': 0.0, 'whale_buy': 0.0, 'whale_sell': 0.0, 'whale_trades': 0, 'trades': 0}
+        with self._lock:
+            window = self.windows.get(symbol)
+            if window is None:
+                return totals
+            # Hanya bucket dalam window; slot yang epoch-nya beda belum terisi / sudah kedaluwarsa
+            for bucket in range(newest - count + 1, newest + 1):
+                slot = bucket % self.slots
+                if window.epochs[slot] == bucket:
+                    totals['buy'] += window.buy[slot]
+                    totals['sell'] += window.sell[slot]
+                    totals['whale_buy'] += window.whale_buy[slot]
+                    totals['whale_sell'] += window.whale_sell[slot]
+                    totals['whale_trades'] += window.whale_trades[slot]
+                    totals['trades'] += window.trades[slot]
+        return totals
+
+    def is_live(self, max_age=STREAM_MAX_AGE):
+        return self.trades > 0 and time.time() - self.received_at <= max_age
+
+    def analysis(self, symbol, seconds=SCORE_WINDOW):
+        """(whale_score, signals) untuk calculate_entry_signal, None kalau stream tidak aktif"""
+        if not self.is_live() or symbol not in self.windows:
+            return None
+        totals = self.window(symbol, seconds)
+        whale_total = totals['whale_buy'] + totals['whale_sell']
+        minutes = seconds // 60
+        if totals['whale_trades'] < MIN_WHALE_TRADES or not whale_total:
+            return 0, [f"• No whale trades in last {minutes}m"]
+
+        imbalance = (totals['whale_buy'] - totals['whale_sell']) / whale_total
+        net = totals['whale_buy'] - totals['whale_sell']
+        summary = (f"{totals['whale_trades']} whale trades in {minutes}m: "
+                   f"buy ${totals['whale_buy'] / 1e6:,.2f}M / sell ${totals['whale_sell'] / 1e6:,.2f}M")
+        if imbalance >= IMBALANCE_THRESHOLD:
+            return 1, [f"🟢 Whale buying pressure (net +${net / 1e6:,.2f}M)", f"🐋 {summary}"]
+        if imbalance <= -IMBALANCE_THRESHOLD:
+            return -1, [f"🔴 Whale selling pressure (net -${-net / 1e6:,.2f}M)", f"🐋 {summary}"]
+        return 0, ["🟡 Balanced whale flow", f"🐋 {summary}"]
+
+    def scores(self, symbols, seconds=SCORE_WINDOW):
+        """whale_score per symbol (0 kalau tidak ada data), sejajar dengan symbols"""
+        result = []
+        for symbol in symbols:
+            analysis = self.analysis(symbol, seconds)
+            result.append(analysis[0] if analysis else 0)
+        return result
+
+    def recent_events(self, symbol=None, limit=10):
+        """Event whale terbaru dulu"""
+        with self._lock:
+            events = [event for event in reversed(self.events) if symbol is None or event['symbol'] == symbol]
+        return events[:limit]
+
+
+class WhaleStream(MarketStream):
+    """Combined stream <symbol>@aggTrade untuk semua symbol, diteruskan ke WhaleTracker"""
+
+    def __init__(self, symbols=None, url=BINANCE_FSTREAM_URL, tracker=None, **kwargs):
+        symbols = list(symbols or SUPPORTED_COINS.values())
+        super().__init__(url=url, streams=tuple(f"{symbol.lower()}@aggTrade" for symbol in symbols), **kwargs)
+        self.tracker = tracker or WhaleTracker()
+
+    def handle_message(self, raw):
+        self.tracker.handle_message(raw)
+        self.messages += 1
+
+
+_whale_stream = None
+
+
+def get_whale_stream():
+    """Stream aggTrade bersama untuk satu proses, otomatis start (None kalau websockets tidak ada)"""
+    global _whale_stream
+    if websockets is None:
+        return None
+    if _whale_stream is None:
+        _whale_stream = WhaleStream()
+        _whale_stream.start()
+    return _whale_stream
+
+
+def get_whale_tracker():
+    """Tracker dari stream bersama (None kalau stream tidak tersedia)"""
+    stream = get_whale_stream()
+    return stream.tracker if stream else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deteksi whale dari aggTrade Binance Futures")
+    parser.add_argument("--url", default=BINANCE_FSTREAM_URL, help="URL combined stream")
+    parser.add_argument("--replay", help="File .jsonl berisi frame aggTrade rekaman untuk stand-in lokal")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--interval", type=float, default=0.001, help="Jeda antar frame replay (detik)")
+    args = parser.parse_args()
+
+    try:
+        if args.replay:
+            with open(args.replay) as f:
+                frames = [line.strip() for line in f if line.strip()]
+            print(f"Replaying {len(frames)} frames on ws://localhost:{args.port}/stream")
+            asyncio.run(serve_replay(frames, port=args.port, interval=args.interval))
+        else:
+            stream = WhaleStream(url=args.url)
+            stream.start()
+            while True:
+                time.sleep(5)
+                tracker = stream.tracker
+                print(f"connected={stream.connected} trades={tracker.trades} reconnects={stream.reconnects}")
+                for event in tracker.recent_events(limit=3):
+                    print(f"  {event['symbol']} {event['side']} ${event['notional']:,.0f} @ {event['price']}")
+    except KeyboardInterrupt:
+        pass